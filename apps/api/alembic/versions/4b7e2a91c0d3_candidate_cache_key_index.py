@@ -0,0 +1,34 @@
+"""candidate cache_key index
+
+Revision ID: 4b7e2a91c0d3
+Revises: dc3428d01159
+Create Date: 2026-10-17 10:12:31.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2a91c0d3'
+down_revision: Union[str, Sequence[str], None] = 'dc3428d01159'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # answer cache tier 2 lookup: candidates.params_json->>'cache_key'
+    op.create_index(
+        'ix_candidates_cache_key',
+        'candidates',
+        [sa.text("(params_json->>'cache_key')"), sa.text('created_at DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_candidates_cache_key', table_name='candidates')
@@ -0,0 +1,55 @@
+"""candidate feature store
+
+Revision ID: 9e1f3c7a5b28
+Revises: 4b7e2a91c0d3
+Create Date: 2026-10-17 19:42:07.531846
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '9e1f3c7a5b28'
+down_revision: Union[str, Sequence[str], None] = '4b7e2a91c0d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'candidate_features',
+        sa.Column('candidate_id', sa.UUID(), nullable=False),
+        sa.Column('feature_version', sa.String(length=20), nullable=False),
+        sa.Column('dim', sa.Integer(), nullable=False),
+        sa.Column('vec', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['candidate_id'], ['candidates.candidate_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('candidate_id', 'feature_version'),
+    )
+
+    # 기존 fv1 컬럼 → store (float4send = big-endian float32, services/feature_store.py 포맷과 동일)
+    # 순서: len_words, has_code, step_score, has_bullets, has_warning
+    op.execute(
+        """
+        insert into candidate_features (candidate_id, feature_version, dim, vec)
+        select
+            candidate_id,
+            'fv1',
+            5,
+            float4send(len_words::float4)
+              || float4send(has_code::int::float4)
+              || float4send(step_score::float4)
+              || float4send(has_bullets::int::float4)
+              || float4send(has_warning::int::float4)
+        from candidates
+        where feature_version = 'fv1';
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('candidate_features')
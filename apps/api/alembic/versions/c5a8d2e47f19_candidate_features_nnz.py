@@ -0,0 +1,28 @@
+"""candidate_features nnz (sparse vectors)
+
+Revision ID: c5a8d2e47f19
+Revises: 9e1f3c7a5b28
+Create Date: 2026-10-17 21:05:44.207615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a8d2e47f19'
+down_revision: Union[str, Sequence[str], None] = '9e1f3c7a5b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # NULL = dense (float32 x dim), 값이 있으면 sparse (int32 indices x nnz + float32 values x nnz)
+    op.add_column('candidate_features', sa.Column('nnz', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('candidate_features', 'nnz')
@@ -0,0 +1,233 @@
+# apps/api/scripts/backfill_features.py
+"""
+과거 candidates 에 feature version 을 (재)계산해 채우는 backfill job.
+
+    cd apps/api
+    BACKFILL_FEATURE_VERSION=fv1 python -m scripts.backfill_features
+
+- 추출 로직은 serving과 같은 src/app/services/features.py 를 그대로 사용 (그래서 -m 으로 실행)
+- answer_summary 는 server-side cursor 로 chunk 단위 streaming (candidate_id 순, keyset)
+- chunk 단위로 process pool 에서 추출, 결과는 feature store(candidate_features)에 일괄 upsert
+  (sparse 버전(fvh1)은 worker에서 (indices, values) blob 으로 인코딩 → 행마다 크기는 nnz 에 비례)
+  (버전의 feature가 candidates 컬럼으로도 있으면(fv1) 컬럼도 UPDATE ... FROM (VALUES ...) 로 같이 반영)
+- chunk 가 commit 될 때마다 checkpoint(마지막 candidate_id) 저장 → 중단 후 재실행 시 이어서 진행
+- 동시에 진행 중인 chunk 수를 제한해 메모리 사용량이 테이블 크기와 무관하게 일정
+"""
+from __future__ import annotations
+
+import os
+import json
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+
+from src.app.db.models import Candidate, CandidateFeature
+from src.app.services.feature_store import encode_features
+from src.app.services.features import get_feature_version
+
+
+ARTIFACTS_DIR = Path("artifacts")
+BACKFILL_DIR = ARTIFACTS_DIR / "backfill"
+
+
+# ──────────────────────────────────────────────
+# worker (process pool)
+# ──────────────────────────────────────────────
+
+def _extract_chunk(version: str, rows: Sequence[Tuple[str, str]]) -> List[tuple]:
+    """(candidate_id, answer_summary) → (candidate_id, vec blob, nnz, *features in names order)."""
+    fv = get_feature_version(version)
+    out = []
+    for cid, ans in rows:
+        feats = fv.extract(ans or "")
+        blob, nnz = encode_features(fv, feats)
+        out.append((cid, blob, nnz, *[feats[n] for n in fv.names]))
+    return out
+
+
+# ──────────────────────────────────────────────
+# checkpoint
+# ──────────────────────────────────────────────
+
+def _checkpoint_path(version: str) -> Path:
+    return BACKFILL_DIR / f"{version}.checkpoint.json"
+
+
+def _load_checkpoint(version: str) -> dict:
+    p = _checkpoint_path(version)
+    if os.getenv("BACKFILL_RESET", "0").strip() == "1" or not p.exists():
+        return {"feature_version": version, "last_candidate_id": None, "updated": 0}
+    return json.loads(p.read_text(encoding="utf-8"))
+
+
+def _save_checkpoint(version: str, state: dict) -> None:
+    BACKFILL_DIR.mkdir(parents=True, exist_ok=True)
+    p = _checkpoint_path(version)
+    tmp = p.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp.replace(p)  # atomic: 중간에 죽어도 이전 checkpoint 는 온전
+
+
+# ──────────────────────────────────────────────
+# read / write
+# ──────────────────────────────────────────────
+
+def _stream_chunks(conn: Connection, version: str, after: Optional[str], chunk_size: int):
+    where = ["true"]
+    params: dict = {"fv": version}
+    if after:
+        where.append("candidate_id > :after")
+        params["after"] = after
+    if os.getenv("BACKFILL_ALL", "0").strip() != "1":
+        # 이미 store 에 이 버전 vector 가 있는 후보는 건너뜀
+        where.append(
+            "not exists (select 1 from candidate_features f"
+            " where f.candidate_id = candidates.candidate_id and f.feature_version = :fv)"
+        )
+
+    sql = f"""
+        select candidate_id, answer_summary
+        from candidates
+        where {' and '.join(where)}
+        order by candidate_id;
+    """
+    # server-side cursor: chunk_size 행씩 가져온다 (테이블 전체를 client 로 올리지 않음)
+    result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(text(sql), params)
+    for part in result.partitions(chunk_size):
+        yield [(str(r[0]), r[1]) for r in part]
+
+
+def _update_sql(version: str, n_rows: int, dialect) -> str:
+    fv = get_feature_version(version)
+    cols = list(fv.names)
+    casts = [Candidate.__table__.c[c].type.compile(dialect=dialect) for c in cols]
+
+    values = ", ".join(
+        "(" + ", ".join([f"cast(:id_{i} as uuid)"] + [f"cast(:{c}_{i} as {t})" for c, t in zip(cols, casts)]) + ")"
+        for i in range(n_rows)
+    )
+    sets = ", ".join(f"{c} = v.{c}" for c in cols)
+    sql = f"""
+        update candidates as c
+        set {sets}, feature_version = :fv
+        from (values {values}) as v(candidate_id, {', '.join(cols)})
+        where c.candidate_id = v.candidate_id;
+    """
+    return sql
+
+
+def _upsert_store(conn: Connection, version: str, rows: List[tuple], batch: int) -> None:
+    """candidate_features 에 multi-row INSERT ... ON CONFLICT DO UPDATE (batch 행씩)."""
+    dialect = postgresql if conn.dialect.name == "postgresql" else sqlite
+    dim = get_feature_version(version).dim
+    for start in range(0, len(rows), batch):
+        part = rows[start:start + batch]
+        stmt = dialect.insert(CandidateFeature.__table__).values(
+            [
+                {"candidate_id": uuid.UUID(str(r[0])), "feature_version": version, "dim": dim, "nnz": r[2], "vec": r[1]}
+                for r in part
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["candidate_id", "feature_version"],
+            set_={"dim": stmt.excluded.dim, "nnz": stmt.excluded.nnz, "vec": stmt.excluded.vec},
+        )
+        conn.execute(stmt)
+
+
+def _write(conn: Connection, version: str, rows: List[tuple], batch: int) -> None:
+    """feature store upsert + (fv1처럼 컬럼이 있는 버전이면) candidates 컬럼 UPDATE ... FROM (VALUES ...)."""
+    _upsert_store(conn, version, rows, batch)
+
+    fv = get_feature_version(version)
+    cols = list(fv.names)
+    if fv.sparse or not all(c in Candidate.__table__.c for c in cols):
+        return
+
+    if conn.dialect.name != "postgresql":
+        # 개발용 fallback (sqlite 등): executemany 한 번
+        sets = ", ".join(f"{c} = :{c}" for c in cols)
+        conn.execute(
+            text(f"update candidates set {sets}, feature_version = :fv where candidate_id = :id"),
+            [{"id": r[0], "fv": version, **dict(zip(cols, r[3:]))} for r in rows],
+        )
+        return
+
+    for start in range(0, len(rows), batch):
+        part = rows[start:start + batch]
+        sql = _update_sql(version, len(part), conn.dialect)
+        params: dict = {"fv": version}
+        for i, r in enumerate(part):
+            params[f"id_{i}"] = r[0]
+            for c, v in zip(cols, r[3:]):
+                params[f"{c}_{i}"] = v
+        conn.execute(text(sql), params)
+
+
+# ──────────────────────────────────────────────
+# main
+# ──────────────────────────────────────────────
+
+def main() -> None:
+    load_dotenv()
+
+    db_url = os.getenv("DB_URL", "").strip()
+    if not db_url:
+        raise RuntimeError("DB_URL is empty. Set it in apps/api/.env")
+
+    version = os.getenv("BACKFILL_FEATURE_VERSION", "fv1").strip()
+    get_feature_version(version)  # 알 수 없는 버전이면 시작 전에 ValueError
+    chunk_size = max(1, int(os.getenv("BACKFILL_CHUNK", "5000")))
+    write_batch = max(1, int(os.getenv("BACKFILL_WRITE_BATCH", "1000")))
+    workers = max(1, int(os.getenv("BACKFILL_WORKERS", str(os.cpu_count() or 1))))
+    max_inflight = workers * 2  # 동시에 메모리에 있는 chunk 상한
+
+    state = _load_checkpoint(version)
+    print(f"Backfilling {version} (workers={workers}, chunk={chunk_size}) from {state['last_candidate_id'] or 'start'}")
+
+    engine = create_engine(db_url, future=True)
+    t0 = time.perf_counter()
+    done = 0
+
+    with engine.connect() as read_conn, engine.connect() as write_conn, ProcessPoolExecutor(max_workers=workers) as pool:
+        inflight: Deque[Tuple[Future, str]] = deque()
+
+        def drain_one() -> None:
+            nonlocal done
+            fut, last_id = inflight.popleft()
+            rows: List[Any] = fut.result()
+            with write_conn.begin():
+                _write(write_conn, version, rows, write_batch)
+            # chunk 는 candidate_id 순서대로 commit 되므로 last_id 이전은 모두 반영됨
+            done += len(rows)
+            state["last_candidate_id"] = last_id
+            state["updated"] = int(state.get("updated", 0)) + len(rows)
+            _save_checkpoint(version, state)
+            rate = done / max(time.perf_counter() - t0, 1e-9)
+            print(f"- {state['updated']} updated (last={last_id}, {rate:,.0f} rows/s)")
+
+        for chunk in _stream_chunks(read_conn, version, state["last_candidate_id"], chunk_size):
+            inflight.append((pool.submit(_extract_chunk, version, chunk), chunk[-1][0]))
+            if len(inflight) >= max_inflight:
+                drain_one()
+        while inflight:
+            drain_one()
+
+    elapsed = time.perf_counter() - t0
+    print("✅ Backfill complete")
+    print(f"- feature_version : {version}")
+    print(f"- rows (this run) : {done}")
+    print(f"- elapsed         : {elapsed:.1f}s ({done / elapsed if elapsed > 0 else 0:,.0f} rows/s)")
+    print(f"- checkpoint      : {_checkpoint_path(version)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ import os
 import json
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
@@ -14,6 +15,85 @@ DB_URL = os.getenv("DB_URL", "")
 if not DB_URL:
     raise RuntimeError("DB_URL is empty. Set it in apps/api/.env")
 
+# candidate_features.vec 포맷 (src/app/services/feature_store.py 와 동일)
+# - dense : big-endian float32 x dim
+# - sparse: big-endian int32 indices x nnz + float32 values x nnz (nnz 컬럼이 채워진 row)
+VEC_DTYPE = np.dtype(">f4")
+IDX_DTYPE = np.dtype(">i4")
+FV1_COLS = ["len_words", "has_code", "step_score", "has_bullets", "has_warning"]
+
+
+def _unpack(blobs: pd.Series, dim: int) -> tuple[np.ndarray, np.ndarray]:
+    """bytea 컬럼 → (n x dim float32, 값이 있는 row mask). 없는 row는 0."""
+    ok = blobs.notna().to_numpy()
+    out = np.zeros((len(blobs), dim), dtype=np.float32)
+    if ok.any():
+        packed = b"".join(bytes(b) for b in blobs[ok])
+        out[ok] = np.frombuffer(packed, dtype=VEC_DTYPE).reshape(-1, dim)
+    return out, ok
+
+
+def _unpack_sparse(blobs: pd.Series, nnzs: pd.Series) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """sparse bytea 컬럼 → CSR (indptr, indices, data) + 값이 있는 row mask. 없는 row는 빈 row."""
+    ok = blobs.notna().to_numpy()
+    counts = np.where(ok, nnzs.fillna(0).to_numpy(), 0).astype(np.int64)
+    indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+    indices = np.empty(int(indptr[-1]), dtype=np.int32)
+    data = np.empty(int(indptr[-1]), dtype=np.float32)
+    for i in np.flatnonzero(counts):
+        blob, n, start = bytes(blobs.iat[i]), int(counts[i]), int(indptr[i])
+        indices[start:start + n] = np.frombuffer(blob, dtype=IDX_DTYPE, count=n)
+        data[start:start + n] = np.frombuffer(blob, dtype=VEC_DTYPE, count=n, offset=n * 4)
+    return indptr, indices, data, ok
+
+
+def _sparse_feature_matrices(df: pd.DataFrame, feature_version: str, n_features: int) -> dict:
+    """
+    hashed(sparse) 버전: pair별 a/b 를 CSR 배열로 저장 (dense n x 2^18 행렬은 만들지 않음).
+    train_baseline.py 가 scipy.sparse.csr_matrix((data, indices, indptr)) 로 복원한다.
+    """
+    out: dict = {"n_features": np.array(n_features), "feature_version": np.array(feature_version)}
+    oks = []
+    for side in ("a", "b"):
+        indptr, indices, data, ok = _unpack_sparse(df[f"{side}_vec"], df[f"{side}_nnz"])
+        out[f"{side}_indptr"], out[f"{side}_indices"], out[f"{side}_data"] = indptr, indices, data
+        oks.append(ok)
+    out["ok"] = oks[0] & oks[1]
+    return out
+
+
+def _feature_matrices(df: pd.DataFrame, feature_version: str) -> dict:
+    """
+    feature store에서 join해 온 a_vec/b_vec 로 pair별 a/b feature 행렬을 만든다 (row 순서 = csv).
+    store row가 없는 후보는 fv1이면 기존 a_*/b_* 컬럼으로 채우고, 그 외 버전은 ok=False.
+    """
+    dims = pd.concat([df["a_dim"], df["b_dim"]]).dropna().unique()
+    if len(dims) > 1:
+        raise RuntimeError(f"{feature_version}: mixed vector dims in store: {sorted(dims)}")
+    dim = int(dims[0]) if len(dims) else len(FV1_COLS)
+    if pd.concat([df["a_nnz"], df["b_nnz"]]).notna().any():
+        return _sparse_feature_matrices(df, feature_version, dim)
+
+    a, a_ok = _unpack(df["a_vec"], dim)
+    b, b_ok = _unpack(df["b_vec"], dim)
+    if feature_version == "fv1":
+        for m, ok, prefix in ((a, a_ok, "a_"), (b, b_ok, "b_")):
+            legacy = df.loc[~ok, [prefix + c for c in FV1_COLS]].astype(float).to_numpy()
+            m[~ok] = legacy
+        a_ok[:] = True
+        b_ok[:] = True
+        names = FV1_COLS
+    else:
+        names = [f"f{i}" for i in range(dim)]
+
+    return {
+        "a": a,
+        "b": b,
+        "ok": a_ok & b_ok,
+        "feature_version": np.array(feature_version),
+        "names": np.array(names),
+    }
+
 
 def main() -> None:
     engine = create_engine(DB_URL, future=True)
@@ -33,37 +113,52 @@ def main() -> None:
     # - a_* / b_* feature
     # - user_choice / served_policy
     # - winner/loser candidate_id
+    # - a_vec / b_vec: feature store(candidate_features)의 packed vector를 같은 쿼리에서 일괄 join
+    feature_version = os.getenv("EXPORT_FEATURE_VERSION", "fv1").strip()
     df = pd.read_sql(
         text("""
             select
-                feedback_id,
-                feedback_at,
-                question_id,
-                candidate_a_id,
-                candidate_b_id,
-
-                a_provider, a_model, a_len_words, a_has_code, a_step_score, a_has_bullets, a_has_warning,
-                b_provider, b_model, b_len_words, b_has_code, b_step_score, b_has_bullets, b_has_warning,
-
-                user_choice,
-                served_policy,
-                served_choice_candidate_id,
-                winner_candidate_id,
-                loser_candidate_id
-            from v_pairwise_train
-            where user_choice in ('a','b')
-            order by feedback_at desc;
+                v.feedback_id,
+                v.feedback_at,
+                v.question_id,
+                v.candidate_a_id,
+                v.candidate_b_id,
+
+                v.a_provider, v.a_model, v.a_len_words, v.a_has_code, v.a_step_score, v.a_has_bullets, v.a_has_warning,
+                v.b_provider, v.b_model, v.b_len_words, v.b_has_code, v.b_step_score, v.b_has_bullets, v.b_has_warning,
+
+                v.user_choice,
+                v.served_policy,
+                v.served_choice_candidate_id,
+                v.winner_candidate_id,
+                v.loser_candidate_id,
+
+                fa.dim as a_dim, fa.nnz as a_nnz, fa.vec as a_vec,
+                fb.dim as b_dim, fb.nnz as b_nnz, fb.vec as b_vec
+            from v_pairwise_train v
+            left join candidate_features fa
+              on fa.candidate_id = v.candidate_a_id and fa.feature_version = :fv
+            left join candidate_features fb
+              on fb.candidate_id = v.candidate_b_id and fb.feature_version = :fv
+            where v.user_choice in ('a','b')
+            order by v.feedback_at desc;
         """),
         engine,
+        params={"fv": feature_version},
     )
+    mats = _feature_matrices(df, feature_version)
+    df = df.drop(columns=["a_dim", "a_nnz", "a_vec", "b_dim", "b_nnz", "b_vec"])
 
     out_dir = Path("artifacts/trainsets")
     out_dir.mkdir(parents=True, exist_ok=True)
 
     out_csv = out_dir / f"{snapshot_id}.csv"
     out_jsonl = out_dir / f"{snapshot_id}.jsonl"
+    # csv와 row 순서가 같은 feature 행렬 (train_baseline.py 가 있으면 이 값을 사용)
+    out_npz = out_dir / f"{snapshot_id}.features.npz"
 
     df.to_csv(out_csv, index=False, encoding="utf-8")
+    np.savez(out_npz, **mats)
 
     with out_jsonl.open("w", encoding="utf-8") as f:
         for _, row in df.iterrows():
@@ -74,6 +169,7 @@ def main() -> None:
     print(f"- rows      : {len(df)}")
     print(f"- csv       : {out_csv}")
     print(f"- jsonl     : {out_jsonl}")
+    print(f"- features  : {out_npz} ({feature_version}, {int(mats['ok'].sum())}/{len(df)} rows with vectors)")
 
 
 if __name__ == "__main__":
@@ -12,6 +12,9 @@ from sqlalchemy import create_engine, text
 ARTIFACTS_DIR = Path("artifacts")
 MODELS_DIR = ARTIFACTS_DIR / "models"
 
+# API 서버의 ActiveModelResolver가 LISTEN 하는 채널 (src/app/services/model_registry.py)
+MODEL_CHANNEL = "ltr_model_changed"
+
 
 def _pick_meta_path() -> Path:
     """
@@ -78,6 +81,11 @@ def main() -> None:
                 "artifact_path": artifact_path,
             },
         )
+        # commit 시점에 전달됨 → 실행 중인 API 서버가 활성 모델 캐시를 즉시 갱신
+        conn.execute(
+            text("select pg_notify(:channel, :model_version)"),
+            {"channel": MODEL_CHANNEL, "model_version": model_version},
+        )
 
     print("✅ Model registered")
     print(f"- model_version : {model_version}")
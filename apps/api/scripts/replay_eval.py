@@ -0,0 +1,392 @@
+# apps/api/scripts/replay_eval.py
+from __future__ import annotations
+
+import os
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+
+
+ARTIFACTS_DIR = Path("artifacts")
+REPLAY_DIR = ARTIFACTS_DIR / "replay"
+
+FEATURE_VERSION = "fv1"
+
+# serving(src/app/services/scoring.py)과 같은 linear scoring artifact 포맷
+SCORING_FORMAT = "linear_v1"
+
+RULE_POLICY = "rule"
+
+# src/app/services/selector.py 의 rule_score 와 동일한 규칙을 DB에서 계산
+# (answer_summary 본문을 client로 가져오지 않는다; /ask가 저장 전에 strip 하므로 trim 비교로 충분)
+_RULE_SCORE_SQL = """
+    case
+        when trim(coalesce(c.answer_summary, '')) = '' then -999
+        else (case when length(c.answer_summary) > 50 then 1 else 0 end)
+           + (case when c.has_code then 2 else 0 end)
+           + (case when c.answer_summary like '%Step%' or c.answer_summary like '%단계%' then 1 else 0 end)
+    end
+"""
+
+
+# ──────────────────────────────────────────────
+# models
+# ──────────────────────────────────────────────
+
+@dataclass
+class ReplayModel:
+    model_version: str
+    weights: Optional[np.ndarray] = None  # binary linear model이면 coef (w·x 로 순위 결정)
+    intercept: float = 0.0
+    estimator: object = None  # 그 외: predict_proba 가 있는 모델 (joblib)
+
+
+def _pick_model_versions(conn: Connection) -> List[str]:
+    # 1) explicit env (comma separated)
+    env = os.getenv("REPLAY_MODEL_VERSIONS", "").strip()
+    if env:
+        return [v.strip() for v in env.split(",") if v.strip()]
+
+    # 2) latest registered model
+    mv = conn.execute(
+        text("select model_version from models order by trained_at desc limit 1;")
+    ).scalar()
+    return [mv] if mv else []
+
+
+def _load_model(conn: Connection, mv: str) -> ReplayModel:
+    row = conn.execute(
+        text("select artifact_path, metrics_json, feature_version from models where model_version = :mv;"),
+        {"mv": mv},
+    ).fetchone()
+    if not row:
+        raise RuntimeError(f"model_version not found in models: {mv}")
+    artifact_path, metrics, feature_version = row
+    if feature_version != FEATURE_VERSION:
+        raise RuntimeError(f"unsupported feature_version for {mv}: {feature_version}")
+    if isinstance(metrics, str):
+        metrics = json.loads(metrics)
+    metrics = metrics or {}
+
+    # 1) scoring artifact (linear) — sklearn/joblib 없이
+    p = Path(artifact_path)
+    scoring_path = Path(metrics.get("scoring_artifact_path") or p.with_name(f"{p.stem}.scoring.json"))
+    if scoring_path.exists():
+        art = json.loads(scoring_path.read_text(encoding="utf-8"))
+        if art.get("format") != SCORING_FORMAT:
+            raise RuntimeError(f"unsupported scoring artifact format: {art.get('format')!r}")
+        return ReplayModel(mv, weights=np.asarray(art["coef"], dtype=float), intercept=float(art["intercept"]))
+
+    # 2) joblib fallback
+    import joblib
+
+    est = joblib.load(str(p))
+    coef = getattr(est, "coef_", None)
+    classes = getattr(est, "classes_", None)
+    if coef is not None and np.asarray(coef).shape[0] == 1 and classes is not None and [int(c) for c in classes] == [0, 1]:
+        return ReplayModel(mv, weights=np.asarray(coef, dtype=float)[0], intercept=float(np.asarray(est.intercept_).reshape(-1)[0]))
+    if not hasattr(est, "predict_proba"):
+        raise RuntimeError(f"model {mv} has no predict_proba")
+    return ReplayModel(mv, estimator=est)
+
+
+# ──────────────────────────────────────────────
+# streaming
+# ──────────────────────────────────────────────
+
+def _window_sql() -> Tuple[str, dict]:
+    where, params = [], {}
+    since = os.getenv("REPLAY_SINCE", "").strip()
+    until = os.getenv("REPLAY_UNTIL", "").strip()
+    if since:
+        where.append("s.created_at >= :since")
+        params["since"] = since
+    if until:
+        where.append("s.created_at < :until")
+        params["until"] = until
+    return (" and ".join(where) or "true"), params
+
+
+def _stream(conn: Connection, sql: str, params: dict, fetch: int) -> Iterator:
+    # server-side cursor: 결과 전체를 client 메모리에 올리지 않고 fetch 행씩 가져온다
+    result = conn.execution_options(stream_results=True, yield_per=fetch).execute(text(sql), params)
+    for row in result:
+        yield row
+
+
+def _stream_candidates(conn: Connection, fetch: int) -> Iterator:
+    """selections ⋈ candidates, question_id 순 (feedback stream과 merge 하기 위해)."""
+    where, params = _window_sql()
+    sql = f"""
+        select
+            s.selection_id, s.question_id, s.served_choice_candidate_id,
+            c.candidate_id,
+            c.len_words, c.has_code, c.step_score, c.has_bullets, c.has_warning,
+            {_RULE_SCORE_SQL} as rule_score,
+            case when c.candidate_id = s.rule_choice_candidate_id then 1 else 0 end as is_rule_choice
+        from selections s
+        join candidates c on c.question_id = s.question_id
+        where {where}
+        order by s.question_id, s.selection_id, c.candidate_id;
+    """
+    return _stream(conn, sql, params, fetch)
+
+
+def _stream_feedback(conn: Connection, fetch: int) -> Iterator:
+    where, params = _window_sql()
+    sql = f"""
+        select f.question_id, f.candidate_a_id, f.candidate_b_id, f.user_choice
+        from feedback_pairwise f
+        where f.user_choice in ('a', 'b')
+          and f.question_id in (select s.question_id from selections s where {where})
+        order by f.question_id;
+    """
+    return _stream(conn, sql, params, fetch)
+
+
+class _FeedbackCursor:
+    """question_id 순으로 정렬된 feedback stream을 selections stream과 merge."""
+
+    def __init__(self, rows: Iterator) -> None:
+        self._rows = rows
+        self._head = next(self._rows, None)
+        self._last: Tuple[Optional[str], List[Tuple[str, str, str]]] = (None, [])
+
+    def pairs_for(self, qid: str) -> List[Tuple[str, str, str]]:
+        if self._last[0] == qid:  # 같은 question의 selection이 여러 개인 경우
+            return self._last[1]
+        out: List[Tuple[str, str, str]] = []
+        while self._head is not None and str(self._head[0]) <= qid:
+            if str(self._head[0]) == qid:
+                out.append((str(self._head[1]), str(self._head[2]), str(self._head[3])))
+            self._head = next(self._rows, None)
+        self._last = (qid, out)
+        return out
+
+
+# ──────────────────────────────────────────────
+# chunk scoring (vectorized)
+# ──────────────────────────────────────────────
+
+@dataclass
+class _Chunk:
+    features: List[List[float]] = field(default_factory=list)
+    rule_scores: List[float] = field(default_factory=list)
+    is_rule_choice: List[int] = field(default_factory=list)
+    candidate_ids: List[str] = field(default_factory=list)
+    group: List[int] = field(default_factory=list)
+    served: List[str] = field(default_factory=list)
+    pairs: List[Tuple[int, str, str, str]] = field(default_factory=list)  # (group, a, b, choice)
+
+    @property
+    def n_groups(self) -> int:
+        return len(self.served)
+
+
+@dataclass
+class PolicyStats:
+    questions: int = 0
+    agree_served: int = 0
+    fb_wins: int = 0
+    fb_losses: int = 0
+    fb_neither: int = 0
+    pair_correct: float = 0.0
+    pair_total: int = 0
+
+    def report(self) -> dict:
+        decided = self.fb_wins + self.fb_losses
+        return {
+            **self.__dict__,
+            "agree_served_rate": self.agree_served / self.questions if self.questions else None,
+            "fb_win_rate": self.fb_wins / decided if decided else None,
+            "pair_accuracy": self.pair_correct / self.pair_total if self.pair_total else None,
+        }
+
+
+def _pair_index(offsets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """같은 group 안의 모든 ordered pair (i, j), i != j 의 전역 row index (group 크기별로 한 번에)."""
+    sizes = np.diff(offsets)
+    starts = offsets[:-1]
+    ii, jj = [], []
+    for n in np.unique(sizes):
+        if n < 2:
+            continue
+        pi, pj = np.nonzero(~np.eye(n, dtype=bool))
+        s = starts[sizes == n][:, None]
+        ii.append((s + pi[None, :]).reshape(-1))
+        jj.append((s + pj[None, :]).reshape(-1))
+    if not ii:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    return np.concatenate(ii), np.concatenate(jj)
+
+
+def _model_scores(model: ReplayModel, X: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    후보별 점수 (group 내 argmax가 선택).
+    - linear: w·x (tournament 평균 승률과 같은 순위, ranker._linear_weights 참고)
+    - 그 외: group 내 평균 승률, 모든 pair를 predict_proba 1회로 계산
+    """
+    if model.weights is not None:
+        return X @ model.weights
+
+    i, j = _pair_index(offsets)
+    m = X.shape[0]
+    if i.size == 0:
+        return np.ones(m)
+    p = np.asarray(model.estimator.predict_proba(X[i] - X[j])[:, 1], dtype=float)
+    wins = np.bincount(i, weights=p, minlength=m)
+    opp = np.repeat(np.diff(offsets) - 1, np.diff(offsets)).astype(float)
+    return np.divide(wins, opp, out=np.ones(m), where=opp > 0)
+
+
+def _choose(scores: np.ndarray, group: np.ndarray, offsets: np.ndarray, prefer: Optional[np.ndarray] = None) -> np.ndarray:
+    """group별 최고 점수 row (동점: prefer=1 우선, 그다음 입력 순서)."""
+    idx = np.arange(scores.shape[0])
+    keys = (idx,) if prefer is None else (idx, -prefer)
+    order = np.lexsort(keys + (-scores, group))
+    return order[offsets[:-1]]
+
+
+def _score_chunk(chunk: _Chunk, models: List[ReplayModel], stats: Dict[str, PolicyStats]) -> None:
+    X = np.asarray(chunk.features, dtype=float)
+    group = np.asarray(chunk.group, dtype=int)
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(group, minlength=chunk.n_groups))])
+    cids = np.asarray(chunk.candidate_ids, dtype=object)
+    served = np.asarray(chunk.served, dtype=object)
+
+    # feedback pair → (winner row, loser row)
+    row_of = {(g, c): r for r, (g, c) in enumerate(zip(chunk.group, chunk.candidate_ids))}
+    pg, pw, pl = [], [], []
+    for g, a, b, choice in chunk.pairs:
+        ra, rb = row_of.get((g, a)), row_of.get((g, b))
+        if ra is None or rb is None:
+            continue
+        pg.append(g)
+        pw.append(ra if choice == "a" else rb)
+        pl.append(rb if choice == "a" else ra)
+    pg_a, pw_a, pl_a = (np.asarray(v, dtype=int) for v in (pg, pw, pl))
+
+    policies = [(RULE_POLICY, np.asarray(chunk.rule_scores, dtype=float), np.asarray(chunk.is_rule_choice, dtype=int))]
+    policies += [(m.model_version, _model_scores(m, X, offsets), None) for m in models]
+
+    for name, scores, prefer in policies:
+        st = stats[name]
+        choice = _choose(scores, group, offsets, prefer)
+        st.questions += chunk.n_groups
+        st.agree_served += int(np.sum(cids[choice] == served))
+        if pg_a.size:
+            chosen = choice[pg_a]
+            st.fb_wins += int(np.sum(chosen == pw_a))
+            st.fb_losses += int(np.sum(chosen == pl_a))
+            st.fb_neither += int(np.sum((chosen != pw_a) & (chosen != pl_a)))
+            sw, sl = scores[pw_a], scores[pl_a]
+            st.pair_correct += float(np.sum(sw > sl) + 0.5 * np.sum(sw == sl))
+            st.pair_total += int(pg_a.size)
+
+
+# ──────────────────────────────────────────────
+# main
+# ──────────────────────────────────────────────
+
+def _utc_now_compact() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+
+
+def main() -> None:
+    load_dotenv()
+
+    db_url = os.getenv("DB_URL", "").strip()
+    if not db_url:
+        raise RuntimeError("DB_URL is empty. Set it in apps/api/.env")
+
+    chunk_size = max(1, int(os.getenv("REPLAY_CHUNK", "10000")))  # selections per scoring batch
+    fetch = max(1, int(os.getenv("REPLAY_FETCH", "20000")))  # rows per server-side fetch
+
+    engine = create_engine(db_url, future=True)
+
+    with engine.connect() as meta_conn:
+        versions = _pick_model_versions(meta_conn)
+        models = [_load_model(meta_conn, mv) for mv in versions]
+    print(f"Replaying policies: {[RULE_POLICY] + versions}")
+
+    stats: Dict[str, PolicyStats] = {name: PolicyStats() for name in [RULE_POLICY] + versions}
+    n_rows = 0
+    t_score = 0.0
+    t0 = time.perf_counter()
+
+    # candidates / feedback stream은 각자 server-side cursor (connection 2개)
+    with engine.connect() as cand_conn, engine.connect() as fb_conn:
+        feedback = _FeedbackCursor(_stream_feedback(fb_conn, fetch))
+        chunk = _Chunk()
+        last_sel = None
+
+        def flush() -> None:
+            nonlocal chunk, t_score
+            if chunk.n_groups:
+                ts = time.perf_counter()
+                _score_chunk(chunk, models, stats)
+                t_score += time.perf_counter() - ts
+            chunk = _Chunk()
+
+        for row in _stream_candidates(cand_conn, fetch):
+            (sel_id, qid, served_id, cid, lw, hc, ss, hb, hw, rscore, is_rule) = row
+            if sel_id != last_sel:
+                if chunk.n_groups >= chunk_size:
+                    flush()
+                last_sel = sel_id
+                g = chunk.n_groups
+                chunk.served.append(str(served_id))
+                for a, b, choice in feedback.pairs_for(str(qid)):
+                    chunk.pairs.append((g, a, b, choice))
+
+            chunk.group.append(chunk.n_groups - 1)
+            chunk.candidate_ids.append(str(cid))
+            chunk.features.append([float(lw), float(int(bool(hc))), float(ss), float(int(bool(hb))), float(int(bool(hw)))])
+            chunk.rule_scores.append(float(rscore))
+            chunk.is_rule_choice.append(int(is_rule))
+            n_rows += 1
+
+        flush()
+
+    elapsed = time.perf_counter() - t0
+    n_questions = stats[RULE_POLICY].questions
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "window": {"since": os.getenv("REPLAY_SINCE") or None, "until": os.getenv("REPLAY_UNTIL") or None},
+        "policies": {name: st.report() for name, st in stats.items()},
+        "throughput": {
+            "candidate_rows": n_rows,
+            "selections": n_questions,
+            "elapsed_s": elapsed,
+            "scoring_s": t_score,
+            "rows_per_s": n_rows / elapsed if elapsed > 0 else None,
+            "selections_per_s": n_questions / elapsed if elapsed > 0 else None,
+        },
+    }
+
+    REPLAY_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = REPLAY_DIR / f"replay_{_utc_now_compact()}.json"
+    out_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print("✅ Replay complete")
+    print(f"- selections    : {n_questions} ({n_rows} candidate rows)")
+    print(f"- elapsed       : {elapsed:.2f}s (scoring {t_score:.2f}s)")
+    for name, r in report["policies"].items():
+        print(
+            f"- {name:<28}: agree_served={r['agree_served_rate']} "
+            f"fb_win_rate={r['fb_win_rate']} pair_acc={r['pair_accuracy']}"
+        )
+    print(f"- report        : {out_path}")
+
+
+if __name__ == "__main__":
+    main()
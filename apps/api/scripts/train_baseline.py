@@ -12,6 +12,7 @@ from typing import Optional, Tuple
 import numpy as np
 import pandas as pd
 import joblib
+from scipy import sparse
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 from sklearn.dummy import DummyClassifier
@@ -26,6 +27,14 @@ MODELS_DIR = ARTIFACTS_DIR / "models"
 FEATURE_COLS_A = ["a_len_words", "a_has_code", "a_step_score", "a_has_bullets", "a_has_warning"]
 FEATURE_COLS_B = ["b_len_words", "b_has_code", "b_step_score", "b_has_bullets", "b_has_warning"]
 
+FEATURE_VERSION = "fv1"
+FEATURES = ["len_words_diff", "has_code_diff", "step_score_diff", "has_bullets_diff", "has_warning_diff"]
+
+# serving(src/app/services/scoring.py)이 sklearn/joblib 없이 읽는 linear scoring artifact 포맷
+SCORING_FORMAT = "linear_v1"
+# hashed(sparse) feature version: 0이 아닌 coef만 (indices, coef) + n_features
+SPARSE_SCORING_FORMAT = "linear_sparse_v1"
+
 
 @dataclass
 class TrainResult:
@@ -108,6 +117,43 @@ def _build_X_y(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
     return X, y
 
 
+def _load_feature_matrices(trainset_path: Path) -> Optional[dict]:
+    """
+    export_trainset.py 가 같이 쓴 <snapshot_id>.features.npz (feature store 벡터, csv와 같은 row 순서).
+    없으면 None → csv의 a_*/b_* 컬럼 사용.
+    sparse 버전(n_features 키가 있는 npz)은 X = A - B 를 CSR 그대로 만든다 (dense로 펼치지 않음).
+    """
+    npz_path = trainset_path.with_name(f"{trainset_path.stem}.features.npz")
+    if not npz_path.exists():
+        return None
+    with np.load(npz_path, allow_pickle=False) as z:
+        if "n_features" in z:
+            n_features = int(z["n_features"])
+            n_rows = len(z["ok"])
+            a, b = (
+                sparse.csr_matrix(
+                    (z[f"{s}_data"].astype(float), z[f"{s}_indices"], z[f"{s}_indptr"]),
+                    shape=(n_rows, n_features),
+                )
+                for s in ("a", "b")
+            )
+            return {
+                "path": npz_path,
+                "X": (a - b).tocsr(),
+                "ok": z["ok"].astype(bool),
+                "feature_version": str(z["feature_version"]),
+                "features": [],
+                "n_features": n_features,
+            }
+        return {
+            "path": npz_path,
+            "X": (z["a"].astype(float) - z["b"].astype(float)),
+            "ok": z["ok"].astype(bool),
+            "feature_version": str(z["feature_version"]),
+            "features": [f"{n}_diff" for n in z["names"].tolist()],
+        }
+
+
 def _train_model(X: np.ndarray, y: np.ndarray):
     classes = np.unique(y)
     if len(classes) < 2:
@@ -126,6 +172,53 @@ def _train_model(X: np.ndarray, y: np.ndarray):
     return model
 
 
+def _write_scoring_artifact(
+    model,
+    model_version: str,
+    path: Path,
+    feature_version: str = FEATURE_VERSION,
+    features: Optional[list] = None,
+    n_features: Optional[int] = None,
+) -> bool:
+    """
+    binary linear model이면 <model_version>.scoring.json 을 쓴다 (coef/intercept/feature 순서).
+    n_features가 주어지면 (sparse 버전) 0이 아닌 coef만 indices/coef 로 쓴다.
+    DummyClassifier 등 비선형/비지원 모델은 쓰지 않고 False (serving은 joblib fallback).
+    """
+    coef = getattr(model, "coef_", None)
+    if coef is None:
+        return False
+    coef = np.asarray(coef, dtype=float)
+    if coef.ndim != 2 or coef.shape[0] != 1 or [int(c) for c in model.classes_] != [0, 1]:
+        return False
+
+    intercept = float(np.asarray(model.intercept_).reshape(-1)[0])
+    if n_features is not None:
+        nz = np.flatnonzero(coef[0])
+        artifact = {
+            "format": SPARSE_SCORING_FORMAT,
+            "model_version": model_version,
+            "feature_version": feature_version,
+            "n_features": int(n_features),
+            "indices": nz.tolist(),
+            "coef": coef[0][nz].tolist(),
+            "intercept": intercept,
+        }
+        path.write_text(json.dumps(artifact, ensure_ascii=False), encoding="utf-8")
+        return True
+
+    artifact = {
+        "format": SCORING_FORMAT,
+        "model_version": model_version,
+        "feature_version": feature_version,
+        "features": features or FEATURES,
+        "coef": coef[0].tolist(),
+        "intercept": intercept,
+    }
+    path.write_text(json.dumps(artifact, ensure_ascii=False, indent=2), encoding="utf-8")
+    return True
+
+
 def main() -> None:
     _ensure_dirs()
 
@@ -136,13 +229,25 @@ def main() -> None:
     df = pd.read_csv(trainset_path)
     print(f"raw rows: {len(df)}")
 
+    feature_version, features, n_features = FEATURE_VERSION, FEATURES, None
+    fm = _load_feature_matrices(trainset_path)
+    keep = df["winner_candidate_id"].notna().to_numpy()
+    if fm is not None:
+        if fm["X"].shape[0] != len(df):
+            raise RuntimeError(f"{fm['path']}: {fm['X'].shape[0]} rows != trainset {len(df)}")
+        keep &= fm["ok"]
+        feature_version, features, n_features = fm["feature_version"], fm["features"], fm.get("n_features")
+        print(f"Using feature store matrix: {fm['path']} ({feature_version})")
+
     # Keep only winner-labeled rows (already should be filtered by export)
-    df = df.dropna(subset=["winner_candidate_id"])
+    df = df[keep]
     print(f"rows after winner filter: {len(df)}")
     if len(df) < 2:
         raise RuntimeError("Not enough rows to train. Need at least 2.")
 
     X, y = _build_X_y(df)
+    if fm is not None:
+        X = fm["X"][keep]
     classes, counts = np.unique(y, return_counts=True)
     print(f"class distribution: {dict(zip(classes.tolist(), counts.tolist()))}")
 
@@ -172,8 +277,10 @@ def main() -> None:
     model_version = f"baseline_lr_{_utc_now_compact()}"
     model_path = MODELS_DIR / f"{model_version}.pkl"
     meta_path = MODELS_DIR / f"{model_version}.json"
+    scoring_path = MODELS_DIR / f"{model_version}.scoring.json"
 
     joblib.dump(model, model_path)
+    has_scoring = _write_scoring_artifact(model, model_version, scoring_path, feature_version, features, n_features)
 
     metrics = {
         "accuracy": acc,
@@ -182,8 +289,11 @@ def main() -> None:
         "n_train": int(len(y_train)),
         "n_valid": int(len(y_valid)),
         "class_counts_total": {str(int(k)): int(v) for k, v in zip(classes, counts)},
-        "feature_version": "fv1",
-        "features": ["len_words_diff", "has_code_diff", "step_score_diff", "has_bullets_diff", "has_warning_diff"],
+        "feature_version": feature_version,
+        "features": features,
+        "n_features": n_features,
+        # serving은 이 파일이 있으면 joblib 대신 사용
+        "scoring_artifact_path": str(scoring_path).replace("\\", "/") if has_scoring else None,
     }
 
     meta = {
@@ -203,6 +313,8 @@ def main() -> None:
     print(f"- roc_auc       : {auc}")
     print(f"- saved model   : {model_path}")
     print(f"- saved meta    : {meta_path}")
+    if has_scoring:
+        print(f"- saved scoring : {scoring_path}")
 
 
 if __name__ == "__main__":
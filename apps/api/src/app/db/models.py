@@ -12,6 +12,8 @@ from sqlalchemy import (
     Text,
     JSON,
     Enum,
+    LargeBinary,
+    PrimaryKeyConstraint,
 )
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
@@ -126,6 +128,34 @@ class Candidate(Base):
     )
 
 
+class CandidateFeature(Base):
+    """
+    feature store: (candidate_id, feature_version) → packed float32 vector.
+    새 feature version은 row만 추가하면 되고 candidates 테이블은 넓어지지 않는다.
+    vec 포맷은 services/feature_store.py:
+    - dense (nnz NULL): big-endian float32 x dim (PG float4send와 동일)
+    - sparse (fvh1 등): big-endian int32 indices x nnz + float32 values x nnz, dim = 전체 폭
+    """
+
+    __tablename__ = "candidate_features"
+    __table_args__ = (PrimaryKeyConstraint("candidate_id", "feature_version"),)
+
+    candidate_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("candidates.candidate_id", ondelete="CASCADE"), nullable=False
+    )
+    feature_version: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    dim: Mapped[int] = mapped_column(Integer, nullable=False)
+    nnz: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    vec: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+
 class Selection(Base):
     __tablename__ = "selections"
 
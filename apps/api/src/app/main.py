@@ -1,13 +1,19 @@
 # apps/api/src/app/main.py
 from __future__ import annotations
 
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.app.routers.ask import router as ask_router
 from src.app.routers.feedback import router as feedback_router
 from src.app.routers.admin import router as admin_router
-from src.app.services.llm.registry import build_default_registry
+from src.app.routers.rank import router as rank_router
+from src.app.services.llm.registry import areset_registry, build_default_registry
+from src.app.services.model_registry import ACTIVE_MODEL
+from src.app.services.ranker import preload_active_model
+from src.app.services.shadow import LTR_SHADOW
 
 
 APP_TITLE = "Multi-LLM Answer Selection API"
@@ -49,9 +55,35 @@ def health():
 app.include_router(ask_router, prefix=API_PREFIX, tags=["ask"])
 app.include_router(feedback_router, prefix=API_PREFIX, tags=["feedback"])
 app.include_router(admin_router, prefix=API_PREFIX, tags=["admin"])
+app.include_router(rank_router, prefix=API_PREFIX, tags=["rank"])
 
 @app.on_event("startup")
 def startup():
     build_default_registry()
     print("[BOOT] LLM registry initialized")
 
+    # 활성 LTR 모델 preload (첫 /ask가 artifact 로드 비용을 내지 않도록)
+    from src.app.dependencies import SessionLocal, engine
+
+    db = SessionLocal()
+    try:
+        mv = preload_active_model(db)
+        print(f"[BOOT] LTR model preloaded: {mv}")
+    except Exception as e:
+        print(f"[BOOT] LTR model preload skipped: {e!r}")
+    finally:
+        db.close()
+
+    # 활성 LTR 모델 캐시: register_model.py의 NOTIFY(불가하면 polling)로 갱신,
+    # 새 버전은 이 background 스레드에서 로드 후 교체된다
+    if os.getenv("LTR_MODEL_LISTEN", "1").strip() == "1":
+        ACTIVE_MODEL.start(engine)
+        print("[BOOT] LTR active-model resolver started")
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await areset_registry()
+    print("[SHUTDOWN] LLM registry closed")
+    ACTIVE_MODEL.stop()
+    LTR_SHADOW.shutdown(wait=True)  # 대기 중인 shadow back-fill 마무리
@@ -10,6 +10,14 @@ from sqlalchemy.orm import Session
 
 from src.app.dependencies import get_db
 from src.app.db.models import FeedbackPairwise, Selection, ModelRegistry
+from src.app.services.answer_cache import ANSWER_CACHE
+from src.app.services.feature_store import FEATURE_STORE
+from src.app.services.llm.latency import LATENCY
+from src.app.services.single_flight import CANDIDATE_FLIGHTS
+from src.app.services.llm.registry import build_default_registry
+from src.app.services.model_registry import ACTIVE_MODEL
+from src.app.services.ranker import MODEL_CACHE, TRAFFIC_SPLIT
+from src.app.services.shadow import LTR_SHADOW
 
 router = APIRouter()
 
@@ -25,6 +33,31 @@ class StatsResponse(BaseModel):
     ltr_served: int
 
 
+class CacheStatsResponse(BaseModel):
+    enabled: bool
+    memory_hits: int
+    db_hits: int
+    misses: int
+    bypass: int
+    hit_rate: float
+    memory_entries: int
+    coalesced: int
+
+
+class LLMStatusResponse(BaseModel):
+    breakers: dict
+    latency: dict
+    rate_limits: dict
+
+
+class LTRStatusResponse(BaseModel):
+    model_cache: dict
+    active_model: dict
+    traffic_split: dict
+    shadow: dict
+    feature_store: dict
+
+
 class ModelRecord(BaseModel):
     model_version: str
     feature_version: str
@@ -104,3 +137,65 @@ def get_models(db: Session = Depends(get_db)):
         )
         for r in rows
     ]
+
+
+# ──────────────────────────────────────────────
+# GET /admin/cache
+# ──────────────────────────────────────────────
+
+@router.get("/admin/cache", response_model=CacheStatsResponse, tags=["admin"])
+def get_cache_stats():
+    """
+    후보 답변 캐시 hit/miss 카운터 (process 단위, 재시작 시 초기화).
+    - memory_hits: tier 1 (in-process LRU) hit
+    - db_hits: tier 2 (저장된 candidates) hit
+    - bypass: bypass_cache 요청으로 건너뛴 엔진 호출 수
+    - coalesced: 진행 중인 같은 질문의 생성에 합류한 /ask 수 (single-flight)
+    """
+    return CacheStatsResponse(
+        **ANSWER_CACHE.stats(),
+        coalesced=CANDIDATE_FLIGHTS.stats()["coalesced"],
+    )
+
+
+# ──────────────────────────────────────────────
+# GET /admin/llm
+# ──────────────────────────────────────────────
+
+@router.get("/admin/llm", response_model=LLMStatusResponse, tags=["admin"])
+def get_llm_status():
+    """
+    provider/model별 circuit breaker 상태와 최근 latency 분위수 (process 단위).
+    - breakers: state(closed/open/half_open), consecutive_failures, short_circuited
+    - latency: n, p50_ms, p90_ms
+    - rate_limits: 제한이 설정된 provider/model의 inflight, queue_depth, 대기 시간, rejected
+    """
+    reg = build_default_registry()
+    return LLMStatusResponse(
+        breakers=reg.breakers.snapshot(),
+        latency=LATENCY.snapshot(),
+        rate_limits=reg.limiters.snapshot(),
+    )
+
+
+# ──────────────────────────────────────────────
+# GET /admin/ltr
+# ──────────────────────────────────────────────
+
+@router.get("/admin/ltr", response_model=LTRStatusResponse, tags=["admin"])
+def get_ltr_status():
+    """
+    LTR serving 상태 (process 단위).
+    - model_cache: 상주 모델 버전, serving_version, hits/loads/evictions
+    - active_model: 최신 모델 resolver (mode: listen/poll/lazy)
+    - traffic_split: LTR_TRAFFIC_SPLIT arm별 weight, 라우팅 수, 서빙 arm 선택과의 일치율
+    - shadow: LTR_SHADOW back-fill 작업 수 (submitted/scored/failed/dropped/pending)
+    - feature_store: candidate feature LRU hit/store/computed 수와 hit rate
+    """
+    return LTRStatusResponse(
+        model_cache=MODEL_CACHE.stats(),
+        active_model=ACTIVE_MODEL.stats(),
+        traffic_split=TRAFFIC_SPLIT.stats(),
+        shadow=LTR_SHADOW.stats(),
+        feature_store=FEATURE_STORE.stats(),
+    )
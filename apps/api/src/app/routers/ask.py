@@ -2,18 +2,26 @@
 from __future__ import annotations
 
 import os
+import json
+import time
 import hashlib
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from src.app.schemas import AskRequest, AskResponse
-from src.app.dependencies import get_db
+from src.app.dependencies import SessionLocal, get_db
 from src.app.db.models import UserAnon, Context, Question, Candidate, Selection
-from src.app.services.generator import generate_candidates_v1
+from src.app.services.early_decision import EarlyDecision, early_min_prob
+from src.app.services.feature_store import FEATURE_STORE
+from src.app.services.features import FV1
+from src.app.services.generator import agenerate_candidates_v1, astream_candidates_v1
 from src.app.services.selector import rule_select
-from src.app.services.ranker import ltr_choose_best
+from src.app.services.ranker import ltr_choose_best, ltr_lead
+from src.app.services.shadow import LTR_SHADOW, shadow_enabled
 
 router = APIRouter()
 
@@ -22,25 +30,24 @@ def _sha256(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
 
-def _has_code(text: str) -> bool:
-    return "```" in (text or "")
+def _deadline_ts() -> float:
+    # /ask 전체 SLA: 후보 생성(호출 + 재시도)이 이 시각 안에 끝나도록 EngineRequest까지 전달
+    return time.time() + float(os.getenv("ASK_DEADLINE_S", "30"))
 
 
-def _has_bullets(text: str) -> bool:
-    t = (text or "")
-    return ("\n-" in t) or ("\n*" in t) or ("\n•" in t)
-
-
-def _has_warning(text: str) -> bool:
-    t = (text or "").lower()
-    return ("warning" in t) or ("주의" in t) or ("주의사항" in t)
-
-
-@router.post("/ask", response_model=AskResponse)
-def ask(request: AskRequest, db: Session = Depends(get_db)):
+def _served_policy_env() -> str:
     served_policy_env = os.getenv("SERVED_POLICY", "rule").strip().lower()
     if served_policy_env not in ("rule", "ltr"):
         served_policy_env = "rule"
+    return served_policy_env
+
+
+def _persist_and_select(db: Session, request: AskRequest, results: List[dict]) -> AskResponse:
+    """
+    생성된 후보를 저장하고 rule/LTR 선택까지 수행한다 (sync DB 구간).
+    async handler에서는 run_in_threadpool 로 호출한다.
+    """
+    served_policy_env = _served_policy_env()
 
     try:
         # 1) User
@@ -70,21 +77,11 @@ def ask(request: AskRequest, db: Session = Depends(get_db)):
         db.add(question)
         db.flush()
 
-        # 4) Generate candidates (LLM pipeline)
-        results = generate_candidates_v1(
-            question=request.question,
-            role=request.user.role,
-            level=request.user.level,
-            goal=request.context.goal,
-            stack=request.context.stack,
-            constraints=request.context.constraints,
-            domain=request.domain,
-        )
-
         # 5) Persist candidates
         db_candidates: List[Candidate] = []
         for r in results:
             ans = (r.get("answer_summary") or "").strip()
+            feats = FV1.extract(ans)  # fv1 전체를 한 번에 (rule 선택도 이 값을 재사용)
 
             cand = Candidate(
                 question_id=question.question_id,
@@ -96,15 +93,14 @@ def ask(request: AskRequest, db: Session = Depends(get_db)):
                 params_json=r.get("params_json") or {},
                 answer_hash=_sha256(ans),
                 answer_summary=ans,
-                feature_version="fv1",
-                has_code=_has_code(ans),
-                len_words=len(ans.split()),
-                step_score=1 if ("Step" in ans or "단계" in ans) else 0,
-                has_bullets=_has_bullets(ans),
-                has_warning=_has_warning(ans),
+                feature_version=FV1.version,
+                **feats,
             )
             db.add(cand)
             db.flush()
+            FEATURE_STORE.add(db, cand.candidate_id, FV1, feats)
+            for fv in FEATURE_STORE.extra_versions:  # FEATURE_STORE_EXTRA_VERSIONS (예: fvh1)
+                FEATURE_STORE.add(db, cand.candidate_id, fv, fv.extract(ans))
             db_candidates.append(cand)
 
         if len(db_candidates) < 2:
@@ -117,6 +113,7 @@ def ask(request: AskRequest, db: Session = Depends(get_db)):
                 "model": c.model,
                 "answer_summary": c.answer_summary,
                 "has_code": bool(c.has_code),
+                "step_score": c.step_score,
             }
             for c in db_candidates
         ]
@@ -131,7 +128,9 @@ def ask(request: AskRequest, db: Session = Depends(get_db)):
         ltr_error: Optional[str] = None
 
         if served_policy_env == "ltr":
-            ltr_choice, ltr_model_version, ltr_error = ltr_choose_best(db, db_candidates)
+            ltr_choice, ltr_model_version, ltr_error = ltr_choose_best(
+                db, db_candidates, question_id=question.question_id
+            )
             if ltr_choice is not None:
                 ltr_choice_id = ltr_choice.candidate_id
 
@@ -153,12 +152,21 @@ def ask(request: AskRequest, db: Session = Depends(get_db)):
             served_choice_candidate_id=served_choice.candidate_id,
             served_policy=served_policy,
             model_version=served_model_version,
-            feature_version="fv1",
+            feature_version=FV1.version,
         )
         db.add(selection)
 
+        # rule 서빙 중이면 LTR 선택은 응답 이후 background에서 계산해 back-fill (shadow)
+        shadow_job = None
+        if served_policy_env == "rule" and shadow_enabled():
+            db.flush()  # selection_id 확보 (commit이 어차피 flush 하므로 추가 round trip 없음)
+            shadow_job = LTR_SHADOW.prepare(selection.selection_id, question.question_id, db_candidates)
+
         db.commit()
 
+        if shadow_job is not None:
+            LTR_SHADOW.submit(shadow_job)
+
         # Pairwise convenience ids: first two candidates (A,B)
         cand_a = db_candidates[0]
         cand_b = db_candidates[1]
@@ -179,3 +187,109 @@ def ask(request: AskRequest, db: Session = Depends(get_db)):
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/ask", response_model=AskResponse)
+async def ask(request: AskRequest, db: Session = Depends(get_db)):
+    """
+    async handler:
+    - LLM 후보 생성은 event loop에서 await (threadpool worker를 점유하지 않음)
+    - DB 저장/선택은 생성이 끝난 뒤 threadpool에서 한 번에 수행 (트랜잭션이 LLM 대기 동안 열려 있지 않음)
+    """
+    deadline_ts = _deadline_ts()
+    try:
+        # Generate candidates (LLM pipeline) — DB 작업 전에 수행
+        results = await agenerate_candidates_v1(
+            question=request.question,
+            role=request.user.role,
+            level=request.user.level,
+            goal=request.context.goal,
+            stack=request.context.stack,
+            constraints=request.context.constraints,
+            domain=request.domain,
+            db=db,
+            bypass_cache=request.bypass_cache,
+            deadline_ts=deadline_ts,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return await run_in_threadpool(_persist_and_select, db, request, results)
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/ask/stream")
+async def ask_stream(request: AskRequest):
+    """
+    Server-Sent Events 버전의 /ask.
+    - event: delta           → 후보별 token delta (provider로 후보 구분)
+    - event: candidate_done  → 후보 1개 완료 (latency/error)
+    - event: early_selection → (SERVED_POLICY=ltr, LTR_EARLY_MIN_PROB > 0) stream 도중 부분 답변 feature로
+                               LTR 1위가 충분히 확실해지면 1회 (참고용, 최종 선택은 selection)
+    - event: selection       → 모든 스트림 완료 후 저장 + rule/LTR 선택 결과 (AskResponse 형식)
+    - event: error           → 저장/선택 실패
+    DB에는 모든 스트림이 끝난 뒤에만 저장한다.
+    """
+
+    async def _events() -> AsyncIterator[str]:
+        # 스트리밍 응답은 dependency 수명과 분리되므로 세션을 직접 연다
+        db = SessionLocal()
+        try:
+            async for chunk in _stream(db):
+                yield chunk
+        finally:
+            db.close()
+
+    deadline_ts = _deadline_ts()
+
+    async def _stream(db: Session) -> AsyncIterator[str]:
+        candidates: List[dict] = []
+        min_prob = early_min_prob()
+        early = EarlyDecision(min_prob) if min_prob > 0 and _served_policy_env() == "ltr" else None
+        try:
+            async for ev in astream_candidates_v1(
+                question=request.question,
+                role=request.user.role,
+                level=request.user.level,
+                goal=request.context.goal,
+                stack=request.context.stack,
+                constraints=request.context.constraints,
+                domain=request.domain,
+                db=db,
+                bypass_cache=request.bypass_cache,
+                deadline_ts=deadline_ts,
+            ):
+                if ev["type"] == "requests":
+                    if early is not None:
+                        early.start(ev["requests"])
+                    continue
+                if ev["type"] == "candidates":
+                    candidates = ev["candidates"]
+                    continue
+                yield _sse(ev["type"], {k: v for k, v in ev.items() if k != "type"})
+
+                if early is not None and early.observe(ev):
+                    # question은 아직 저장 전 → split 라우팅 없이 활성 모델 기준
+                    X, live = early.snapshot()
+                    best, p, mv, _ = await run_in_threadpool(ltr_lead, db, X)
+                    decided = early.decide(live, best, p, mv)
+                    if decided is not None:
+                        yield _sse("early_selection", decided)
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
+            return
+
+        try:
+            resp = await run_in_threadpool(_persist_and_select, db, request, candidates)
+            yield _sse("selection", resp.model_dump(mode="json"))
+        except HTTPException as e:
+            yield _sse("error", {"detail": e.detail})
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
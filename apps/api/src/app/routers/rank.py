@@ -0,0 +1,108 @@
+# apps/api/src/app/routers/rank.py
+from __future__ import annotations
+
+import os
+import uuid
+from typing import Dict, List, Optional
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from src.app.dependencies import get_db
+from src.app.schemas import RankRequest, RankResponse, RankSet, RankSetResult
+from src.app.services.feature_store import FEATURE_STORE, StoredVec, stack_vectors
+from src.app.services.features import FeatureMatrix, FeatureVersion
+from src.app.services.ranker import get_active_model_version, get_model, get_model_feature_version, set_win_probs
+
+router = APIRouter()
+
+
+def _load_features(db: Session, ids: List[uuid.UUID], fv: FeatureVersion) -> Dict[uuid.UUID, StoredVec]:
+    """참조된 모든 candidate의 fv feature (feature store: LRU miss만 IN 쿼리 1번)."""
+    if not ids:
+        return {}
+    return FEATURE_STORE.vectors(db, ids, fv)
+
+
+def _set_matrix(
+    s: RankSet, feats: Dict[uuid.UUID, StoredVec], fv: FeatureVersion
+) -> tuple[Optional[FeatureMatrix], Optional[str]]:
+    if (s.candidate_ids is None) == (s.candidates is None):
+        return None, "invalid_set: give exactly one of candidate_ids / candidates"
+
+    if s.candidate_ids is not None:
+        missing = [cid for cid in s.candidate_ids if cid not in feats]
+        if missing:
+            return None, f"candidate_not_found: {missing[0]}"
+        rows = [feats[cid] for cid in s.candidate_ids]
+    elif fv.sparse:
+        # hashed feature는 inline으로 받지 않는다 (저장된 candidate_ids만)
+        return None, f"inline_features_unsupported: {fv.version}"
+    else:
+        rows = [fv.vector(c) for c in s.candidates or []]
+
+    if not rows:
+        return None, "no_candidates"
+    return stack_vectors(fv, rows), None
+
+
+@router.post("/rank", response_model=RankResponse)
+def rank_sets(request: RankRequest, db: Session = Depends(get_db)):
+    """
+    저장된 후보(candidate_ids) 또는 inline fv1 feature 후보 set 여러 개를 한 번에 ranking.
+    - feature version은 모델을 따른다 (sparse 버전 모델이면 candidate_ids set만 지원)
+    - 참조된 candidate는 IN 쿼리 1번으로 로드
+    - 모든 set의 pairwise diff를 모아 모델을 1번 호출 (ranker.set_win_probs)
+    - set 단위 오류(없는 id 등)는 해당 result.error 로만 표시하고 나머지는 계속 처리
+    """
+    n_total = sum(len(s.candidate_ids or s.candidates or []) for s in request.sets)
+    max_candidates = int(os.getenv("RANK_MAX_CANDIDATES", "200000"))
+    if n_total > max_candidates:
+        raise HTTPException(
+            status_code=413,
+            detail=f"too many candidates: {n_total} > RANK_MAX_CANDIDATES={max_candidates}",
+        )
+
+    mv = request.model_version or get_active_model_version(db)
+    if not mv:
+        raise HTTPException(status_code=404, detail="no_model")
+
+    try:
+        model, err = get_model(db, mv)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"model load failed: {e}")
+    if err:
+        raise HTTPException(status_code=404, detail=f"{err}: {mv}")
+
+    # 모델이 학습된 feature version으로 조회 (fv1 dense 또는 fvh1 같은 sparse)
+    fv = get_model_feature_version(db, mv)
+    ids = list({cid for s in request.sets for cid in (s.candidate_ids or [])})
+    feats = _load_features(db, ids, fv)
+
+    results: List[RankSetResult] = []
+    mats: List[FeatureMatrix] = []
+    scored: List[int] = []  # mats[k] 가 속한 results index
+    for s in request.sets:
+        X, set_err = _set_matrix(s, feats, fv)
+        results.append(RankSetResult(set_id=s.set_id, error=set_err))
+        if X is not None:
+            mats.append(X)
+            scored.append(len(results) - 1)
+
+    try:
+        probs = set_win_probs(model, mats)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"scoring failed: {e}")
+
+    for i, p in zip(scored, probs):
+        r = results[i]
+        # stable: 동점이면 입력 순서 (ltr_choose_best의 argmax와 동일)
+        order = np.argsort(-p, kind="stable")
+        r.ranking = [int(k) for k in order]
+        r.probabilities = [float(v) for v in p]
+        ids_in = request.sets[i].candidate_ids
+        if ids_in:
+            r.best_candidate_id = ids_in[r.ranking[0]]
+
+    return RankResponse(model_version=mv, results=results)
@@ -60,6 +60,10 @@ class AskRequest(BaseModel):
     context: AskContext
     question: str = Field(..., min_length=1, description="User question text.", examples=["FastAPI에서 SQLAlchemy 세션 관리 방법?"])
     domain: str = Field(..., min_length=1, description="Domain label for analysis/training.", examples=["backend"])
+    bypass_cache: bool = Field(
+        default=False,
+        description="If true, skip the answer cache and call every LLM fresh (research runs).",
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -154,3 +158,83 @@ class FeedbackRequest(BaseModel):
 
 class FeedbackResponse(BaseModel):
     feedback_id: UUID
+
+
+# =========================
+# /rank
+# =========================
+
+class RankFeatures(BaseModel):
+    """fv1 feature dict (candidates 테이블 컬럼과 동일)."""
+    len_words: int = Field(..., ge=0)
+    has_code: bool = False
+    step_score: int = 0
+    has_bullets: bool = False
+    has_warning: bool = False
+
+
+class RankSet(BaseModel):
+    set_id: Optional[str] = Field(
+        default=None,
+        description="Caller-defined key echoed back in the result (e.g. question_id).",
+    )
+    candidate_ids: Optional[List[UUID]] = Field(
+        default=None,
+        description="Stored candidates to rank (features are loaded from DB).",
+    )
+    candidates: Optional[List[RankFeatures]] = Field(
+        default=None,
+        description="Inline fv1 features to rank (use instead of candidate_ids).",
+    )
+
+
+class RankRequest(BaseModel):
+    sets: List[RankSet] = Field(..., min_length=1)
+    model_version: Optional[str] = Field(
+        default=None,
+        description="Model version to score with (default: active model).",
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "sets": [
+                        {
+                            "set_id": "q1",
+                            "candidate_ids": [
+                                "51948e7f-471b-4dfc-9562-6f19ea49bc7b",
+                                "5a0b3b4a-1111-2222-3333-444444444444",
+                            ],
+                        },
+                        {
+                            "set_id": "q2",
+                            "candidates": [
+                                {"len_words": 120, "has_code": True, "step_score": 1, "has_bullets": True, "has_warning": False},
+                                {"len_words": 40, "has_code": False, "step_score": 0, "has_bullets": False, "has_warning": True},
+                            ],
+                        },
+                    ]
+                }
+            ]
+        }
+    }
+
+
+class RankSetResult(BaseModel):
+    set_id: Optional[str] = None
+    ranking: List[int] = Field(
+        default_factory=list,
+        description="Indices into the input candidates, best first.",
+    )
+    probabilities: List[float] = Field(
+        default_factory=list,
+        description="Average win probability per candidate (input order).",
+    )
+    best_candidate_id: Optional[UUID] = None
+    error: Optional[str] = None
+
+
+class RankResponse(BaseModel):
+    model_version: str
+    results: List[RankSetResult]
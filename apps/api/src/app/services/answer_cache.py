@@ -0,0 +1,213 @@
+# apps/api/src/app/services/answer_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import String, select
+from sqlalchemy.orm import Session
+
+from src.app.db.models import Candidate
+from src.app.services.llm.types import EngineRequest, EngineResult
+
+
+def _norm(v: Any) -> str:
+    # Enum(str) / None 정규화
+    v = getattr(v, "value", v)
+    return "" if v is None else str(v).strip()
+
+
+def normalize_question(question: Optional[str]) -> str:
+    # 공백 차이(줄바꿈/연속 공백/앞뒤 공백)만 다른 질문은 같은 질문으로 본다.
+    # cache_key 와 generator._flight_key 가 같은 정규화를 써야 coalesce/캐시 hit 범위가 일치한다
+    return " ".join((question or "").split())
+
+
+def cache_key(req: EngineRequest) -> str:
+    """
+    (normalized question hash, role, level, goal, stack, constraints, domain,
+     provider, model, temperature, max_tokens) → sha256
+    """
+    params = req.params_json or {}
+    question = normalize_question(str(params.get("_question", "")))
+    parts = [
+        hashlib.sha256(question.encode("utf-8")).hexdigest(),
+        _norm(req.role),
+        _norm(req.level),
+        _norm(req.goal),
+        _norm(req.stack),
+        _norm(req.constraints),
+        _norm(req.domain),
+        _norm(req.provider),
+        _norm(req.model),
+        float(params.get("temperature", 0.2)),
+        int(params.get("max_tokens", 512)),
+    ]
+    raw = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TTLCache:
+    """in-process LRU + TTL (thread-safe)."""
+
+    def __init__(self, maxsize: int = 2048, ttl_s: float = 3600.0) -> None:
+        self.maxsize = max(1, int(maxsize))
+        self.ttl_s = float(ttl_s)
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_s, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class AnswerCache:
+    """
+    generate_candidates_v1 앞단의 2-tier 후보 캐시.
+    - tier 1: in-process LRU + TTL
+    - tier 2: 이전에 저장된 candidates 행 (params_json.cache_key)
+    성공 결과만 캐시한다.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = os.getenv("ANSWER_CACHE_ENABLED", "1").strip() == "1"
+        self.db_ttl_s = float(os.getenv("ANSWER_CACHE_DB_TTL_S", "86400"))
+        self.memory = TTLCache(
+            maxsize=int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "2048")),
+            ttl_s=float(os.getenv("ANSWER_CACHE_TTL_S", "3600")),
+        )
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "db_hits": 0, "misses": 0, "bypass": 0}
+
+    def _count(self, name: str, n: int = 1) -> None:
+        if n:
+            with self._lock:
+                self._counters[name] += n
+
+    def lookup(
+        self,
+        reqs: List[EngineRequest],
+        db: Optional[Session] = None,
+        bypass: bool = False,
+    ) -> Dict[str, EngineResult]:
+        """
+        request_id → 캐시된 EngineResult (hit만 포함).
+        db가 주어지면 tier 1 miss를 한 번의 쿼리로 tier 2에서 조회한다.
+        """
+        if not self.enabled or bypass:
+            self._count("bypass", len(reqs))
+            return {}
+
+        hits: Dict[str, EngineResult] = {}
+        pending: Dict[str, EngineRequest] = {}
+        for req in reqs:
+            key = cache_key(req)
+            cached = self.memory.get(key)
+            if cached is not None:
+                hits[req.request_id] = _as_hit(cached, req, "memory")
+            else:
+                pending[key] = req
+        self._count("memory_hits", len(hits))
+
+        if pending and db is not None:
+            found = lookup_persisted(db, list(pending.keys()), self.db_ttl_s)
+            for key, res in found.items():
+                req = pending.pop(key)
+                self.memory.put(key, res)
+                hits[req.request_id] = _as_hit(res, req, "db")
+            self._count("db_hits", len(found))
+
+        self._count("misses", len(pending))
+        return hits
+
+    def store(self, req: EngineRequest, res: EngineResult) -> None:
+        if not self.enabled:
+            return
+        if res.error is not None or not (res.answer_summary or "").strip():
+            return
+        self.memory.put(cache_key(req), res)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._counters)
+        lookups = out["memory_hits"] + out["db_hits"] + out["misses"]
+        out["hit_rate"] = (out["memory_hits"] + out["db_hits"]) / lookups if lookups else 0.0
+        out["memory_entries"] = len(self.memory)
+        out["enabled"] = self.enabled
+        return out
+
+
+def _as_hit(res: EngineResult, req: EngineRequest, source: str) -> EngineResult:
+    # 캐시 hit은 provider 호출이 없으므로 latency/tokens를 0/None으로 기록
+    return EngineResult(
+        provider=res.provider,
+        model=res.model,
+        answer_summary=res.answer_summary,
+        latency_ms=0,
+        tokens_in=None,
+        tokens_out=None,
+        error=None,
+        request_id=req.request_id,
+        cache=source,
+    )
+
+
+def lookup_persisted(db: Session, keys: List[str], ttl_s: float) -> Dict[str, EngineResult]:
+    """tier 2: cache_key별 최신 비어있지 않은 candidate (단일 IN 쿼리)."""
+    if not keys:
+        return {}
+
+    since = datetime.now(timezone.utc) - timedelta(seconds=ttl_s)
+    # ix_candidates_cache_key 와 같은 식 (params_json->>'cache_key')
+    key_col = Candidate.params_json.op("->>", return_type=String)("cache_key")
+    rows = db.execute(
+        select(key_col, Candidate.provider, Candidate.model, Candidate.answer_summary)
+        .where(key_col.in_(keys))
+        .where(Candidate.answer_summary != "")
+        .where(Candidate.created_at >= since)
+        .order_by(Candidate.created_at.desc())
+    ).all()
+
+    out: Dict[str, EngineResult] = {}
+    for key, provider, model, answer in rows:
+        if key in out:
+            continue  # 최신 1개만
+        out[key] = EngineResult(
+            provider=provider,
+            model=model,
+            answer_summary=answer,
+            latency_ms=0,
+        )
+    return out
+
+
+ANSWER_CACHE = AnswerCache()
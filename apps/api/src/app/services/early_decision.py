@@ -0,0 +1,109 @@
+# apps/api/src/app/services/early_decision.py
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.app.services.features import FV1
+
+
+def early_min_prob() -> float:
+    # 0 이면 끔. 켜면 LTR 1위가 2위를 이길 확률이 이 값 이상일 때 stream 도중 early_selection
+    return float(os.getenv("LTR_EARLY_MIN_PROB", "0"))
+
+
+class EarlyDecision:
+    """
+    /ask/stream 1회분의 mid-stream LTR 판단 상태.
+    - 후보별 FV1Accumulator에 delta를 append (chunk 길이에 비례하는 일만)
+    - LTR_EARLY_RESCORE_EVERY delta마다, 그리고 후보 완료 시 재평가 대상 (should_score)
+    - 실패한 후보는 제외, 살아 있는 후보가 모두 시작했고 LTR_EARLY_MIN_WORDS 이상(또는 완료)일 때만 평가
+    - 한 번 결정하면 더 평가하지 않는다 (early_selection 은 stream당 최대 1회)
+    early_selection은 참고용 예측이고, 저장/서빙 기준은 stream 종료 후의 selection 이벤트다.
+    """
+
+    def __init__(
+        self,
+        min_prob: float,
+        rescore_every: Optional[int] = None,
+        min_words: Optional[int] = None,
+    ) -> None:
+        self.min_prob = float(min_prob)
+        self.rescore_every = max(
+            1, int(rescore_every if rescore_every is not None else os.getenv("LTR_EARLY_RESCORE_EVERY", "16"))
+        )
+        self.min_words = int(min_words if min_words is not None else os.getenv("LTR_EARLY_MIN_WORDS", "20"))
+
+        self.slots: List[Dict[str, Any]] = []
+        self._acc: List[Any] = []
+        self._started: List[bool] = []
+        self._done: List[bool] = []
+        self._failed: List[bool] = []
+        self._since_score = 0
+        self.decided: Optional[Dict[str, Any]] = None
+
+    def start(self, slots: List[Dict[str, Any]]) -> None:
+        """후보 slot 목록 (candidate_index 순서의 provider/model)."""
+        n = len(slots)
+        self.slots = slots
+        self._acc = [FV1.accumulator() for _ in range(n)]
+        self._started = [False] * n
+        self._done = [False] * n
+        self._failed = [False] * n
+
+    def observe(self, ev: Dict[str, Any]) -> bool:
+        """stream 이벤트 1개 반영. 지금 재평가해야 하면 True."""
+        if self.decided is not None or not self.slots:
+            return False
+        i = ev.get("candidate_index")
+        if i is None or not 0 <= i < len(self.slots):
+            return False
+
+        if ev["type"] == "delta":
+            self._acc[i].append(ev.get("delta") or "")
+            self._started[i] = True
+            self._since_score += 1
+            return self._since_score >= self.rescore_every and self._ready()
+        if ev["type"] == "candidate_done":
+            self._done[i] = True
+            self._failed[i] = bool(ev.get("error"))
+            return self._ready()
+        return False
+
+    def _ready(self) -> bool:
+        live = [i for i in range(len(self.slots)) if not self._failed[i]]
+        if len(live) < 2:
+            return False
+        return all(
+            self._done[i] or (self._started[i] and self._acc[i].len_words >= self.min_words) for i in live
+        )
+
+    def snapshot(self) -> Tuple[np.ndarray, List[int]]:
+        """(살아 있는 후보의 현재 fv1 matrix, 해당 candidate_index 목록)."""
+        self._since_score = 0
+        live = [i for i in range(len(self.slots)) if not self._failed[i]]
+        X = np.vstack([FV1.vector(self._acc[i].values()) for i in live])
+        return X, live
+
+    def decide(
+        self,
+        live: List[int],
+        best: Optional[int],
+        p: Optional[float],
+        model_version: Optional[str],
+    ) -> Optional[Dict[str, Any]]:
+        """ranker.ltr_lead 결과 → 결정적이면 early_selection payload (1회), 아니면 None."""
+        if self.decided is not None or best is None or p is None or p < self.min_prob:
+            return None
+        idx = live[best]
+        self.decided = {
+            "candidate_index": idx,
+            "provider": self.slots[idx].get("provider"),
+            "model": self.slots[idx].get("model"),
+            "model_version": model_version,
+            "win_prob": p,
+            "candidates_done": sum(self._done),
+        }
+        return self.decided
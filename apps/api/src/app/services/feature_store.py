@@ -0,0 +1,211 @@
+# apps/api/src/app/services/feature_store.py
+from __future__ import annotations
+
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.app.db.models import Candidate, CandidateFeature
+from src.app.services.features import FeatureMatrix, FeatureVersion, SparseRows, get_feature_version
+
+# candidate_features.vec 포맷 (big-endian, PG float4send와 동일 → migration에서 SQL만으로 채울 수 있음)
+# - dense : float32 x dim                          (nnz 컬럼 NULL)
+# - sparse: int32 indices x nnz + float32 x nnz    (nnz 컬럼 = nnz, dim = 전체 폭)
+VEC_DTYPE = np.dtype(">f4")
+IDX_DTYPE = np.dtype(">i4")
+
+_Key = Tuple[uuid.UUID, str]
+SparseVec = Tuple[np.ndarray, np.ndarray]
+StoredVec = Union[np.ndarray, SparseVec]
+
+
+def pack_vector(vec: np.ndarray) -> bytes:
+    return np.asarray(vec, dtype=VEC_DTYPE).tobytes()
+
+
+def unpack_vector(blob: bytes, dim: int) -> np.ndarray:
+    v = np.frombuffer(blob, dtype=VEC_DTYPE)
+    if v.shape[0] != dim:
+        raise ValueError(f"feature vector size mismatch: {v.shape[0]} != dim {dim}")
+    return v.astype(np.float32)
+
+
+def pack_sparse(indices: np.ndarray, values: np.ndarray) -> bytes:
+    return np.asarray(indices, dtype=IDX_DTYPE).tobytes() + np.asarray(values, dtype=VEC_DTYPE).tobytes()
+
+
+def unpack_sparse(blob: bytes, nnz: int) -> SparseVec:
+    if len(blob) != nnz * 8:
+        raise ValueError(f"sparse feature vector size mismatch: {len(blob)} bytes != nnz {nnz} x 8")
+    idx = np.frombuffer(blob, dtype=IDX_DTYPE, count=nnz).astype(np.int32)
+    val = np.frombuffer(blob, dtype=VEC_DTYPE, count=nnz, offset=nnz * 4).astype(np.float32)
+    return idx, val
+
+
+def encode_features(fv: FeatureVersion, feats: Dict[str, Any]) -> Tuple[bytes, Optional[int]]:
+    """fv.extract() 결과 → (vec blob, nnz). backfill job과 /ask 저장이 같이 쓴다."""
+    if fv.sparse:
+        return pack_sparse(feats["indices"], feats["values"]), int(len(feats["indices"]))
+    return pack_vector(fv.vector(feats)), None
+
+
+def _as_stored(fv: FeatureVersion, feats: Dict[str, Any]) -> StoredVec:
+    if fv.sparse:
+        return np.array(feats["indices"], dtype=np.int32), np.array(feats["values"], dtype=np.float32)
+    return fv.vector(feats).astype(np.float32)
+
+
+def _nbytes(v: StoredVec) -> int:
+    return v[0].nbytes + v[1].nbytes if isinstance(v, tuple) else v.nbytes
+
+
+def stack_vectors(fv: FeatureVersion, vecs: Sequence[StoredVec]) -> FeatureMatrix:
+    """저장 vector 목록 → 모델 입력 행렬 (dense: float64 ndarray, sparse: SparseRows)."""
+    if fv.sparse:
+        return SparseRows.from_rows(list(vecs), fv.n_features)
+    if not vecs:
+        return np.empty((0, fv.dim), dtype=float)
+    return np.vstack(vecs).astype(float)
+
+
+class FeatureStore:
+    """
+    candidate_features 앞단의 in-process LRU (process-wide, thread-safe).
+    - vectors/matrix: LRU miss만 모아서 IN 쿼리 1번 → 그래도 없는 id는 candidates에서 계산
+      (version 컬럼이 candidates에 있으면 컬럼 값, 없으면 answer_summary 추출; read path는 DB에 쓰지 않음)
+    - add: 새 후보 저장 시 row 추가 + LRU write-through (같은 요청의 LTR 선택은 DB 왕복 없이 hit)
+    - LRU는 항목 수(FEATURE_STORE_CACHE_MAX)와 byte(FEATURE_STORE_CACHE_MAX_BYTES) 둘 다로 제한
+      (sparse vector는 답변 길이에 따라 크기가 달라서)
+    캐시 값은 float32 (store와 동일 정밀도), matrix는 dense면 float64 ndarray, sparse면 SparseRows.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        self.max_entries = max(
+            1, int(max_entries if max_entries is not None else os.getenv("FEATURE_STORE_CACHE_MAX", "100000"))
+        )
+        self.max_bytes = max(
+            1,
+            int(max_bytes if max_bytes is not None else os.getenv("FEATURE_STORE_CACHE_MAX_BYTES", str(256 << 20))),
+        )
+        # /ask 저장 시 fv1 외에 같이 기록할 버전 (예: sparse 모델을 서빙할 때 "fvh1")
+        self.extra_versions: List[FeatureVersion] = [
+            get_feature_version(v.strip())
+            for v in os.getenv("FEATURE_STORE_EXTRA_VERSIONS", "").split(",")
+            if v.strip()
+        ]
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[_Key, StoredVec]" = OrderedDict()
+        self._bytes = 0
+        self._counters = {"cache_hits": 0, "store_hits": 0, "computed": 0, "not_found": 0, "added": 0}
+
+    def _put_locked(self, key: _Key, vec: StoredVec) -> None:
+        for a in (vec if isinstance(vec, tuple) else (vec,)):
+            a.setflags(write=False)  # 캐시 값은 여러 요청이 공유
+        old = self._lru.pop(key, None)
+        if old is not None:
+            self._bytes -= _nbytes(old)
+        self._lru[key] = vec
+        self._bytes += _nbytes(vec)
+        while len(self._lru) > self.max_entries or (self._bytes > self.max_bytes and len(self._lru) > 1):
+            _, evicted = self._lru.popitem(last=False)
+            self._bytes -= _nbytes(evicted)
+
+    def add(self, db: Session, candidate_id: uuid.UUID, fv: FeatureVersion, feats: Dict[str, Any]) -> None:
+        """flush 된 candidate의 fv.extract() 결과 저장 (commit은 호출자 트랜잭션)."""
+        blob, nnz = encode_features(fv, feats)
+        db.add(
+            CandidateFeature(
+                candidate_id=candidate_id,
+                feature_version=fv.version,
+                dim=fv.dim,
+                nnz=nnz,
+                vec=blob,
+            )
+        )
+        with self._lock:
+            self._put_locked((candidate_id, fv.version), _as_stored(fv, feats))
+            self._counters["added"] += 1
+
+    def vectors(self, db: Session, ids: Sequence[uuid.UUID], fv: FeatureVersion) -> Dict[uuid.UUID, StoredVec]:
+        """candidate_id → float32 vector (sparse 버전은 (indices, values)). 존재하지 않는 candidate는 빠진다."""
+        out: Dict[uuid.UUID, StoredVec] = {}
+        pending: List[uuid.UUID] = []
+        with self._lock:
+            for cid in dict.fromkeys(ids):
+                v = self._lru.get((cid, fv.version))
+                if v is None:
+                    pending.append(cid)
+                else:
+                    self._lru.move_to_end((cid, fv.version))
+                    out[cid] = v
+            self._counters["cache_hits"] += len(out)
+        if not pending:
+            return out
+
+        loaded: Dict[uuid.UUID, StoredVec] = {}
+        rows = db.execute(
+            select(
+                CandidateFeature.candidate_id, CandidateFeature.dim, CandidateFeature.nnz, CandidateFeature.vec
+            ).where(
+                CandidateFeature.feature_version == fv.version,
+                CandidateFeature.candidate_id.in_(pending),
+            )
+        ).all()
+        for r in rows:
+            loaded[r.candidate_id] = unpack_sparse(r.vec, r.nnz) if fv.sparse else unpack_vector(r.vec, r.dim)
+        n_store = len(loaded)
+
+        rest = [cid for cid in pending if cid not in loaded]
+        if rest:
+            loaded.update(self._compute(db, rest, fv))
+
+        with self._lock:
+            for cid, v in loaded.items():
+                self._put_locked((cid, fv.version), v)
+            self._counters["store_hits"] += n_store
+            self._counters["computed"] += len(loaded) - n_store
+            self._counters["not_found"] += len(pending) - len(loaded)
+        out.update(loaded)
+        return out
+
+    def matrix(self, db: Session, ids: Sequence[uuid.UUID], fv: FeatureVersion) -> FeatureMatrix:
+        """ids 순서의 n x d 행렬 (stack_vectors 참고). 없는 candidate가 있으면 KeyError."""
+        found = self.vectors(db, ids, fv) if ids else {}
+        missing = [cid for cid in ids if cid not in found]
+        if missing:
+            raise KeyError(f"candidate_not_found: {missing[0]}")
+        return stack_vectors(fv, [found[cid] for cid in ids])
+
+    @staticmethod
+    def _compute(db: Session, ids: List[uuid.UUID], fv: FeatureVersion) -> Dict[uuid.UUID, StoredVec]:
+        # store에 아직 없는 후보 (migration/backfill 이전 row): candidates에서 바로 계산
+        table_cols = Candidate.__table__.c
+        if not fv.sparse and all(n in table_cols for n in fv.names):
+            cols = [getattr(Candidate, n) for n in fv.names]
+            rows = db.execute(select(Candidate.candidate_id, *cols).where(Candidate.candidate_id.in_(ids))).all()
+            return {r.candidate_id: fv.vector(r).astype(np.float32) for r in rows}
+
+        rows = db.execute(
+            select(Candidate.candidate_id, Candidate.answer_summary).where(Candidate.candidate_id.in_(ids))
+        ).all()
+        return {r.candidate_id: _as_stored(fv, fv.extract(r.answer_summary or "")) for r in rows}
+
+    def stats(self) -> dict:
+        with self._lock:
+            out: dict = dict(self._counters)
+            out["cache_entries"] = len(self._lru)
+            out["cache_bytes"] = self._bytes
+        out["cache_max_entries"] = self.max_entries
+        out["cache_max_bytes"] = self.max_bytes
+        lookups = out["cache_hits"] + out["store_hits"] + out["computed"] + out["not_found"]
+        out["cache_hit_rate"] = out["cache_hits"] / lookups if lookups else None
+        return out
+
+
+FEATURE_STORE = FeatureStore()
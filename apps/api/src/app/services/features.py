@@ -0,0 +1,298 @@
+# apps/api/src/app/services/features.py
+from __future__ import annotations
+
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+DEFAULT_FEATURE_VERSION = "fv1"
+
+
+@dataclass(frozen=True)
+class FeatureVersion:
+    """
+    feature version 1개 = 컬럼 이름/순서 + 답변 텍스트 → feature dict 추출 함수.
+    - extract(text): 한 번 호출로 해당 버전의 모든 feature 계산 (후보당 텍스트 스캔 1회)
+    - vector(row): ORM 객체 / dict / pydantic 등에서 names 순서대로 float 벡터 (학습·서빙 공통 순서)
+    - accumulator(): streaming 용 incremental 추출기 (append(chunk) / values()), 없는 버전은 None
+    - n_features > 0 이면 sparse 버전: names 없이 extract가 {"indices", "values"} 를 돌려주고
+      행렬은 sparse_rows() (SparseRows) 로 만든다 (vector/matrix 는 dense 버전 전용)
+    """
+
+    version: str
+    names: Tuple[str, ...]
+    extract: Callable[[str], Dict[str, Any]]
+    accumulator: Optional[Callable[[], Any]] = None
+    n_features: int = 0
+
+    @property
+    def sparse(self) -> bool:
+        return self.n_features > 0
+
+    @property
+    def dim(self) -> int:
+        return self.n_features if self.sparse else len(self.names)
+
+    def vector(self, row: Any) -> np.ndarray:
+        get = row.get if isinstance(row, dict) else (lambda k: getattr(row, k))
+        # bool/None → 0/1 (DB bool 컬럼, inline dict 모두 같은 값)
+        return np.array([float(get(n) or 0) for n in self.names], dtype=float)
+
+    def matrix(self, rows: Iterable[Any]) -> np.ndarray:
+        return np.vstack([self.vector(r) for r in rows]).reshape(-1, len(self.names))
+
+    def sparse_rows(self, texts: Iterable[str]) -> "SparseRows":
+        return SparseRows.from_rows(
+            [(f["indices"], f["values"]) for f in (self.extract(t or "") for t in texts)], self.n_features
+        )
+
+
+class SparseRows:
+    """
+    scipy 없이 쓰는 최소 CSR 행렬 (serving은 numpy만 사용).
+    - X @ w (w: n_features 또는 n_features x K) → 행별 sparse dot, 비용 O(nnz)
+    - take(idx): 일부 행만 새 SparseRows 로
+    - to_scipy(): 학습용 (scipy.sparse.csr_matrix, lazy import)
+    """
+
+    __slots__ = ("indptr", "indices", "data", "shape")
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, n_features: int) -> None:
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.data = np.asarray(data, dtype=np.float32)
+        self.shape = (int(self.indptr.shape[0] - 1), int(n_features))
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Tuple[np.ndarray, np.ndarray]], n_features: int) -> "SparseRows":
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        if rows:
+            indptr[1:] = np.cumsum([len(idx) for idx, _ in rows])
+            indices = np.concatenate([np.asarray(idx, dtype=np.int32) for idx, _ in rows])
+            data = np.concatenate([np.asarray(val, dtype=np.float32) for _, val in rows])
+        else:
+            indices, data = np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        return cls(indptr, indices, data, n_features)
+
+    @property
+    def nnz(self) -> int:
+        return int(self.indices.shape[0])
+
+    def row(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        a, b = self.indptr[i], self.indptr[i + 1]
+        return self.indices[a:b], self.data[a:b]
+
+    def take(self, idx: Sequence[int]) -> "SparseRows":
+        return SparseRows.from_rows([self.row(int(i)) for i in idx], self.shape[1])
+
+    def __matmul__(self, w: np.ndarray) -> np.ndarray:
+        w = np.asarray(w, dtype=float)
+        if w.shape[0] != self.shape[1]:
+            raise ValueError(f"dimension mismatch: {self.shape} @ {w.shape}")
+        out_shape = (self.shape[0],) + w.shape[1:]
+        if self.nnz == 0:
+            return np.zeros(out_shape, dtype=float)
+        # 행마다 w[indices] · data 를 reduceat 으로 한 번에.
+        # 끝에 0 행을 붙여 start == nnz 인 (뒤쪽) 빈 행도 유효 index가 되게 하고, 빈 행은 0으로 보정
+        prod = w[self.indices] * (self.data[:, None] if w.ndim == 2 else self.data)
+        prod = np.concatenate([prod, np.zeros((1,) + prod.shape[1:])])
+        out = np.add.reduceat(prod, self.indptr[:-1], axis=0)
+        empty = self.indptr[:-1] == self.indptr[1:]
+        out[empty] = 0.0
+        return out.reshape(out_shape)
+
+    def to_scipy(self):
+        from scipy.sparse import csr_matrix  # lazy: 학습 스크립트에서만 필요
+
+        return csr_matrix((self.data, self.indices, self.indptr), shape=self.shape)
+
+
+FeatureMatrix = Union[np.ndarray, SparseRows]
+
+
+_REGISTRY: Dict[str, FeatureVersion] = {}
+
+
+def register_feature_version(fv: FeatureVersion) -> FeatureVersion:
+    _REGISTRY[fv.version] = fv
+    return fv
+
+
+def get_feature_version(version: str = DEFAULT_FEATURE_VERSION) -> FeatureVersion:
+    fv = _REGISTRY.get(version)
+    if fv is None:
+        raise ValueError(f"unsupported feature_version: {version!r} (known: {sorted(_REGISTRY)})")
+    return fv
+
+
+def extract_features(text: str, version: str = DEFAULT_FEATURE_VERSION) -> Dict[str, Any]:
+    return get_feature_version(version).extract(text or "")
+
+
+# ──────────────────────────────────────────────
+# fv1
+# ──────────────────────────────────────────────
+
+# feature → 원문에서 찾을 marker / 소문자 본문에서 찾을 marker
+# (str.__contains__ 는 C fastsearch라 같은 marker들을 하나의 정규식 alternation으로 묶는 것보다
+#  CPython에서 ~2배 빠르다. 대소문자 무시가 필요한 marker만 lower() 1회로 처리)
+_FV1_MARKERS: Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...]], ...] = (
+    ("has_code", ("```",), ()),
+    ("step_score", ("Step", "단계"), ()),
+    ("has_bullets", ("\n-", "\n*", "\n•"), ()),
+    ("has_warning", ("주의",), ("warning",)),  # "주의사항"은 "주의"에 포함
+)
+
+
+def has_fv1_marker(text: str, name: str) -> bool:
+    """fv1 boolean marker 1개만 필요할 때 (전체 추출 없이)."""
+    for feat, needles, lower_needles in _FV1_MARKERS:
+        if feat == name:
+            return any(n in text for n in needles) or (
+                bool(lower_needles) and any(n in text.lower() for n in lower_needles)
+            )
+    raise KeyError(name)
+
+
+def _count_words(text: str) -> int:
+    # str.split() 은 단어 list를 만들지만 C 루프 1회라, list를 만들지 않는 대안
+    # (\S+ finditer / subn 카운트)보다 CPython에서 3~6배 빠르다. list는 즉시 해제되고
+    # 답변 길이(수 KB)에서는 peak 수백 KiB 이내라 속도 쪽을 택한다.
+    # batch(_extract_fv1)와 streaming(FV1Accumulator) 모두 이 함수로 센다 (같은 공백 정의)
+    return len(text.split())
+
+
+def _extract_fv1(text: str) -> Dict[str, Any]:
+    lowered = None
+    out: Dict[str, Any] = {"len_words": _count_words(text)}
+    for name, needles, lower_needles in _FV1_MARKERS:
+        hit = any(n in text for n in needles)
+        if not hit and lower_needles:
+            if lowered is None:
+                lowered = text.lower()
+            hit = any(n in lowered for n in lower_needles)
+        out[name] = hit
+    out["step_score"] = 1 if out["step_score"] else 0
+    return out
+
+
+# boundary에 걸친 marker를 찾기 위해 이전 chunk에서 남겨 둘 글자 수
+_FV1_TAIL = max(len(n) for _, needles, lower_needles in _FV1_MARKERS for n in needles + lower_needles) - 1
+
+
+class FV1Accumulator:
+    """
+    streaming 답변용 fv1 incremental 추출기 (후보 1개당 1개).
+    append(chunk)는 chunk 길이에 비례하는 일만 하고, values()는 지금까지 받은 텍스트 t에 대해
+    _extract_fv1(t.strip()) 과 같은 값을 돌려준다 (/ask 저장 시 strip 후 추출하는 것과 동일).
+    - len_words: 단어 경계가 chunk 사이에 걸치면 이어 붙여 1개로 센다 (str.split 과 같은 공백 정의)
+    - marker: 이전 chunk 끝 _FV1_TAIL 글자와 이어서 검색 → chunk 경계에 걸친 marker도 잡는다
+    - 선행 공백은 버린다 (strip 된 본문에서는 "\n-" 가 맨 앞에 올 수 없음)
+    """
+
+    __slots__ = ("len_words", "_in_word", "_started", "_tail", "_hits")
+
+    def __init__(self) -> None:
+        self.len_words = 0
+        self._in_word = False
+        self._started = False
+        self._tail = ""
+        self._hits = {name: False for name, _, _ in _FV1_MARKERS}
+
+    def append(self, chunk: str) -> None:
+        if not chunk:
+            return
+        if not self._started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                return
+            self._started = True
+
+        n = _count_words(chunk)
+        if n and self._in_word and not chunk[0].isspace():
+            n -= 1  # 이전 chunk의 마지막 단어가 이어지는 중
+        self.len_words += n
+        self._in_word = not chunk[-1].isspace()
+
+        window = self._tail + chunk
+        lowered = None
+        for name, needles, lower_needles in _FV1_MARKERS:
+            if self._hits[name]:
+                continue
+            hit = any(n in window for n in needles)
+            if not hit and lower_needles:
+                if lowered is None:
+                    lowered = window.lower()
+                hit = any(n in lowered for n in lower_needles)
+            self._hits[name] = hit
+        self._tail = window[-_FV1_TAIL:]
+
+    def values(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"len_words": self.len_words}
+        out.update(self._hits)
+        out["step_score"] = 1 if out["step_score"] else 0
+        return out
+
+
+FV1 = register_feature_version(
+    FeatureVersion(
+        version="fv1",
+        names=("len_words", "has_code", "step_score", "has_bullets", "has_warning"),
+        extract=_extract_fv1,
+        accumulator=FV1Accumulator,
+    )
+)
+
+
+# ──────────────────────────────────────────────
+# fvh1: hashed n-gram (sparse)
+# ──────────────────────────────────────────────
+
+# vocabulary 없이 n-gram → crc32 hash bucket (고정 폭 2^18). 한국어/영어 혼합 답변용:
+# - 단어 unigram / bigram (소문자, \w+ 토큰 — 한글 음절도 \w)
+# - 단어 내부 char 3-gram (앞뒤 경계 포함) → 한국어 어간/조사 변형, 영어 굴절을 같은 bucket 근처로
+# hash 최상위 bit로 부호를 정해 충돌이 한쪽으로 쌓이지 않게 하고, 행은 L2 정규화한다.
+# crc32는 process/실행마다 같은 값 (Python hash()는 PYTHONHASHSEED로 바뀌므로 쓰지 않는다).
+FVH1_N_FEATURES = 1 << 18
+_FVH1_MASK = FVH1_N_FEATURES - 1
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _fvh1_ngrams(text: str) -> List[str]:
+    tokens = _TOKEN_RE.findall(text.lower())
+    grams = ["w:" + t for t in tokens]
+    grams += ["b:" + a + " " + b for a, b in zip(tokens, tokens[1:])]
+    for t in tokens:
+        padded = " " + t + " "
+        grams += ["c:" + padded[i:i + 3] for i in range(len(padded) - 2)]
+    return grams
+
+
+def _extract_fvh1(text: str) -> Dict[str, Any]:
+    grams = _fvh1_ngrams(text)
+    if not grams:
+        return {"indices": np.empty(0, dtype=np.int32), "values": np.empty(0, dtype=np.float32)}
+    h = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint32, count=len(grams))
+    buckets = (h & _FVH1_MASK).astype(np.int32)
+    signs = np.where(h >> 31, -1.0, 1.0)
+    indices, inverse = np.unique(buckets, return_inverse=True)
+    values = np.bincount(inverse, weights=signs, minlength=indices.shape[0])
+    keep = values != 0  # 부호가 상쇄된 bucket은 저장하지 않는다
+    indices, values = indices[keep], values[keep]
+    norm = np.sqrt(np.dot(values, values))
+    if norm > 0:
+        values = values / norm
+    return {"indices": indices.astype(np.int32), "values": values.astype(np.float32)}
+
+
+FVH1 = register_feature_version(
+    FeatureVersion(
+        version="fvh1",
+        names=(),
+        extract=_extract_fvh1,
+        n_features=FVH1_N_FEATURES,
+    )
+)
@@ -1,13 +1,25 @@
 # apps/api/src/app/services/generator.py
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import os
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from src.app.services.llm.types import EngineRequest
+from sqlalchemy.orm import Session
+
+from src.app.services.answer_cache import ANSWER_CACHE, cache_key, normalize_question
+from src.app.services.single_flight import CANDIDATE_FLIGHTS
+from src.app.services.llm.types import EngineRequest, EngineResult
 from src.app.services.llm.registry import build_default_registry
-from src.app.services.llm.orchestrator import run_sequential
+from src.app.services.llm.orchestrator import (
+    ORCHESTRATION_MODES,
+    arun_requests,
+    astream_concurrent,
+    run_requests,
+)
 from src.app.services.llm.prompt_builder import build_prompts_v1
 
 
@@ -24,6 +36,7 @@ def _mk_req(
     domain: str,
     params_json: Optional[Dict[str, Any]] = None,
     timeout_s: float = 20.0,
+    deadline_ts: Optional[float] = None,
 ) -> EngineRequest:
     rid = str(uuid.uuid4())
     pj = dict(params_json or {})
@@ -40,11 +53,19 @@ def _mk_req(
         model=model,
         params_json=pj,
         timeout_s=timeout_s,
+        deadline_ts=deadline_ts,
     )
     return req
 
 
-def generate_candidates_v1(
+def _resolve_mode(orchestration: Optional[str]) -> str:
+    mode = (orchestration or os.getenv("LLM_ORCHESTRATION", "concurrent")).strip().lower()
+    if mode not in ORCHESTRATION_MODES:
+        mode = "concurrent"
+    return mode
+
+
+def _build_requests(
     *,
     question: str,
     role: str,
@@ -53,13 +74,8 @@ def generate_candidates_v1(
     stack: str,
     constraints: str,
     domain: str,
-) -> List[Dict[str, Any]]:
-    """
-    Always returns 2 candidates (pads failures with error results).
-    """
-
-    reg = build_default_registry()
-
+    deadline_ts: Optional[float] = None,
+) -> List[EngineRequest]:
     openai_model = os.getenv("OPENAI_MODEL", "gpt-4o-mini").strip()
     gemini_model = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-lite").strip()
     openrouter_model = os.getenv(
@@ -89,6 +105,7 @@ def generate_candidates_v1(
             domain=domain,
             params_json={"temperature": 0.2, "max_tokens": 512},
             timeout_s=openai_timeout,
+            deadline_ts=deadline_ts,
         ),
         "gemini": _mk_req(
             provider="gemini",
@@ -102,6 +119,7 @@ def generate_candidates_v1(
             domain=domain,
             params_json={"temperature": 0.2, "max_tokens": 512},
             timeout_s=gemini_timeout,
+            deadline_ts=deadline_ts,
         ),
         "openrouter": _mk_req(
             provider="openrouter",
@@ -115,6 +133,7 @@ def generate_candidates_v1(
             domain=domain,
             params_json={"temperature": 0.2, "max_tokens": 512},
             timeout_s=openrouter_timeout,
+            deadline_ts=deadline_ts,
         ),
     }
 
@@ -127,11 +146,75 @@ def generate_candidates_v1(
         r.params_json["_system_prompt"] = system_prompt
         r.params_json["_user_prompt"] = user_prompt
 
-    results = run_sequential(reg, reqs)
+    return reqs
+
+
+def _coalesce_enabled(bypass_cache: bool) -> bool:
+    # bypass_cache(fresh sample 요청)는 다른 요청과 결과를 공유하지 않는다
+    return (not bypass_cache) and os.getenv("ASK_COALESCE_ENABLED", "1").strip() == "1"
+
+
+def _flight_key(
+    *,
+    question: str,
+    role: str,
+    level: str,
+    goal: str,
+    stack: str,
+    constraints: str,
+    domain: str,
+    mode: str,
+) -> str:
+    """_mk_req 입력(정규화) + orchestration mode → single-flight key."""
+    parts = [
+        normalize_question(question),
+        *(str(getattr(v, "value", v) or "").strip() for v in (role, level, goal, stack, constraints, domain)),
+        mode,
+    ]
+    raw = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _candidate_params(req: Optional[EngineRequest], res: EngineResult) -> Dict[str, Any]:
+    # Candidate.params_json 에 저장 (tier 2 캐시 조회 키 포함)
+    if req is None:
+        return {}
+    params = req.params_json or {}
+    return {
+        "temperature": float(params.get("temperature", 0.2)),
+        "max_tokens": int(params.get("max_tokens", 512)),
+        "cache_key": cache_key(req),
+        "cache": res.cache,
+    }
+
+
+def _merge_results(
+    reqs: List[EngineRequest],
+    cached: Dict[str, EngineResult],
+    fresh: List[EngineResult],
+) -> List[EngineResult]:
+    """캐시 hit + 새 결과를 요청 순서대로 합치고, 새 성공 결과는 캐시에 저장한다."""
+    by_id = {r.request_id: r for r in reqs}
+    for res in fresh:
+        req = by_id.get(res.request_id or "")
+        if req is not None:
+            ANSWER_CACHE.store(req, res)
+
+    pos = {r.request_id: i for i, r in enumerate(reqs)}
+    merged = list(cached.values()) + list(fresh)
+    merged.sort(key=lambda r: pos.get(r.request_id or "", len(reqs)))
+    return merged
+
+
+def _to_candidates(results: List[EngineResult], reqs: List[EngineRequest]) -> List[Dict[str, Any]]:
+    by_id = {r.request_id: r for r in reqs}
+
+    # 성공 결과를 앞으로 (stable) → 엔진이 3개 이상일 때 실패 후보가 out[:2]를 차지하지 않도록
+    ordered = sorted(results, key=lambda r: 0 if (r.error is None and (r.answer_summary or "").strip()) else 1)
 
     # convert to candidate dicts (keep failures)
     out: List[Dict[str, Any]] = []
-    for res in results:
+    for res in ordered:
         out.append(
             {
                 "provider": res.provider,
@@ -141,7 +224,7 @@ def generate_candidates_v1(
                 "tokens_in": res.tokens_in,
                 "tokens_out": res.tokens_out,
                 "error": res.error,
-                "params_json": {},  # 저장 필요하면 여기에
+                "params_json": _candidate_params(by_id.get(res.request_id or ""), res),
                 # 아래 3개는 기존 feature 스키마에 맞춰 optional
                 "has_code": False,
                 "has_bullets": False,
@@ -168,3 +251,262 @@ def generate_candidates_v1(
         )
 
     return out[:2]
+
+
+def _generate(
+    *,
+    question: str,
+    role: str,
+    level: str,
+    goal: str,
+    stack: str,
+    constraints: str,
+    domain: str,
+    mode: str,
+    db: Optional[Session],
+    bypass_cache: bool,
+    deadline_ts: Optional[float],
+    flight_key: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    reg = build_default_registry()
+    reqs = _build_requests(
+        question=question,
+        role=role,
+        level=level,
+        goal=goal,
+        stack=stack,
+        constraints=constraints,
+        domain=domain,
+        deadline_ts=deadline_ts,
+    )
+    # tier 2(DB) 조회는 flight 밖에서 호출자 자신의 session으로 한다
+    # (request-scoped session을 다른 요청의 flight와 공유하지 않음)
+    cached = ANSWER_CACHE.lookup(reqs, db=db, bypass=bypass_cache)
+    misses = [r for r in reqs if r.request_id not in cached]
+    if not misses:
+        return _to_candidates(_merge_results(reqs, cached, []), reqs)
+
+    def call_providers() -> List[Dict[str, Any]]:
+        fresh = run_requests(reg, misses, mode=mode)
+        return _to_candidates(_merge_results(reqs, cached, fresh), reqs)
+
+    if flight_key is None:
+        return call_providers()
+    return CANDIDATE_FLIGHTS.do(flight_key, call_providers)
+
+
+async def _agenerate(
+    *,
+    question: str,
+    role: str,
+    level: str,
+    goal: str,
+    stack: str,
+    constraints: str,
+    domain: str,
+    mode: str,
+    db: Optional[Session],
+    bypass_cache: bool,
+    deadline_ts: Optional[float],
+    flight_key: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    reg = build_default_registry()
+    reqs = _build_requests(
+        question=question,
+        role=role,
+        level=level,
+        goal=goal,
+        stack=stack,
+        constraints=constraints,
+        domain=domain,
+        deadline_ts=deadline_ts,
+    )
+    # _generate와 동일: DB 조회는 호출자 session으로 flight 밖에서.
+    # flight task는 leader가 끊긴 뒤에도(shield) 계속 돌기 때문에 session을 잡고 있으면 안 된다
+    cached = await asyncio.to_thread(ANSWER_CACHE.lookup, reqs, db, bypass_cache)
+    misses = [r for r in reqs if r.request_id not in cached]
+    if not misses:
+        return _to_candidates(_merge_results(reqs, cached, []), reqs)
+
+    async def call_providers() -> List[Dict[str, Any]]:
+        fresh = await arun_requests(reg, misses, mode=mode)
+        return _to_candidates(_merge_results(reqs, cached, fresh), reqs)
+
+    if flight_key is None:
+        return await call_providers()
+    return await CANDIDATE_FLIGHTS.ado(flight_key, call_providers)
+
+
+def generate_candidates_v1(
+    *,
+    question: str,
+    role: str,
+    level: str,
+    goal: str,
+    stack: str,
+    constraints: str,
+    domain: str,
+    orchestration: Optional[str] = None,
+    db: Optional[Session] = None,
+    bypass_cache: bool = False,
+    deadline_ts: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Always returns 2 candidates (pads failures with error results).
+
+    캐시: ANSWER_CACHE (tier 1 in-process LRU/TTL, tier 2 = db가 주어지면 저장된 candidates)
+      - bypass_cache=True 이면 항상 provider를 새로 호출 (연구용 fresh sample)
+
+    single-flight: 같은 (정규화된) 입력으로 동시에 들어온 호출은 provider 호출 1회를 공유한다.
+      - 캐시 조회는 호출자마다 자기 db session으로 먼저 하고, miss가 있을 때만 flight에 들어간다
+      - 호출자마다 후보 dict 사본을 받으므로 Question/Selection은 각자 저장된다
+      - bypass_cache=True 또는 ASK_COALESCE_ENABLED=0 이면 합치지 않는다
+
+    deadline_ts: /ask 전체 SLA (time.time() 기준 절대 시각). 각 EngineRequest로 전달되어
+      provider 호출 timeout과 재시도(backoff)가 이 시각을 넘지 않는다.
+
+    orchestration: "sequential" | "concurrent" | "hedged"
+      - 미지정 시 LLM_ORCHESTRATION 환경변수 (기본 concurrent)
+      - concurrent: 모든 엔진 동시 호출, timeout_s는 orchestrator가 강제
+      - hedged: 성공 2개가 모이면 즉시 반환, 느린/실패 provider는 복제 요청으로 보완
+    """
+    inputs = dict(
+        question=question,
+        role=role,
+        level=level,
+        goal=goal,
+        stack=stack,
+        constraints=constraints,
+        domain=domain,
+        mode=_resolve_mode(orchestration),
+    )
+    key = _flight_key(**inputs) if _coalesce_enabled(bypass_cache) else None
+    return _generate(**inputs, db=db, bypass_cache=bypass_cache, deadline_ts=deadline_ts, flight_key=key)
+
+
+async def agenerate_candidates_v1(
+    *,
+    question: str,
+    role: str,
+    level: str,
+    goal: str,
+    stack: str,
+    constraints: str,
+    domain: str,
+    orchestration: Optional[str] = None,
+    db: Optional[Session] = None,
+    bypass_cache: bool = False,
+    deadline_ts: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    generate_candidates_v1의 async 버전 (engine.agenerate 사용).
+    /ask async handler에서 event loop를 막지 않고 provider 호출을 기다린다.
+    tier 2 캐시 조회(sync DB)는 스레드에서 실행한다.
+    동시에 들어온 같은 질문은 in-flight provider 호출 1개를 공유한다 (single-flight, DB 조회는 각자).
+    """
+    inputs = dict(
+        question=question,
+        role=role,
+        level=level,
+        goal=goal,
+        stack=stack,
+        constraints=constraints,
+        domain=domain,
+        mode=_resolve_mode(orchestration),
+    )
+    key = _flight_key(**inputs) if _coalesce_enabled(bypass_cache) else None
+    return await _agenerate(**inputs, db=db, bypass_cache=bypass_cache, deadline_ts=deadline_ts, flight_key=key)
+
+
+async def astream_candidates_v1(
+    *,
+    question: str,
+    role: str,
+    level: str,
+    goal: str,
+    stack: str,
+    constraints: str,
+    domain: str,
+    db: Optional[Session] = None,
+    bypass_cache: bool = False,
+    deadline_ts: Optional[float] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming 버전. 아래 이벤트 dict를 순서대로 내보낸다.
+    - {"type": "requests", "requests": [{"candidate_index", "provider", "model"}, ...]}  # 처음 1회
+    - {"type": "delta", "candidate_index", "provider", "model", "delta"}
+    - {"type": "candidate_done", "candidate_index", "provider", "model", "latency_ms", "error"}
+    - {"type": "candidates", "candidates": [...]}  # 마지막 1회, generate_candidates_v1과 같은 형식
+    캐시 hit 후보는 전체 답변을 delta 1개로 즉시 내보낸다.
+    스트림은 재시도하지 않는다 (이미 내보낸 delta를 되돌릴 수 없음). deadline_ts는 timeout에 반영.
+    """
+    reg = build_default_registry()
+    reqs = _build_requests(
+        question=question,
+        role=role,
+        level=level,
+        goal=goal,
+        stack=stack,
+        constraints=constraints,
+        domain=domain,
+        deadline_ts=deadline_ts,
+    )
+
+    yield {
+        "type": "requests",
+        "requests": [
+            {"candidate_index": idx, "provider": req.provider, "model": req.model}
+            for idx, req in enumerate(reqs)
+        ],
+    }
+
+    cached = await asyncio.to_thread(ANSWER_CACHE.lookup, reqs, db, bypass_cache)
+    for idx, req in enumerate(reqs):
+        hit = cached.get(req.request_id)
+        if hit is None:
+            continue
+        yield {
+            "type": "delta",
+            "candidate_index": idx,
+            "provider": req.provider,
+            "model": req.model,
+            "delta": hit.answer_summary,
+        }
+        yield {
+            "type": "candidate_done",
+            "candidate_index": idx,
+            "provider": hit.provider,
+            "model": hit.model,
+            "latency_ms": hit.latency_ms,
+            "error": None,
+        }
+
+    miss_idx = [i for i, r in enumerate(reqs) if r.request_id not in cached]
+    fresh: List[EngineResult] = []
+    async for j, ev in astream_concurrent(reg, [reqs[i] for i in miss_idx]):
+        idx = miss_idx[j]
+        req = reqs[idx]
+        if ev.result is None:
+            yield {
+                "type": "delta",
+                "candidate_index": idx,
+                "provider": req.provider,
+                "model": req.model,
+                "delta": ev.delta,
+            }
+            continue
+
+        fresh.append(ev.result)
+        yield {
+            "type": "candidate_done",
+            "candidate_index": idx,
+            "provider": ev.result.provider,
+            "model": ev.result.model,
+            "latency_ms": ev.result.latency_ms,
+            "error": ev.result.error,
+        }
+
+    yield {
+        "type": "candidates",
+        "candidates": _to_candidates(_merge_results(reqs, cached, fresh), reqs),
+    }
@@ -1,7 +1,9 @@
 # apps/api/src/app/services/llm/base.py
 from __future__ import annotations
+import asyncio
 from abc import ABC, abstractmethod
-from .types import EngineRequest, EngineResult
+from typing import AsyncIterator
+from .types import EngineRequest, EngineResult, StreamEvent
 
 
 class LLMEngine(ABC):
@@ -13,3 +15,33 @@ class LLMEngine(ABC):
     @abstractmethod
     def generate(self, request: EngineRequest) -> EngineResult:
         pass
+
+    async def agenerate(self, request: EngineRequest) -> EngineResult:
+        """
+        Async 진입점.
+        기본 구현은 blocking generate를 스레드로 넘긴다 (native async 미지원 엔진용).
+        실제 provider 엔진은 async SDK로 override 한다.
+        """
+        return await asyncio.to_thread(self.generate, request)
+
+    async def generate_stream(self, request: EngineRequest) -> AsyncIterator[StreamEvent]:
+        """
+        Streaming 진입점: StreamEvent(delta=...)를 도착 순서대로 내보내고
+        마지막에 StreamEvent(result=EngineResult)를 정확히 1번 내보낸다.
+        기본 구현은 agenerate 결과 전체를 delta 1개로 내보낸다 (streaming 미지원 엔진용).
+        """
+        res = await self.agenerate(request)
+        if res.answer_summary:
+            yield StreamEvent(delta=res.answer_summary)
+        yield StreamEvent(result=res)
+
+    def close(self) -> None:
+        """provider 클라이언트 등 process 수명 리소스 정리 (기본: no-op)."""
+        return None
+
+    async def aclose(self) -> None:
+        self.close()
+
+    async def arelease_loop(self) -> None:
+        """현재 event loop에 묶인 async 리소스만 정리 (loop를 닫기 직전에 호출, 기본: no-op)."""
+        return None
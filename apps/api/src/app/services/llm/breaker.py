@@ -0,0 +1,141 @@
+# apps/api/src/app/services/llm/breaker.py
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    provider/model 단위 circuit breaker (thread-safe).
+    - closed: 정상 호출. 연속 실패(error/timeout)가 failure_threshold에 도달하면 open
+    - open: cooldown_s 동안 호출하지 않고 즉시 circuit_open 반환
+    - half_open: cooldown 이후 probe 호출을 half_open_probes개까지만 허용
+      probe 성공 → closed, probe 실패 → 다시 open
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown_s: float = 30.0,
+        half_open_probes: int = 1,
+    ) -> None:
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown_s = float(cooldown_s)
+        self.half_open_probes = max(1, int(half_open_probes))
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._short_circuited = 0
+
+    def _maybe_half_open(self, now: float) -> None:
+        if self._state == OPEN and now - self._opened_at >= self.cooldown_s:
+            self._state = HALF_OPEN
+            self._probes = 0
+
+    def allow(self) -> bool:
+        """호출 허용 여부. False면 호출하지 말고 circuit_open으로 처리한다."""
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return True
+            self._short_circuited += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probes = 0
+
+    def release(self) -> None:
+        """결과 없이 끝난 호출(cancel된 hedge straggler 등)의 half-open probe 슬롯 반환."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            return self._state
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "short_circuited": self._short_circuited,
+            }
+
+
+class BreakerBoard:
+    """(provider, model) → CircuitBreaker. 설정은 env에서 읽는다."""
+
+    def __init__(
+        self,
+        failure_threshold: Optional[int] = None,
+        cooldown_s: Optional[float] = None,
+        half_open_probes: Optional[int] = None,
+    ) -> None:
+        self.enabled = os.getenv("LLM_BREAKER_ENABLED", "1").strip() == "1"
+        self.failure_threshold = (
+            failure_threshold
+            if failure_threshold is not None
+            else int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+        )
+        self.cooldown_s = (
+            cooldown_s
+            if cooldown_s is not None
+            else float(os.getenv("LLM_BREAKER_COOLDOWN_S", "30"))
+        )
+        self.half_open_probes = (
+            half_open_probes
+            if half_open_probes is not None
+            else int(os.getenv("LLM_BREAKER_HALF_OPEN_PROBES", "1"))
+        )
+        self._lock = threading.Lock()
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+
+    def get(self, provider: str, model: str) -> Optional[CircuitBreaker]:
+        if not self.enabled:
+            return None
+        key = (provider, model)
+        br = self._breakers.get(key)
+        if br is None:
+            with self._lock:
+                br = self._breakers.get(key)
+                if br is None:
+                    br = CircuitBreaker(
+                        failure_threshold=self.failure_threshold,
+                        cooldown_s=self.cooldown_s,
+                        half_open_probes=self.half_open_probes,
+                    )
+                    self._breakers[key] = br
+        return br
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            items = list(self._breakers.items())
+        return {f"{provider}/{model}": br.snapshot() for (provider, model), br in items}
@@ -0,0 +1,315 @@
+# apps/api/src/app/services/llm/client_pool.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+_log = logging.getLogger(__name__)
+
+# 예약만 해 둔 close task/future 참조 (완료 전에 GC 되지 않도록)
+_CLOSING: Set[Any] = set()
+
+
+def _on_closed(fut: Any) -> None:
+    _CLOSING.discard(fut)
+    if fut.cancelled():
+        return
+    exc = fut.exception()
+    if exc is not None:
+        _log.warning("failed to close pooled async client: %r", exc)
+
+
+def _close_async_client(loop: asyncio.AbstractEventLoop, aclose: Callable[[], Awaitable[Any]]) -> Optional[Any]:
+    """
+    async client는 생성된 event loop에 묶여 있으므로 그 loop에서 닫는다.
+    - 지금 실행 중인 loop: task로 예약하고 반환 (호출자가 await 할 수 있음)
+    - 다른 thread에서 돌고 있는 loop: run_coroutine_threadsafe
+    - 멈춘 loop: run_until_complete / 이미 닫힌 loop: 닫을 방법이 없으므로 참조만 버린다
+    실패는 warning log로 남긴다.
+    """
+    try:
+        running: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+
+    try:
+        if loop is running:
+            task = loop.create_task(aclose())
+        elif loop.is_closed():
+            _log.debug("dropping async client bound to a closed event loop")
+            return None
+        elif loop.is_running():
+            task = asyncio.run_coroutine_threadsafe(aclose(), loop)
+        else:
+            loop.run_until_complete(aclose())
+            return None
+    except Exception:
+        _log.warning("failed to close pooled async client", exc_info=True)
+        return None
+
+    _CLOSING.add(task)
+    task.add_done_callback(_on_closed)
+    return task
+
+
+def _close_sync_client(client: Any) -> None:
+    try:
+        client.close()
+    except Exception:
+        _log.warning("failed to close pooled client", exc_info=True)
+
+
+def _running_loop() -> asyncio.AbstractEventLoop:
+    return asyncio.get_running_loop()  # aget은 coroutine 안에서만 호출된다
+
+
+def _drop_closed_loops(clients: Dict[asyncio.AbstractEventLoop, Any]) -> None:
+    # asyncio.run() 등으로 이미 닫힌 loop의 client는 다시 쓸 수 없다 (connection이 그 loop에 묶임)
+    for loop in [loop for loop in clients if loop.is_closed()]:
+        del clients[loop]
+
+
+class OpenAIClientPool:
+    """
+    OpenAI SDK(OpenAI/OpenRouter 공용) 클라이언트를 process 수명 동안 재사용한다.
+    - lazy: 첫 호출 시 생성 (openai 미설치여도 서버 기동 가능)
+    - keep-alive httpx connection pool, max_connections 설정 가능
+    - api_key가 바뀌면 기존 클라이언트를 닫고 새로 만든다
+    - async 클라이언트는 event loop별로 따로 둔다: httpx connection이 생성된 loop에 묶이므로
+      asyncio.run()을 반복 호출하는 sync 경로(run_requests(mode="hedged"))가 닫힌 loop의
+      connection을 재사용하지 않게 한다
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: Optional[str] = None,
+        max_connections: int = 20,
+        keepalive_expiry_s: float = 30.0,
+    ) -> None:
+        self.base_url = base_url
+        self.max_connections = max(1, int(max_connections))
+        self.keepalive_expiry_s = float(keepalive_expiry_s)
+
+        self._lock = threading.Lock()
+        self._sync: Optional[Tuple[str, Any]] = None
+        self._async: Dict[asyncio.AbstractEventLoop, Tuple[str, Any]] = {}
+
+    def _limits(self) -> Any:
+        import httpx  # type: ignore  (openai 의존성)
+
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+            keepalive_expiry=self.keepalive_expiry_s,
+        )
+
+    def _client_kwargs(self, api_key: str) -> Dict[str, Any]:
+        # SDK 내부 재시도는 끈다: 재시도는 orchestrator의 RetryPolicy가 deadline 안에서 담당
+        kwargs: Dict[str, Any] = {"api_key": api_key, "max_retries": 0}
+        if self.base_url:
+            kwargs["base_url"] = self.base_url
+        return kwargs
+
+    def get(self, api_key: str) -> Any:
+        cur = self._sync
+        if cur is not None and cur[0] == api_key:
+            return cur[1]
+
+        with self._lock:
+            cur = self._sync
+            if cur is not None and cur[0] == api_key:
+                return cur[1]
+
+            from openai import DefaultHttpxClient, OpenAI  # type: ignore
+
+            client = OpenAI(
+                **self._client_kwargs(api_key),
+                http_client=DefaultHttpxClient(limits=self._limits()),
+            )
+            if cur is not None:
+                _close_sync_client(cur[1])
+            self._sync = (api_key, client)
+            return client
+
+    def aget(self, api_key: str) -> Any:
+        loop = _running_loop()
+        cur = self._async.get(loop)
+        if cur is not None and cur[0] == api_key:
+            return cur[1]
+
+        with self._lock:
+            cur = self._async.get(loop)
+            if cur is not None and cur[0] == api_key:
+                return cur[1]
+            _drop_closed_loops(self._async)
+
+            from openai import AsyncOpenAI, DefaultAsyncHttpxClient  # type: ignore
+
+            client = AsyncOpenAI(
+                **self._client_kwargs(api_key),
+                http_client=DefaultAsyncHttpxClient(limits=self._limits()),
+            )
+            if cur is not None:
+                _close_async_client(loop, cur[1].close)
+            self._async[loop] = (api_key, client)
+            return client
+
+    def _take_all(self) -> Dict[asyncio.AbstractEventLoop, Tuple[str, Any]]:
+        """sync client는 바로 닫고, loop별 async client 목록을 넘긴다."""
+        with self._lock:
+            sync_client, self._sync = self._sync, None
+            async_clients, self._async = self._async, {}
+        if sync_client is not None:
+            _close_sync_client(sync_client[1])
+        return async_clients
+
+    def close(self) -> None:
+        async_clients = self._take_all()
+        for loop, (_, client) in async_clients.items():
+            _close_async_client(loop, client.close)
+
+    async def arelease_loop(self) -> None:
+        """현재 event loop의 async client만 닫는다 (loop를 곧 닫는 asyncio.run 호출자용)."""
+        with self._lock:
+            cur = self._async.pop(_running_loop(), None)
+        if cur is not None:
+            try:
+                await cur[1].close()
+            except Exception:
+                _log.warning("failed to close pooled async client", exc_info=True)
+
+    async def aclose(self) -> None:
+        async_clients = self._take_all()
+        pending = [_close_async_client(loop, client.close) for loop, (_, client) in async_clients.items()]
+        # 현재 loop의 client는 여기서 닫힐 때까지 기다린다 (shutdown hook에서 close가 유실되지 않게)
+        current = [t for t in pending if isinstance(t, asyncio.Task)]
+        if current:
+            await asyncio.gather(*current, return_exceptions=True)
+
+
+class GeminiModelPool:
+    """
+    google.generativeai는 genai.configure가 전역 상태라 thread-safe 하지 않다.
+    - configure는 api_key가 바뀔 때만 lock 안에서 1회 호출
+    - GenerativeModel은 model_name별로 캐시 (generation_config는 호출 시 전달)
+    - async 호출용 model(aget)은 event loop별로 따로 둔다: genai는 grpc.aio async client를
+      process 전역 1개로 캐시하는데 그 channel은 처음 쓴 loop에 묶이므로,
+      loop마다 전용 async client를 만들어 model에 붙인다
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._api_key: Optional[str] = None
+        self._genai: Any = None
+        self._models: Dict[str, Any] = {}
+        self._async_models: Dict[asyncio.AbstractEventLoop, Dict[str, Any]] = {}
+        self._async_clients: Dict[asyncio.AbstractEventLoop, Any] = {}
+        self._warned_internals = False
+
+    def _configure_locked(self, api_key: str) -> None:
+        if self._genai is not None and self._api_key == api_key:
+            return
+        import google.generativeai as genai  # type: ignore
+
+        genai.configure(api_key=api_key)
+        self._genai = genai
+        self._api_key = api_key
+        self._models = {}
+        self._close_async_locked()
+
+    def _close_async_locked(self) -> List[Any]:
+        clients, self._async_clients = self._async_clients, {}
+        self._async_models = {}
+        return [_close_async_client(loop, client.transport.close) for loop, client in clients.items()]
+
+    def get(self, api_key: str, model_name: str) -> Any:
+        if self._api_key == api_key:
+            model = self._models.get(model_name)
+            if model is not None:
+                return model
+
+        with self._lock:
+            self._configure_locked(api_key)
+            model = self._models.get(model_name)
+            if model is None:
+                model = self._genai.GenerativeModel(model_name=model_name)
+                self._models[model_name] = model
+            return model
+
+    def aget(self, api_key: str, model_name: str) -> Any:
+        loop = _running_loop()
+        if self._api_key == api_key:
+            model = self._async_models.get(loop, {}).get(model_name)
+            if model is not None:
+                return model
+
+        with self._lock:
+            self._configure_locked(api_key)
+            _drop_closed_loops(self._async_models)
+            _drop_closed_loops(self._async_clients)
+
+            models = self._async_models.setdefault(loop, {})
+            model = models.get(model_name)
+            if model is None:
+                model = self._genai.GenerativeModel(model_name=model_name)
+                client = self._async_clients.get(loop) or self._make_loop_client_locked(loop, model)
+                if client is not None:
+                    model._async_client = client
+                models[model_name] = model
+            return model
+
+    def _make_loop_client_locked(self, loop: asyncio.AbstractEventLoop, model: Any) -> Optional[Any]:
+        """
+        이 loop 전용 generative async client (전역 캐시 get_default_generative_async_client 대신).
+        SDK 내부 API(_client_manager.make_client, GenerativeModel._async_client)를 쓰므로
+        google-generativeai 버전은 requirements.txt에 고정한다. 내부가 바뀐 버전이면 None을 돌려주고
+        (warning 1회) SDK 기본 전역 async client를 쓴다 → 단일 loop(서버)에서는 그대로 동작.
+        """
+        from google.generativeai import client as genai_client  # type: ignore
+
+        manager = getattr(genai_client, "_client_manager", None)
+        if not callable(getattr(manager, "make_client", None)) or not hasattr(model, "_async_client"):
+            if not self._warned_internals:
+                self._warned_internals = True
+                _log.warning(
+                    "google-generativeai %s: per-loop async client internals not found; "
+                    "falling back to the SDK default async client (not safe across event loops)",
+                    getattr(self._genai, "__version__", "?"),
+                )
+            return None
+
+        client = manager.make_client("generative_async")
+        self._async_clients[loop] = client
+        return client
+
+    async def arelease_loop(self) -> None:
+        """현재 event loop의 async model/client만 닫는다 (loop를 곧 닫는 asyncio.run 호출자용)."""
+        loop = _running_loop()
+        with self._lock:
+            self._async_models.pop(loop, None)
+            client = self._async_clients.pop(loop, None)
+        if client is not None:
+            try:
+                await client.transport.close()
+            except Exception:
+                _log.warning("failed to close pooled async client", exc_info=True)
+
+    def close(self) -> None:
+        with self._lock:
+            self._models = {}
+            self._genai = None
+            self._api_key = None
+            self._close_async_locked()
+
+    async def aclose(self) -> None:
+        with self._lock:
+            self._models = {}
+            self._genai = None
+            self._api_key = None
+            pending = self._close_async_locked()
+        current = [t for t in pending if isinstance(t, asyncio.Task)]
+        if current:
+            await asyncio.gather(*current, return_exceptions=True)
@@ -23,3 +23,7 @@ class DummyOpenAIEngine(LLMEngine):
             answer_summary=answer,
             latency_ms=latency,
         )
+
+    async def agenerate(self, request: EngineRequest) -> EngineResult:
+        # dummy는 I/O가 없으므로 스레드 전환 없이 바로 실행
+        return self.generate(request)
@@ -3,10 +3,11 @@ from __future__ import annotations
 
 import os
 import time
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from src.app.services.llm.base import LLMEngine
-from src.app.services.llm.types import EngineRequest, EngineResult
+from src.app.services.llm.client_pool import GeminiModelPool
+from src.app.services.llm.types import EngineRequest, EngineResult, StreamEvent
 
 
 class GeminiEngine(LLMEngine):
@@ -16,38 +17,40 @@ class GeminiEngine(LLMEngine):
     - Server must boot even if package is not installed.
     - If GEMINI_API_KEY missing -> returns EngineResult.error (no exception)
     - system_prompt → prepended to user_prompt (Gemini does not support system role)
+    - agenerate: generate_content_async 사용
+    - configure/GenerativeModel은 GeminiModelPool로 process 수명 동안 재사용 (async는 event loop별)
     """
 
+    def __init__(self) -> None:
+        self._pool = GeminiModelPool()
+
+    def close(self) -> None:
+        self._pool.close()
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
+
+    async def arelease_loop(self) -> None:
+        await self._pool.arelease_loop()
+
     def provider_name(self) -> str:
         return "gemini"
 
-    def generate(self, request: EngineRequest) -> EngineResult:
-        t0 = time.time()
-
-        api_key = os.getenv("GEMINI_API_KEY", "").strip()
-        if not api_key:
-            return EngineResult(
-                provider=self.provider_name(),
-                model=request.model,
-                answer_summary="",
-                latency_ms=int((time.time() - t0) * 1000),
-                error="missing_env:GEMINI_API_KEY",
-            )
+    def _error(self, request: EngineRequest, t0: float, error: str) -> EngineResult:
+        return EngineResult(
+            provider=self.provider_name(),
+            model=request.model,
+            answer_summary="",
+            latency_ms=int((time.time() - t0) * 1000),
+            error=error,
+        )
 
+    def _import_genai(self) -> None:
         # --- lazy import: google.generativeai (설치된 패키지) ---
-        try:
-            import google.generativeai as genai  # type: ignore
-            genai.configure(api_key=api_key)
-            _use_legacy = True
-        except Exception as e:
-            return EngineResult(
-                provider=self.provider_name(),
-                model=request.model,
-                answer_summary="",
-                latency_ms=int((time.time() - t0) * 1000),
-                error=f"gemini_import_error:{repr(e)}",
-            )
+        import google.generativeai  # type: ignore  # noqa: F401
 
+    def _call_args(self, request: EngineRequest) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+        """(full_prompt, generation_config, request_options) 구성."""
         # params
         params: Dict[str, Any] = request.params_json or {}
         temperature = float(params.get("temperature", 0.2))
@@ -59,45 +62,124 @@ class GeminiEngine(LLMEngine):
         # Gemini는 system role을 직접 지원하지 않으므로 prepend
         full_prompt = f"{system_prompt}\n\n{user_prompt}".strip() if system_prompt else user_prompt
 
+        generation_config = {
+            "temperature": temperature,
+            "max_output_tokens": max_tokens,
+        }
+        request_options = {"timeout": float(request.timeout_s)}
+        return full_prompt, generation_config, request_options
+
+    def _to_result(self, request: EngineRequest, resp: Any, t0: float) -> EngineResult:
+        text = resp.text or ""
+        return self._result(request, t0, text, getattr(resp, "usage_metadata", None))
+
+    def _result(self, request: EngineRequest, t0: float, text: str, meta: Any) -> EngineResult:
+        latency_ms = int((time.time() - t0) * 1000)
+
+        # token fields (best-effort)
+        tokens_in: Optional[int] = None
+        tokens_out: Optional[int] = None
+        try:
+            if meta:
+                tokens_in = int(getattr(meta, "prompt_token_count", 0) or 0)
+                tokens_out = int(getattr(meta, "candidates_token_count", 0) or 0)
+        except Exception:
+            pass
+
+        return EngineResult(
+            provider=self.provider_name(),
+            model=request.model,
+            answer_summary=text.strip(),
+            latency_ms=latency_ms,
+            tokens_in=tokens_in,
+            tokens_out=tokens_out,
+            error=None,
+        )
+
+    def generate(self, request: EngineRequest) -> EngineResult:
+        t0 = time.time()
+
+        api_key = os.getenv("GEMINI_API_KEY", "").strip()
+        if not api_key:
+            return self._error(request, t0, "missing_env:GEMINI_API_KEY")
+
+        try:
+            self._import_genai()
+        except Exception as e:
+            return self._error(request, t0, f"gemini_import_error:{repr(e)}")
+
         try:
-            model = genai.GenerativeModel(
-                model_name=request.model,
-                generation_config={
-                    "temperature": temperature,
-                    "max_output_tokens": max_tokens,
-                },
+            model = self._pool.get(api_key, request.model)
+            full_prompt, generation_config, request_options = self._call_args(request)
+            resp = model.generate_content(
+                full_prompt,
+                generation_config=generation_config,
+                request_options=request_options,
             )
-            resp = model.generate_content(full_prompt)
-
-            text = resp.text or ""
-            latency_ms = int((time.time() - t0) * 1000)
-
-            # token fields (best-effort)
-            tokens_in: Optional[int] = None
-            tokens_out: Optional[int] = None
-            try:
-                meta = resp.usage_metadata
-                if meta:
-                    tokens_in = int(getattr(meta, "prompt_token_count", 0) or 0)
-                    tokens_out = int(getattr(meta, "candidates_token_count", 0) or 0)
-            except Exception:
-                pass
-
-            return EngineResult(
-                provider=self.provider_name(),
-                model=request.model,
-                answer_summary=text.strip(),
-                latency_ms=latency_ms,
-                tokens_in=tokens_in,
-                tokens_out=tokens_out,
-                error=None,
+            return self._to_result(request, resp, t0)
+
+        except Exception as e:
+            return self._error(request, t0, f"gemini_call_error:{repr(e)}")
+
+    async def agenerate(self, request: EngineRequest) -> EngineResult:
+        t0 = time.time()
+
+        api_key = os.getenv("GEMINI_API_KEY", "").strip()
+        if not api_key:
+            return self._error(request, t0, "missing_env:GEMINI_API_KEY")
+
+        try:
+            self._import_genai()
+        except Exception as e:
+            return self._error(request, t0, f"gemini_import_error:{repr(e)}")
+
+        try:
+            model = self._pool.aget(api_key, request.model)
+            full_prompt, generation_config, request_options = self._call_args(request)
+            resp = await model.generate_content_async(
+                full_prompt,
+                generation_config=generation_config,
+                request_options=request_options,
             )
+            return self._to_result(request, resp, t0)
 
         except Exception as e:
-            return EngineResult(
-                provider=self.provider_name(),
-                model=request.model,
-                answer_summary="",
-                latency_ms=int((time.time() - t0) * 1000),
-                error=f"gemini_call_error:{repr(e)}",
+            return self._error(request, t0, f"gemini_call_error:{repr(e)}")
+
+    async def generate_stream(self, request: EngineRequest) -> AsyncIterator[StreamEvent]:
+        t0 = time.time()
+
+        api_key = os.getenv("GEMINI_API_KEY", "").strip()
+        if not api_key:
+            yield StreamEvent(result=self._error(request, t0, "missing_env:GEMINI_API_KEY"))
+            return
+
+        try:
+            self._import_genai()
+        except Exception as e:
+            yield StreamEvent(result=self._error(request, t0, f"gemini_import_error:{repr(e)}"))
+            return
+
+        parts: List[str] = []
+        meta: Any = None
+        try:
+            model = self._pool.aget(api_key, request.model)
+            full_prompt, generation_config, request_options = self._call_args(request)
+            resp = await model.generate_content_async(
+                full_prompt,
+                generation_config=generation_config,
+                request_options=request_options,
+                stream=True,
             )
+            async for chunk in resp:
+                meta = getattr(chunk, "usage_metadata", None) or meta
+                delta = chunk.text or ""
+                if delta:
+                    parts.append(delta)
+                    yield StreamEvent(delta=delta)
+
+        except Exception as e:
+            yield StreamEvent(result=self._error(request, t0, f"gemini_call_error:{repr(e)}"))
+            return
+
+        yield StreamEvent(result=self._result(request, t0, "".join(parts), meta))
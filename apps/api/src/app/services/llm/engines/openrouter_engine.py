@@ -3,13 +3,20 @@ from __future__ import annotations
 
 import os
 import time
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from src.app.services.llm.base import LLMEngine
-from src.app.services.llm.types import EngineRequest, EngineResult
+from src.app.services.llm.client_pool import OpenAIClientPool
+from src.app.services.llm.types import EngineRequest, EngineResult, StreamEvent
 
 _OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 
+# OpenRouter 권장 헤더 (optional)
+_OPENROUTER_HEADERS = {
+    "HTTP-Referer": "https://github.com/multi-llm-answer-selection-ltr",
+    "X-Title": "Multi-LLM Answer Selection",
+}
+
 
 class OpenRouterEngine(LLMEngine):
     """
@@ -17,91 +24,160 @@ class OpenRouterEngine(LLMEngine):
     - 무료 모델(예: deepseek/deepseek-chat-v3-0324:free) 사용 가능
     - openai SDK를 재사용하고 base_url만 OpenRouter로 변경
     - OPENROUTER_API_KEY 환경변수가 없으면 error 반환 (서버는 정상 기동)
+    - agenerate: AsyncOpenAI 사용
     """
 
+    def __init__(self) -> None:
+        # process 수명 동안 재사용되는 keep-alive 클라이언트 (lazy 생성)
+        self._pool = OpenAIClientPool(
+            base_url=_OPENROUTER_BASE_URL,
+            max_connections=int(os.getenv("OPENROUTER_MAX_CONNECTIONS", "20")),
+        )
+
+    def close(self) -> None:
+        self._pool.close()
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
+
+    async def arelease_loop(self) -> None:
+        await self._pool.arelease_loop()
+
     def provider_name(self) -> str:
         return "openrouter"
 
+    def _error(self, request: EngineRequest, t0: float, error: str) -> EngineResult:
+        return EngineResult(
+            provider=self.provider_name(),
+            model=request.model,
+            answer_summary="",
+            latency_ms=int((time.time() - t0) * 1000),
+            error=error,
+        )
+
+    def _create_kwargs(self, request: EngineRequest) -> Dict[str, Any]:
+        params: Dict[str, Any] = request.params_json or {}
+        temperature = float(params.get("temperature", 0.2))
+        max_tokens = int(params.get("max_tokens", 512))
+
+        system_prompt = str(params.get("_system_prompt", ""))
+        user_prompt = str(params.get("_user_prompt", ""))
+
+        messages: List[Dict[str, str]] = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ]
+        return {
+            "model": request.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "timeout": float(request.timeout_s),
+            "extra_headers": dict(_OPENROUTER_HEADERS),
+        }
+
+    def _to_result(self, request: EngineRequest, resp: Any, t0: float) -> EngineResult:
+        text = resp.choices[0].message.content or ""
+        return self._result(request, t0, text, resp.usage)
+
+    def _result(self, request: EngineRequest, t0: float, text: str, usage: Any) -> EngineResult:
+        latency_ms = int((time.time() - t0) * 1000)
+
+        tokens_in: Optional[int] = None
+        tokens_out: Optional[int] = None
+        try:
+            if usage:
+                tokens_in = int(getattr(usage, "prompt_tokens", 0) or 0)
+                tokens_out = int(getattr(usage, "completion_tokens", 0) or 0)
+        except Exception:
+            pass
+
+        return EngineResult(
+            provider=self.provider_name(),
+            model=request.model,
+            answer_summary=text.strip(),
+            latency_ms=latency_ms,
+            tokens_in=tokens_in,
+            tokens_out=tokens_out,
+            error=None,
+        )
+
     def generate(self, request: EngineRequest) -> EngineResult:
         t0 = time.time()
 
         api_key = os.getenv("OPENROUTER_API_KEY", "").strip()
         if not api_key:
-            return EngineResult(
-                provider=self.provider_name(),
-                model=request.model,
-                answer_summary="",
-                latency_ms=int((time.time() - t0) * 1000),
-                error="missing_env:OPENROUTER_API_KEY",
-            )
+            return self._error(request, t0, "missing_env:OPENROUTER_API_KEY")
 
         # openai SDK를 이용해 OpenRouter endpoint 호출
         try:
-            from openai import OpenAI  # type: ignore
+            import openai  # type: ignore  # noqa: F401
         except Exception as e:
-            return EngineResult(
-                provider=self.provider_name(),
-                model=request.model,
-                answer_summary="",
-                latency_ms=int((time.time() - t0) * 1000),
-                error=f"openrouter_import_error:{repr(e)}",
-            )
+            return self._error(request, t0, f"openrouter_import_error:{repr(e)}")
 
-        params: Dict[str, Any] = request.params_json or {}
-        temperature = float(params.get("temperature", 0.2))
-        max_tokens = int(params.get("max_tokens", 512))
+        try:
+            client = self._pool.get(api_key)
+            resp = client.chat.completions.create(**self._create_kwargs(request))
+            return self._to_result(request, resp, t0)
 
-        system_prompt = str(params.get("_system_prompt", ""))
-        user_prompt = str(params.get("_user_prompt", ""))
+        except Exception as e:
+            return self._error(request, t0, f"openrouter_call_error:{repr(e)}")
+
+    async def agenerate(self, request: EngineRequest) -> EngineResult:
+        t0 = time.time()
+
+        api_key = os.getenv("OPENROUTER_API_KEY", "").strip()
+        if not api_key:
+            return self._error(request, t0, "missing_env:OPENROUTER_API_KEY")
 
         try:
-            client = OpenAI(
-                api_key=api_key,
-                base_url=_OPENROUTER_BASE_URL,
-            )
+            import openai  # type: ignore  # noqa: F401
+        except Exception as e:
+            return self._error(request, t0, f"openrouter_import_error:{repr(e)}")
 
-            resp = client.chat.completions.create(
-                model=request.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=temperature,
-                max_tokens=max_tokens,
-                extra_headers={
-                    # OpenRouter 권장 헤더 (optional)
-                    "HTTP-Referer": "https://github.com/multi-llm-answer-selection-ltr",
-                    "X-Title": "Multi-LLM Answer Selection",
-                },
-            )
+        try:
+            client = self._pool.aget(api_key)
+            resp = await client.chat.completions.create(**self._create_kwargs(request))
+            return self._to_result(request, resp, t0)
 
-            text = resp.choices[0].message.content or ""
-            latency_ms = int((time.time() - t0) * 1000)
-
-            tokens_in: Optional[int] = None
-            tokens_out: Optional[int] = None
-            try:
-                if resp.usage:
-                    tokens_in = int(getattr(resp.usage, "prompt_tokens", 0) or 0)
-                    tokens_out = int(getattr(resp.usage, "completion_tokens", 0) or 0)
-            except Exception:
-                pass
-
-            return EngineResult(
-                provider=self.provider_name(),
-                model=request.model,
-                answer_summary=text.strip(),
-                latency_ms=latency_ms,
-                tokens_in=tokens_in,
-                tokens_out=tokens_out,
-                error=None,
-            )
+        except Exception as e:
+            return self._error(request, t0, f"openrouter_call_error:{repr(e)}")
 
+    async def generate_stream(self, request: EngineRequest) -> AsyncIterator[StreamEvent]:
+        t0 = time.time()
+
+        api_key = os.getenv("OPENROUTER_API_KEY", "").strip()
+        if not api_key:
+            yield StreamEvent(result=self._error(request, t0, "missing_env:OPENROUTER_API_KEY"))
+            return
+
+        try:
+            import openai  # type: ignore  # noqa: F401
         except Exception as e:
-            return EngineResult(
-                provider=self.provider_name(),
-                model=request.model,
-                answer_summary="",
-                latency_ms=int((time.time() - t0) * 1000),
-                error=f"openrouter_call_error:{repr(e)}",
+            yield StreamEvent(result=self._error(request, t0, f"openrouter_import_error:{repr(e)}"))
+            return
+
+        parts: List[str] = []
+        usage: Any = None
+        try:
+            client = self._pool.aget(api_key)
+            stream = await client.chat.completions.create(
+                **self._create_kwargs(request),
+                stream=True,
+                stream_options={"include_usage": True},
             )
+            async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                if delta:
+                    parts.append(delta)
+                    yield StreamEvent(delta=delta)
+
+        except Exception as e:
+            yield StreamEvent(result=self._error(request, t0, f"openrouter_call_error:{repr(e)}"))
+            return
+
+        yield StreamEvent(result=self._result(request, t0, "".join(parts), usage))
@@ -0,0 +1,83 @@
+# apps/api/src/app/services/llm/latency.py
+from __future__ import annotations
+
+import os
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+
+class LatencyTracker:
+    """
+    provider/model 별 최근 성공 latency(ms)를 rolling window로 보관한다.
+    hedging 임계값 등 percentile 기반 판단에 사용 (process-wide, thread-safe).
+    """
+
+    def __init__(self, window: int = 200) -> None:
+        self.window = max(1, int(window))
+        self._samples: Dict[Tuple[str, str], Deque[int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, model: str, latency_ms: int) -> None:
+        key = (provider, model)
+        with self._lock:
+            dq = self._samples.get(key)
+            if dq is None:
+                dq = deque(maxlen=self.window)
+                self._samples[key] = dq
+            dq.append(int(latency_ms))
+
+    def percentile(self, provider: str, model: str, q: float, min_samples: int = 1) -> Optional[float]:
+        """
+        q in [0, 1]. 샘플이 min_samples 미만이면 None (판단 보류).
+        """
+        with self._lock:
+            dq = self._samples.get((provider, model))
+            if not dq or len(dq) < max(1, min_samples):
+                return None
+            ordered = sorted(dq)
+
+        idx = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+        return float(ordered[idx])
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._samples.items()]
+        out: Dict[str, dict] = {}
+        for (provider, model), values in items:
+            values.sort()
+            out[f"{provider}/{model}"] = {
+                "n": len(values),
+                "p50_ms": values[(len(values) - 1) // 2],
+                "p90_ms": values[int(round(0.9 * (len(values) - 1)))],
+            }
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+LATENCY = LatencyTracker(window=int(os.getenv("LLM_LATENCY_WINDOW", "200")))
+
+
+def adaptive_timeout_s(provider: str, model: str, static_timeout_s: float) -> float:
+    """
+    provider/model의 최근 latency 분위수(LLM_TIMEOUT_QUANTILE) × LLM_TIMEOUT_MULTIPLIER 로
+    timeout을 정한다. 정적 env timeout(OPENAI_TIMEOUT_S 등)은 상한으로만 쓴다.
+    - 샘플이 LLM_TIMEOUT_MIN_SAMPLES 미만이면 정적 timeout 그대로
+    - 하한 LLM_TIMEOUT_MIN_S (짧은 답변 몇 개로 timeout이 지나치게 줄어드는 것 방지)
+    """
+    if os.getenv("LLM_ADAPTIVE_TIMEOUT", "1").strip() != "1":
+        return float(static_timeout_s)
+
+    q = float(os.getenv("LLM_TIMEOUT_QUANTILE", "0.99"))
+    min_samples = int(os.getenv("LLM_TIMEOUT_MIN_SAMPLES", "20"))
+    p = LATENCY.percentile(provider, model, q, min_samples=min_samples)
+    if p is None:
+        return float(static_timeout_s)
+
+    multiplier = float(os.getenv("LLM_TIMEOUT_MULTIPLIER", "2.0"))
+    floor_s = float(os.getenv("LLM_TIMEOUT_MIN_S", "2.0"))
+    adaptive = max(floor_s, (p / 1000.0) * multiplier)
+    return min(float(static_timeout_s), adaptive)
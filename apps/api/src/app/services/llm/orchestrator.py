@@ -1,43 +1,561 @@
 # apps/api/src/app/services/llm/orchestrator.py
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import os
+import threading
 import time
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
 
+from src.app.services.llm.latency import LATENCY, adaptive_timeout_s
+from src.app.services.llm.rate_limit import estimate_tokens
 from src.app.services.llm.registry import EngineRegistry
-from src.app.services.llm.types import EngineRequest, EngineResult
+from src.app.services.llm.retry import RetryPolicy
+from src.app.services.llm.types import EngineRequest, EngineResult, StreamEvent
+
+# ---- bounded executor (process-wide) ----
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+# 요청별 재시도 루프(attempt 제출 → timeout 대기 → backoff)를 돌리는 스레드.
+# attempt 자체는 _EXECUTOR에서 실행되므로 같은 풀에 넣으면 풀이 가득 찼을 때 서로를 기다리며 막힌다.
+_RETRY_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    LLM 호출 전용 스레드풀 (lazy).
+    LLM_MAX_WORKERS 로 동시에 진행 가능한 provider 호출 수를 제한한다.
+    """
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                max_workers = int(os.getenv("LLM_MAX_WORKERS", "16"))
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=max(1, max_workers),
+                    thread_name_prefix="llm-engine",
+                )
+    return _EXECUTOR
+
+
+def _get_retry_executor() -> ThreadPoolExecutor:
+    """run_concurrent의 요청별 재시도 루프용 스레드풀 (lazy, 대부분 future 대기/backoff sleep)."""
+    global _RETRY_EXECUTOR
+    if _RETRY_EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _RETRY_EXECUTOR is None:
+                max_workers = int(os.getenv("LLM_MAX_WORKERS", "16"))
+                _RETRY_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=max(1, max_workers),
+                    thread_name_prefix="llm-retry",
+                )
+    return _RETRY_EXECUTOR
+
+
+def _error_result(req: EngineRequest, error: str, latency_ms: int = 0) -> EngineResult:
+    return EngineResult(
+        provider=req.provider,
+        model=req.model,
+        answer_summary="",
+        latency_ms=latency_ms,
+        error=error,
+        request_id=req.request_id,
+    )
+
+
+def _is_success(res: EngineResult) -> bool:
+    return (res.error is None) and (res.answer_summary.strip() != "")
+
+
+def _admit(registry: EngineRegistry, req: EngineRequest) -> Tuple[Optional[EngineResult], EngineRequest]:
+    """
+    호출 전 관문.
+    - 미등록 엔진 / deadline 초과 / circuit open 이면 (error result, req) 반환 → 호출하지 않는다 (µs 단위)
+    - 아니면 (None, req'): req'.timeout_s는 latency 분위수 기반 adaptive timeout (정적 값이 상한),
+      deadline_ts가 있으면 남은 시간으로 한 번 더 자른다
+    """
+    if registry.get(req.provider) is None:
+        return _error_result(req, f"engine_not_registered:{req.provider}"), req
+
+    timeout_s = adaptive_timeout_s(req.provider, req.model, float(req.timeout_s))
+    if req.deadline_ts is not None:
+        remaining = req.deadline_ts - time.time()
+        if remaining <= 0:
+            return _error_result(req, "deadline_exceeded"), req
+        timeout_s = min(timeout_s, remaining)
+
+    breaker = registry.breaker(req.provider, req.model)
+    if breaker is not None and not breaker.allow():
+        return _error_result(req, "circuit_open"), req
+
+    if timeout_s != req.timeout_s:
+        req = dataclasses.replace(req, timeout_s=timeout_s)
+    return None, req
+
+
+def _with_budget(req: EngineRequest) -> EngineRequest:
+    """
+    재시도 예산: deadline_ts가 없으면 첫 시도 시점 + 정적 timeout_s를 전체 예산으로 쓴다
+    (재시도가 정적 timeout보다 오래 걸리게 만들지 않음).
+    """
+    if req.deadline_ts is not None:
+        return req
+    return dataclasses.replace(req, deadline_ts=time.time() + float(req.timeout_s))
+
+
+def _keep_last(prev: Optional[EngineResult], res: EngineResult) -> EngineResult:
+    # 재시도가 deadline에 막히면 직전 시도의 실제 error를 남긴다
+    if prev is not None and res.error == "deadline_exceeded":
+        return prev
+    return res
+
+
+def _settle(registry: EngineRegistry, req: EngineRequest, res: EngineResult) -> EngineResult:
+    """
+    호출 결과를 circuit breaker에 반영한다 (error/timeout = 실패).
+    timeout은 "최소 이만큼 걸렸다"는 관측이므로 latency 샘플로도 남긴다
+    (성공 샘플만 쓰면 adaptive timeout이 점점 줄어드는 것을 방지).
+    """
+    breaker = registry.breaker(req.provider, req.model)
+    if breaker is not None:
+        if res.error is None:
+            breaker.record_success()
+        elif res.error == "rate_limited":
+            breaker.release()  # 로컬 큐 대기 초과: provider 상태와 무관
+        else:
+            breaker.record_failure()
+    if res.error == "timeout" and res.latency_ms > 0:
+        LATENCY.record(req.provider, req.model, res.latency_ms)
+    return res
+
+
+def _release(registry: EngineRegistry, req: EngineRequest) -> None:
+    # 결과 없이 cancel된 호출: half-open probe 슬롯만 반환
+    breaker = registry.breaker(req.provider, req.model)
+    if breaker is not None:
+        breaker.release()
+
+
+def _used_tokens(res: Optional[EngineResult]) -> Optional[int]:
+    if res is None or res.tokens_in is None or res.tokens_out is None:
+        return None
+    return int(res.tokens_in) + int(res.tokens_out)
+
+
+def _invoke(registry: EngineRegistry, req: EngineRequest) -> EngineResult:
+    engine = registry.get(req.provider)
+    if engine is None:
+        return _error_result(req, f"engine_not_registered:{req.provider}")
+
+    t0 = time.time()
+    # provider/model별 RPM/TPM/in-flight 제한: timeout_s 안에서 큐 대기, 넘기면 rate_limited
+    limiter = registry.limiter(req.provider, req.model)
+    est = estimate_tokens(req)
+    if not limiter.acquire(est, deadline=time.monotonic() + float(req.timeout_s)):
+        return _error_result(req, "rate_limited", latency_ms=int((time.time() - t0) * 1000))
+
+    res: Optional[EngineResult] = None
+    try:
+        res = engine.generate(req)
+    finally:
+        limiter.release(est, _used_tokens(res))
+    res.request_id = req.request_id
+    # if engine didn't set latency, keep its value; otherwise best-effort
+    if res.latency_ms <= 0:
+        res.latency_ms = int((time.time() - t0) * 1000)
+    # abandon된(timeout 이후 늦게 끝난) 호출의 성공 latency도 기록된다
+    if _is_success(res):
+        LATENCY.record(req.provider, req.model, res.latency_ms)
+    return res
+
+
+def _call_engine(registry: EngineRegistry, req: EngineRequest) -> EngineResult:
+    blocked, req = _admit(registry, req)
+    if blocked is not None:
+        return blocked
+
+    t0 = time.time()
+    try:
+        res = _invoke(registry, req)
+    except Exception as e:
+        res = _error_result(req, f"engine_exception:{repr(e)}", latency_ms=int((time.time() - t0) * 1000))
+    return _settle(registry, req, res)
+
+
+def _call_engine_timed(registry: EngineRegistry, req: EngineRequest) -> EngineResult:
+    """
+    1회 시도를 engine executor에서 실행하고 timeout_s(adaptive)를 여기서 강제한다.
+    timeout이면 EngineResult(error="timeout") — 실행 중인 스레드는 강제 종료할 수 없으므로 abandon.
+    """
+    blocked, req = _admit(registry, req)
+    if blocked is not None:
+        return blocked
+
+    t0 = time.time()
+    fut = _get_executor().submit(_invoke, registry, req)
+    try:
+        res = fut.result(timeout=float(req.timeout_s))
+    except FutureTimeoutError:
+        fut.cancel()  # 아직 시작 전이면 취소, 실행 중이면 abandon
+        res = _error_result(req, "timeout", latency_ms=int((time.time() - t0) * 1000))
+    except Exception as e:
+        res = _error_result(req, f"engine_exception:{repr(e)}", latency_ms=int((time.time() - t0) * 1000))
+    return _settle(registry, req, res)
+
+
+def _call_with_retry(
+    registry: EngineRegistry,
+    req: EngineRequest,
+    policy: RetryPolicy,
+    call: Callable[[EngineRegistry, EngineRequest], EngineResult] = _call_engine,
+) -> EngineResult:
+    req = _with_budget(req)
+    res: Optional[EngineResult] = None
+    attempt = 0
+    while True:
+        attempt += 1
+        res = _keep_last(res, call(registry, req))
+        delay = policy.next_delay(req, res, attempt)
+        if delay is None:
+            return res
+        time.sleep(delay)
 
 
 def run_sequential(registry: EngineRegistry, requests: List[EngineRequest]) -> List[EngineResult]:
     """
     Sequential execution (v0) with per-request timeout_s handled by engine-call level.
     Engines here are sync; timeout enforcement is best-effort (engine should respect).
+    일시적 오류(429/5xx/연결 끊김/timeout)는 deadline 안에서 backoff 재시도한다.
     """
-    results: List[EngineResult] = []
+    policy = RetryPolicy.from_env()
+    return [_call_with_retry(registry, req, policy) for req in requests]
 
-    for req in requests:
+
+def run_concurrent(registry: EngineRegistry, requests: List[EngineRequest]) -> List[EngineResult]:
+    """
+    Concurrent fan-out: 모든 EngineRequest를 동시에 bounded executor에 제출한다.
+    - 각 요청의 timeout_s는 orchestrator가 직접 강제한다 (engine을 신뢰하지 않음).
+      최근 latency 분위수 기반 adaptive timeout을 쓰고 정적 timeout_s는 상한으로만 쓴다.
+    - circuit open인 provider/model은 호출하지 않고 EngineResult(error="circuit_open").
+    - timeout된 엔진은 EngineResult(error="timeout")으로 반환하고 결과를 기다리지 않는다.
+      (실행 중인 스레드는 강제 종료할 수 없으므로 abandon 처리)
+    - 재시도는 요청마다 독립된 루프 (_acall_with_retry와 같은 구조): 빨리 실패한 요청은
+      다른 요청을 기다리지 않고 자기 backoff 후 바로 재시도한다 (deadline_ts 안에서만).
+    - 결과 순서는 requests 순서와 동일하다.
+    Wall-clock ≈ max(provider latency), not the sum.
+    """
+    if not requests:
+        return []
+
+    policy = RetryPolicy.from_env()
+    retry_executor = _get_retry_executor()
+    futs = [
+        retry_executor.submit(_call_with_retry, registry, req, policy, _call_engine_timed) for req in requests
+    ]
+    # 각 루프가 attempt timeout과 deadline_ts를 스스로 지키므로 여기서는 끝까지 기다린다
+    return [f.result() for f in futs]
+
+
+async def _acall_engine(registry: EngineRegistry, req: EngineRequest) -> EngineResult:
+    blocked, req = _admit(registry, req)
+    if blocked is not None:
+        return blocked
+    engine = registry.get(req.provider)
+
+    t0 = time.time()
+    deadline = time.monotonic() + float(req.timeout_s)
+    limiter = registry.limiter(req.provider, req.model)
+    est = estimate_tokens(req)
+    try:
+        acquired = await limiter.aacquire(est, deadline)
+    except asyncio.CancelledError:
+        _release(registry, req)
+        raise
+    if not acquired:
+        return _settle(registry, req, _error_result(req, "rate_limited", latency_ms=int((time.time() - t0) * 1000)))
+
+    res: Optional[EngineResult] = None
+    try:
+        # timeout_s는 큐 대기 시간을 포함한다
+        res = await asyncio.wait_for(engine.agenerate(req), timeout=max(0.0, deadline - time.monotonic()))
+    except asyncio.TimeoutError:
+        return _settle(registry, req, _error_result(req, "timeout", latency_ms=int((time.time() - t0) * 1000)))
+    except asyncio.CancelledError:
+        _release(registry, req)  # hedge straggler 등
+        raise
+    except Exception as e:
+        res = _error_result(req, f"engine_exception:{repr(e)}", latency_ms=int((time.time() - t0) * 1000))
+        return _settle(registry, req, res)
+    finally:
+        limiter.release(est, _used_tokens(res))
+
+    res.request_id = req.request_id
+    if res.latency_ms <= 0:
+        res.latency_ms = int((time.time() - t0) * 1000)
+    if _is_success(res):
+        LATENCY.record(req.provider, req.model, res.latency_ms)
+    return _settle(registry, req, res)
+
+
+async def _acall_with_retry(registry: EngineRegistry, req: EngineRequest, policy: RetryPolicy) -> EngineResult:
+    req = _with_budget(req)
+    res: Optional[EngineResult] = None
+    attempt = 0
+    while True:
+        attempt += 1
+        res = _keep_last(res, await _acall_engine(registry, req))
+        delay = policy.next_delay(req, res, attempt)
+        if delay is None:
+            return res
+        await asyncio.sleep(delay)
+
+
+async def arun_sequential(registry: EngineRegistry, requests: List[EngineRequest]) -> List[EngineResult]:
+    """run_sequential의 async 버전 (timeout_s는 asyncio.wait_for로 강제)."""
+    policy = RetryPolicy.from_env()
+    return [await _acall_with_retry(registry, req, policy) for req in requests]
+
+
+async def arun_concurrent(registry: EngineRegistry, requests: List[EngineRequest]) -> List[EngineResult]:
+    """
+    Native asyncio fan-out.
+    - 스레드를 점유하지 않으므로 worker 1개가 수백 개의 provider 호출을 동시에 기다릴 수 있다.
+    - timeout된 엔진은 task를 cancel 하고 EngineResult(error="timeout") 반환.
+    - 재시도 가능한 실패는 요청별로 backoff 재시도 (deadline_ts 안에서만).
+    - 결과 순서는 requests 순서와 동일하다.
+    """
+    if not requests:
+        return []
+    policy = RetryPolicy.from_env()
+    return list(await asyncio.gather(*(_acall_with_retry(registry, req, policy) for req in requests)))
+
+
+async def astream_concurrent(
+    registry: EngineRegistry,
+    requests: List[EngineRequest],
+) -> AsyncIterator[Tuple[int, StreamEvent]]:
+    """
+    모든 요청을 동시에 streaming 하고, 도착 순서대로 (request index, StreamEvent)를 내보낸다.
+    - 요청마다 마지막에 result 이벤트가 정확히 1번 온다 (timeout/예외도 result로 변환).
+    - timeout_s(adaptive)는 스트림 전체에 적용된다.
+    - 소비자가 중간에 멈추면 남은 스트림은 cancel 된다.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def _pump(idx: int, req: EngineRequest) -> None:
+        blocked, req = _admit(registry, req)
+        if blocked is not None:
+            await queue.put((idx, StreamEvent(result=blocked)))
+            return
         engine = registry.get(req.provider)
-        if engine is None:
-            results.append(
-                EngineResult(
-                    provider=req.provider,
-                    model=req.model,
-                    answer_summary="",
-                    latency_ms=0,
-                    error=f"engine_not_registered:{req.provider}",
-                )
-            )
-            continue
+        limiter = registry.limiter(req.provider, req.model)
+        est = estimate_tokens(req)
 
         t0 = time.time()
-        res = engine.generate(req)
-        # if engine didn't set latency, keep its value; otherwise best-effort
-        if res.latency_ms <= 0:
-            res.latency_ms = int((time.time() - t0) * 1000)
-        results.append(res)
+        deadline = time.monotonic() + float(req.timeout_s)
+        try:
+            acquired = await limiter.aacquire(est, deadline)
+        except asyncio.CancelledError:
+            _release(registry, req)
+            raise
+
+        final: Optional[EngineResult] = None
+        if not acquired:
+            final = _error_result(req, "rate_limited", latency_ms=int((time.time() - t0) * 1000))
+        else:
+            try:
+                # timeout_s는 rate limit 큐 대기 + 스트림 전체에 적용
+                async with asyncio.timeout(max(0.0, deadline - time.monotonic())):
+                    async for ev in engine.generate_stream(req):
+                        if ev.result is not None:
+                            final = ev.result
+                        elif ev.delta:
+                            await queue.put((idx, ev))
+            except TimeoutError:
+                final = _error_result(req, "timeout", latency_ms=int((time.time() - t0) * 1000))
+            except asyncio.CancelledError:
+                _release(registry, req)
+                raise
+            except Exception as e:
+                final = _error_result(req, f"engine_exception:{repr(e)}", latency_ms=int((time.time() - t0) * 1000))
+            finally:
+                limiter.release(est, _used_tokens(final))
+
+        if final is None:
+            final = _error_result(req, "stream_incomplete", latency_ms=int((time.time() - t0) * 1000))
+        final.request_id = req.request_id
+        if final.latency_ms <= 0:
+            final.latency_ms = int((time.time() - t0) * 1000)
+        if _is_success(final):
+            LATENCY.record(req.provider, req.model, final.latency_ms)
+        await queue.put((idx, StreamEvent(result=_settle(registry, req, final))))
+
+    tasks = [asyncio.ensure_future(_pump(i, req)) for i, req in enumerate(requests)]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            idx, ev = await queue.get()
+            if ev.result is not None:
+                remaining -= 1
+            yield idx, ev
+    finally:
+        for t in tasks:
+            t.cancel()
+
+
+def _clone_request(req: EngineRequest) -> EngineRequest:
+    # hedge용 복제: 같은 provider/model/request_id (같은 논리 요청의 중복 발사)
+    return dataclasses.replace(req, params_json=dict(req.params_json or {}))
+
+
+async def arun_hedged(
+    registry: EngineRegistry,
+    requests: List[EngineRequest],
+    *,
+    k: int = 2,
+    hedge_quantile: Optional[float] = None,
+    max_hedges: Optional[int] = None,
+) -> List[EngineResult]:
+    """
+    First-k-of-n hedged execution.
+    - 모든 요청을 동시에 시작하고, 성공 결과가 k개 모이는 즉시 반환한다.
+      남은 task(straggler)는 cancel 한다.
+    - time hedge: 요청이 provider/model의 최근 latency 분위수(LLM_HEDGE_QUANTILE)를
+      넘도록 끝나지 않으면 같은 provider로 복제 요청을 1회 추가 발사한다.
+    - failure hedge: 실패로 인해 k개를 채울 수 없게 되면 이미 성공한 provider로
+      복제 요청을 보내 빈 fallback 후보가 서빙되지 않도록 한다.
+    반환: 성공 결과(완료 순) + 실패 결과. 취소된 straggler는 포함하지 않는다.
+    """
+    if not requests:
+        return []
+
+    if hedge_quantile is None:
+        hedge_quantile = float(os.getenv("LLM_HEDGE_QUANTILE", "0.9"))
+    if max_hedges is None:
+        max_hedges = int(os.getenv("LLM_MAX_HEDGES", str(len(requests))))
+    min_samples = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    # time hedge 임계값(초): 샘플이 부족하면 None (time hedge 안 함)
+    hedge_after: Dict[str, Optional[float]] = {}
+    for req in requests:
+        p = LATENCY.percentile(req.provider, req.model, hedge_quantile, min_samples=min_samples)
+        hedge_after[req.request_id] = (p / 1000.0) if p is not None else None
+
+    tasks: Dict[asyncio.Task, EngineRequest] = {}
+    hedged: Set[str] = set()
+    hedges_left = max(0, max_hedges)
+
+    successes: List[EngineResult] = []
+    failures: List[EngineResult] = []
+
+    def _launch(req: EngineRequest) -> None:
+        tasks[asyncio.ensure_future(_acall_engine(registry, req))] = req
+
+    for req in requests:
+        _launch(req)
+
+    try:
+        while tasks and len(successes) < k:
+            now = loop.time()
+            pending_thresholds = [
+                start + t
+                for t in (hedge_after.get(r.request_id) for r in tasks.values() if r.request_id not in hedged)
+                if t is not None
+            ]
+            wait_timeout = None
+            if hedges_left > 0 and pending_thresholds:
+                wait_timeout = max(0.0, min(pending_thresholds) - now)
+
+            done, _ = await asyncio.wait(
+                list(tasks.keys()),
+                timeout=wait_timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+            for t in done:
+                req = tasks.pop(t)
+                res = t.result()
+                if _is_success(res):
+                    successes.append(res)
+                else:
+                    failures.append(res)
+
+            if len(successes) >= k:
+                break
+
+            # failure hedge: 남은 task로 k개를 채울 수 없으면 성공한 provider로 복제
+            while hedges_left > 0 and successes and len(successes) + len(tasks) < k:
+                donor = next((r for r in requests if r.provider == successes[0].provider), None)
+                if donor is None:
+                    break
+                _launch(_clone_request(donor))
+                hedges_left -= 1
+
+            # time hedge: 분위수 임계값을 넘긴 원본 요청을 같은 provider로 복제
+            now = loop.time()
+            for req in list(tasks.values()):
+                if hedges_left <= 0:
+                    break
+                t_after = hedge_after.get(req.request_id)
+                if req.request_id in hedged or t_after is None:
+                    continue
+                if now - start >= t_after:
+                    hedged.add(req.request_id)
+                    _launch(_clone_request(req))
+                    hedges_left -= 1
+
+    finally:
+        # stragglers: cancel (await 하지 않고 abandon)
+        for t in tasks:
+            t.cancel()
+
+    return successes + failures
+
+
+async def _arun_hedged_on_own_loop(registry: EngineRegistry, requests: List[EngineRequest]) -> List[EngineResult]:
+    # asyncio.run 이 끝나면 loop가 닫히므로 이 loop에서 만든 pooled async client를 먼저 닫는다
+    try:
+        return await arun_hedged(registry, requests)
+    finally:
+        await registry.arelease_loop()
+
+
+ORCHESTRATION_MODES = ("sequential", "concurrent", "hedged")
+
+
+def run_requests(
+    registry: EngineRegistry,
+    requests: List[EngineRequest],
+    mode: str = "concurrent",
+) -> List[EngineResult]:
+    """mode 문자열로 실행 전략을 선택한다 (알 수 없는 값이면 concurrent)."""
+    if mode == "sequential":
+        return run_sequential(registry, requests)
+    if mode == "hedged":
+        # sync 호출자(스크립트 등)용: 호출마다 새 event loop에서 실행
+        # (pooled async client는 loop별이라 이전 호출의 닫힌 loop를 재사용하지 않는다)
+        return asyncio.run(_arun_hedged_on_own_loop(registry, requests))
+    return run_concurrent(registry, requests)
+
 
-    return results
+async def arun_requests(
+    registry: EngineRegistry,
+    requests: List[EngineRequest],
+    mode: str = "concurrent",
+) -> List[EngineResult]:
+    """run_requests의 async 버전."""
+    if mode == "sequential":
+        return await arun_sequential(registry, requests)
+    if mode == "hedged":
+        return await arun_hedged(registry, requests)
+    return await arun_concurrent(registry, requests)
 
 
 def any_success(results: List[EngineResult]) -> bool:
-    return any((r.error is None) and (r.answer_summary.strip() != "") for r in results)
+    return any(_is_success(r) for r in results)
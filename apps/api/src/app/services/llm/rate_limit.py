@@ -0,0 +1,234 @@
+# apps/api/src/app/services/llm/rate_limit.py
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from src.app.services.llm.types import EngineRequest
+
+# in-flight 슬롯 대기 시 polling 간격 (token bucket 대기는 정확한 refill 시각까지 잔다)
+_POLL_S = 0.05
+
+
+class TokenBucket:
+    """
+    분당 rate_per_min 만큼 채워지는 token bucket (lock은 호출자가 잡는다).
+    capacity = 1분치 quota (provider 쿼터 창과 동일하게 burst 허용).
+    """
+
+    def __init__(self, rate_per_min: float) -> None:
+        self.capacity = float(rate_per_min)
+        self.rate_per_s = float(rate_per_min) / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate_per_s)
+        self.updated = now
+
+    def wait_s(self, n: float, now: float) -> float:
+        """n개를 꺼내려면 기다려야 하는 시간 (0이면 지금 가능)."""
+        self._refill(now)
+        n = min(n, self.capacity)
+        if self.tokens >= n:
+            return 0.0
+        return (n - self.tokens) / self.rate_per_s
+
+    def take(self, n: float) -> None:
+        self.tokens -= min(n, self.capacity)
+
+    def adjust(self, n: float) -> None:
+        # 실제 사용량 보정 (음수면 환급). 음수 잔량 허용 → 다음 호출이 그만큼 대기
+        self.tokens = min(self.capacity, self.tokens - n)
+
+
+class RateLimiter:
+    """
+    provider/model 단위 outbound 제한 (thread-safe, sync/async 공용).
+    - rpm: 분당 요청 수 token bucket
+    - tpm: 분당 토큰 수 token bucket (prompt 길이/4 + max_tokens로 추정, 응답 후 보정)
+    - max_inflight: 동시에 진행 중인 호출 수 상한
+    0 이하 값은 해당 제한 없음.
+    호출자는 deadline까지 큐에서 기다리고, 넘기면 acquire가 False를 반환한다.
+    """
+
+    def __init__(self, rpm: float = 0, tpm: float = 0, max_inflight: int = 0) -> None:
+        self.rpm = TokenBucket(rpm) if rpm > 0 else None
+        self.tpm = TokenBucket(tpm) if tpm > 0 else None
+        self.max_inflight = int(max_inflight)
+
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._inflight = 0
+
+        # metrics
+        self._queued = 0
+        self._max_queued = 0
+        self._acquired = 0
+        self._waited = 0
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+        self._rejected = 0
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rpm is None and self.tpm is None and self.max_inflight <= 0
+
+    def _try(self, tokens: float) -> Tuple[float, bool]:
+        """
+        lock 안에서 호출. (0, _)이면 슬롯/토큰 확보 완료.
+        아니면 (대기 시간(초), exact): exact=True면 token refill까지 확정 대기 시간,
+        False면 in-flight 슬롯 대기 (언제 풀릴지 모름).
+        """
+        now = time.monotonic()
+        if self.max_inflight > 0 and self._inflight >= self.max_inflight:
+            return _POLL_S, False
+        wait = 0.0
+        if self.rpm is not None:
+            wait = max(wait, self.rpm.wait_s(1, now))
+        if self.tpm is not None:
+            wait = max(wait, self.tpm.wait_s(tokens, now))
+        if wait > 0:
+            return wait, True
+        if self.rpm is not None:
+            self.rpm.take(1)
+        if self.tpm is not None:
+            self.tpm.take(tokens)
+        self._inflight += 1
+        return 0.0, True
+
+    def _enqueue(self) -> None:
+        self._queued += 1
+        self._max_queued = max(self._max_queued, self._queued)
+
+    def _dequeue(self, ok: bool, waited_s: float) -> None:
+        self._queued -= 1
+        if not ok:
+            self._rejected += 1
+            return
+        self._acquired += 1
+        if waited_s > 0:
+            ms = waited_s * 1000.0
+            self._waited += 1
+            self._wait_ms_total += ms
+            self._wait_ms_max = max(self._wait_ms_max, ms)
+
+    def acquire(self, tokens: float, deadline: float) -> bool:
+        """blocking acquire. deadline은 time.monotonic() 기준."""
+        if self.unlimited:
+            return True
+        t0 = time.monotonic()
+        slept = False
+        with self._cond:
+            self._enqueue()
+            while True:
+                wait, exact = self._try(tokens)
+                if wait <= 0:
+                    self._dequeue(True, (time.monotonic() - t0) if slept else 0.0)
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or (exact and wait > remaining):
+                    self._dequeue(False, 0.0)
+                    return False
+                self._cond.wait(timeout=min(wait, remaining))
+                slept = True
+
+    async def aacquire(self, tokens: float, deadline: float) -> bool:
+        """acquire의 async 버전 (event loop를 막지 않고 sleep으로 대기)."""
+        if self.unlimited:
+            return True
+        t0 = time.monotonic()
+        slept = False
+        with self._lock:
+            self._enqueue()
+        try:
+            while True:
+                with self._lock:
+                    wait, exact = self._try(tokens)
+                    if wait <= 0:
+                        self._dequeue(True, (time.monotonic() - t0) if slept else 0.0)
+                        return True
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or (exact and wait > remaining):
+                        self._dequeue(False, 0.0)
+                        return False
+                await asyncio.sleep(min(wait, remaining))
+                slept = True
+        except asyncio.CancelledError:
+            with self._lock:
+                self._dequeue(False, 0.0)
+            raise
+
+    def release(self, estimated_tokens: float = 0, actual_tokens: Optional[int] = None) -> None:
+        """in-flight 슬롯 반환 + 실제 토큰 사용량으로 TPM 보정."""
+        if self.unlimited:
+            return
+        with self._cond:
+            self._inflight = max(0, self._inflight - 1)
+            if self.tpm is not None and actual_tokens is not None:
+                self.tpm.adjust(float(actual_tokens) - min(estimated_tokens, self.tpm.capacity))
+            self._cond.notify_all()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "inflight": self._inflight,
+                "queue_depth": self._queued,
+                "max_queue_depth": self._max_queued,
+                "acquired": self._acquired,
+                "waited": self._waited,
+                "avg_wait_ms": round(self._wait_ms_total / self._waited, 1) if self._waited else 0.0,
+                "max_wait_ms": round(self._wait_ms_max, 1),
+                "rejected": self._rejected,
+            }
+
+
+def estimate_tokens(req: EngineRequest) -> int:
+    """TPM 사전 차감용 추정치: prompt 문자수/4 + max_tokens."""
+    params = req.params_json or {}
+    prompt_chars = len(str(params.get("_system_prompt", ""))) + len(str(params.get("_user_prompt", "")))
+    return prompt_chars // 4 + int(params.get("max_tokens", 512))
+
+
+class LimiterBoard:
+    """
+    (provider, model) → RateLimiter.
+    설정은 provider 단위 env: {PROVIDER}_RPM, {PROVIDER}_TPM, {PROVIDER}_MAX_INFLIGHT
+    (예: OPENROUTER_RPM=20). 같은 provider의 model마다 별도 bucket을 갖는다.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._limiters: Dict[Tuple[str, str], RateLimiter] = {}
+
+    @staticmethod
+    def _config(provider: str) -> Tuple[float, float, int]:
+        prefix = provider.strip().upper()
+        rpm = float(os.getenv(f"{prefix}_RPM", "0") or 0)
+        tpm = float(os.getenv(f"{prefix}_TPM", "0") or 0)
+        max_inflight = int(os.getenv(f"{prefix}_MAX_INFLIGHT", "0") or 0)
+        return rpm, tpm, max_inflight
+
+    def get(self, provider: str, model: str) -> RateLimiter:
+        key = (provider, model)
+        lim = self._limiters.get(key)
+        if lim is None:
+            with self._lock:
+                lim = self._limiters.get(key)
+                if lim is None:
+                    rpm, tpm, max_inflight = self._config(provider)
+                    lim = RateLimiter(rpm=rpm, tpm=tpm, max_inflight=max_inflight)
+                    self._limiters[key] = lim
+        return lim
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            items = list(self._limiters.items())
+        return {
+            f"{provider}/{model}": lim.snapshot()
+            for (provider, model), lim in items
+            if not lim.unlimited
+        }
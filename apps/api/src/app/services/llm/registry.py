@@ -6,6 +6,8 @@ from dataclasses import dataclass, field
 from typing import Dict, Optional
 
 from src.app.services.llm.base import LLMEngine
+from src.app.services.llm.breaker import BreakerBoard, CircuitBreaker
+from src.app.services.llm.rate_limit import LimiterBoard, RateLimiter
 from src.app.services.llm.engines.dummy_openai import DummyOpenAIEngine
 from src.app.services.llm.engines.dummy_gemini import DummyGeminiEngine
 from src.app.services.llm.engines.dummy_openrouter import DummyOpenRouterEngine
@@ -30,6 +32,10 @@ except Exception:
 @dataclass
 class EngineRegistry:
     engines: Dict[str, LLMEngine] = field(default_factory=dict)
+    # provider/model별 circuit breaker (orchestrator가 호출 전후로 사용)
+    breakers: BreakerBoard = field(default_factory=BreakerBoard)
+    # provider/model별 outbound RPM/TPM/in-flight 제한
+    limiters: LimiterBoard = field(default_factory=LimiterBoard)
 
     def register(self, engine: LLMEngine) -> None:
         self.engines[engine.provider_name()] = engine
@@ -37,14 +43,54 @@ class EngineRegistry:
     def get(self, provider: str) -> Optional[LLMEngine]:
         return self.engines.get(provider)
 
+    def breaker(self, provider: str, model: str) -> Optional[CircuitBreaker]:
+        """LLM_BREAKER_ENABLED=0 이면 None."""
+        return self.breakers.get(provider, model)
+
+    def limiter(self, provider: str, model: str) -> RateLimiter:
+        """{PROVIDER}_RPM / _TPM / _MAX_INFLIGHT 미설정이면 무제한 limiter."""
+        return self.limiters.get(provider, model)
+
+    def close(self) -> None:
+        for engine in self.engines.values():
+            try:
+                engine.close()
+            except Exception:
+                pass
+
+    async def aclose(self) -> None:
+        for engine in self.engines.values():
+            try:
+                await engine.aclose()
+            except Exception:
+                pass
+
+    async def arelease_loop(self) -> None:
+        for engine in self.engines.values():
+            try:
+                await engine.arelease_loop()
+            except Exception:
+                pass
+
 
 _DEFAULT_REGISTRY: Optional[EngineRegistry] = None
 
 
 def reset_registry() -> None:
-    """서버 재시작 없이 registry를 초기화할 때 사용 (테스트/핫리로드용)."""
+    """서버 재시작 없이 registry를 초기화할 때 사용 (테스트/핫리로드용).
+    엔진이 들고 있는 pooled client(keep-alive connection)도 함께 닫는다."""
+    global _DEFAULT_REGISTRY
+    reg, _DEFAULT_REGISTRY = _DEFAULT_REGISTRY, None
+    if reg is not None:
+        reg.close()
+
+
+async def areset_registry() -> None:
+    """reset_registry의 async 버전 (shutdown hook 등 event loop 안에서 사용)."""
     global _DEFAULT_REGISTRY
-    _DEFAULT_REGISTRY = None
+    reg, _DEFAULT_REGISTRY = _DEFAULT_REGISTRY, None
+    if reg is not None:
+        await reg.aclose()
 
 
 def build_default_registry() -> EngineRegistry:
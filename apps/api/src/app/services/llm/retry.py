@@ -0,0 +1,72 @@
+# apps/api/src/app/services/llm/retry.py
+from __future__ import annotations
+
+import os
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from src.app.services.llm.types import EngineRequest, EngineResult
+
+# 엔진 error 문자열(…_call_error:repr(e)) 중 재시도할 만한 일시적 오류
+# - 429 / rate limit / quota, 5xx, 연결 끊김, provider 측 timeout
+_RETRYABLE = re.compile(
+    r"(\b429\b|\b50[0234]\b|ratelimit|rate limit|resourceexhausted|too many requests"
+    r"|internalservererror|serviceunavailable|badgateway|gatewaytimeout|overloaded"
+    r"|apiconnectionerror|apitimeouterror|connecterror|readtimeout|remoteprotocolerror"
+    r"|connection reset|connection aborted|deadlineexceeded|temporarily unavailable)",
+    re.IGNORECASE,
+)
+
+# orchestrator가 만드는 error 중 재시도 대상 (adaptive timeout 초과 → 남은 예산으로 재시도)
+_RETRYABLE_EXACT = {"timeout"}
+
+
+def is_retryable(res: EngineResult) -> bool:
+    err = res.error
+    if err is None:
+        return False
+    if err in _RETRYABLE_EXACT:
+        return True
+    return bool(_RETRYABLE.search(err))
+
+
+@dataclass
+class RetryPolicy:
+    """
+    exponential backoff + full jitter.
+    max_attempts는 첫 시도를 포함한 총 시도 수.
+    재시도는 요청의 deadline_ts 안에 (backoff + min_attempt_s)가 들어갈 때만 한다.
+    """
+
+    max_attempts: int = 3
+    base_s: float = 0.25
+    max_backoff_s: float = 4.0
+    min_attempt_s: float = 1.0
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        return cls(
+            max_attempts=max(1, int(os.getenv("LLM_RETRY_MAX_ATTEMPTS", "3"))),
+            base_s=float(os.getenv("LLM_RETRY_BASE_S", "0.25")),
+            max_backoff_s=float(os.getenv("LLM_RETRY_MAX_BACKOFF_S", "4")),
+            min_attempt_s=float(os.getenv("LLM_RETRY_MIN_ATTEMPT_S", "1.0")),
+        )
+
+    def backoff_s(self, attempt: int) -> float:
+        """attempt: 방금 실패한 시도 번호 (1부터)."""
+        cap = min(self.max_backoff_s, self.base_s * (2 ** (attempt - 1)))
+        return random.uniform(0.0, cap)
+
+    def next_delay(self, req: EngineRequest, res: EngineResult, attempt: int) -> Optional[float]:
+        """재시도하면 대기할 시간(초), 재시도하지 않으면 None."""
+        if attempt >= self.max_attempts or not is_retryable(res):
+            return None
+        delay = self.backoff_s(attempt)
+        if req.deadline_ts is not None:
+            remaining = req.deadline_ts - time.time()
+            if remaining < delay + self.min_attempt_s:
+                return None
+        return delay
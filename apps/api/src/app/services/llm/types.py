@@ -23,6 +23,8 @@ class EngineRequest:
     # runtime config
     params_json: Optional[Dict[str, Any]] = None
     timeout_s: float = 20.0
+    # /ask 전체 SLA 기준 절대 시각 (time.time()). 재시도/timeout은 이 시각을 넘지 않는다
+    deadline_ts: Optional[float] = None
 
 
 @dataclass
@@ -34,3 +36,19 @@ class EngineResult:
     tokens_in: Optional[int] = None
     tokens_out: Optional[int] = None
     error: Optional[str] = None
+
+    # orchestrator가 채움: 어떤 EngineRequest의 결과인지 (hedge 복제도 원본 id 유지)
+    request_id: Optional[str] = None
+    # 캐시 hit 출처 ("memory" | "db"), provider 호출 결과면 None
+    cache: Optional[str] = None
+
+
+@dataclass
+class StreamEvent:
+    """
+    generate_stream 출력 단위.
+    - delta: 새로 도착한 텍스트 조각
+    - result: 스트림 마지막 이벤트에만 채워짐 (전체 answer/tokens/error)
+    """
+    delta: str = ""
+    result: Optional[EngineResult] = None
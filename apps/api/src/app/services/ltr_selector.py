@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
+from typing import List, Sequence, Tuple
+
 import joblib
 import numpy as np
 from pathlib import Path
@@ -13,31 +17,79 @@ FEATURES = [
     "has_warning_diff",
 ]
 
+# ---- model handle cache (process-wide) ----
+# key: (resolved path, mtime_ns, size) → 파일이 덮어써지면 자동으로 다시 로드
+_HANDLE_CACHE_MAX = 8
+_HANDLE_CACHE: "OrderedDict[Tuple[str, int, int], object]" = OrderedDict()
+_HANDLE_LOCK = threading.Lock()
+
+
+def _load_handle(model_path: str) -> object:
+    p = Path(model_path).resolve()
+    st = p.stat()
+    key = (str(p), st.st_mtime_ns, st.st_size)
+
+    with _HANDLE_LOCK:
+        model = _HANDLE_CACHE.get(key)
+        if model is not None:
+            _HANDLE_CACHE.move_to_end(key)
+            return model
+
+    model = joblib.load(p)
+
+    with _HANDLE_LOCK:
+        # 같은 경로의 이전 버전 handle은 제거
+        for k in [k for k in _HANDLE_CACHE if k[0] == key[0]]:
+            del _HANDLE_CACHE[k]
+        _HANDLE_CACHE[key] = model
+        while len(_HANDLE_CACHE) > _HANDLE_CACHE_MAX:
+            _HANDLE_CACHE.popitem(last=False)
+    return model
+
 
 def _featurize(a: dict, b: dict) -> np.ndarray:
+    return _featurize_pairs([(a, b)])
+
+
+def _featurize_pairs(pairs: Sequence[Tuple[dict, dict]]) -> np.ndarray:
+    """(a, b) dict 쌍 목록 → m x 5 diff matrix (A - B)."""
     return np.array(
-        [[
-            a["len_words"] - b["len_words"],
-            int(a["has_code"]) - int(b["has_code"]),
-            int(a["step_score"]) - int(b["step_score"]),
-            int(a["has_bullets"]) - int(b["has_bullets"]),
-            int(a["has_warning"]) - int(b["has_warning"]),
-        ]],
+        [
+            [
+                a["len_words"] - b["len_words"],
+                int(a["has_code"]) - int(b["has_code"]),
+                int(a["step_score"]) - int(b["step_score"]),
+                int(a["has_bullets"]) - int(b["has_bullets"]),
+                int(a["has_warning"]) - int(b["has_warning"]),
+            ]
+            for a, b in pairs
+        ],
         dtype=float,
-    )
+    ).reshape(-1, len(FEATURES))
 
 
-def pick_winner_with_model(model_path: str, a: dict, b: dict) -> str:
+def pick_winners(model_path: str, pairs: Sequence[Tuple[dict, dict]]) -> List[str]:
     """
-    return: "a" or "b"
+    batch 버전: pairs 전체를 한 matrix로 만들어 모델을 1번만 호출한다.
+    return: pair마다 "a" 또는 "b"
     """
-    model = joblib.load(Path(model_path))
-    X = _featurize(a, b)
+    if not pairs:
+        return []
+
+    model = _load_handle(model_path)
+    X = _featurize_pairs(pairs)
 
     # predict_proba 있으면 1클래스(=a 승) 확률 사용
     if hasattr(model, "predict_proba"):
-        p = model.predict_proba(X)[0][1]
-        return "a" if p >= 0.5 else "b"
+        p = model.predict_proba(X)[:, 1]
+        return ["a" if v >= 0.5 else "b" for v in p]
+
+    pred = model.predict(X)
+    return ["a" if int(v) == 1 else "b" for v in pred]
+
 
-    pred = model.predict(X)[0]
-    return "a" if int(pred) == 1 else "b"
+def pick_winner_with_model(model_path: str, a: dict, b: dict) -> str:
+    """
+    return: "a" or "b"
+    """
+    return pick_winners(model_path, [(a, b)])[0]
@@ -1,8 +1,19 @@
 from __future__ import annotations
 
+import os
+import select
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
 from sqlalchemy import text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
+# register_model.py 가 모델 등록 시 pg_notify 하는 채널
+MODEL_CHANNEL = "ltr_model_changed"
+
 
 def get_latest_model(db: Session) -> dict | None:
     row = db.execute(
@@ -17,3 +28,195 @@ def get_latest_model(db: Session) -> dict | None:
     ).mappings().first()
 
     return dict(row) if row else None
+
+
+class ActiveModelResolver:
+    """
+    최신 LTR 모델 레코드(get_latest_model 결과)를 process 메모리에 캐시한다.
+    - request path: 캐시만 읽는다 (registry 쿼리 0회). 캐시가 비어 있을 때만 1회 조회
+    - 갱신: Postgres LISTEN ltr_model_changed (register_model.py의 pg_notify) 수신 시
+      background 스레드가 다시 조회한다
+    - LISTEN을 쓸 수 없으면(psycopg2 아님 등) LTR_MODEL_POLL_S 간격 polling으로 대체
+    - TTL(LTR_MODEL_CACHE_TTL_S)은 listener/poller가 멈췄을 때의 안전장치
+    - invalidate()로 명시적으로 비울 수 있다
+    - on_change 콜백(모델 로드 등)은 request path에서 실행하지 않는다: get()이 만료된 캐시를
+      갱신하다 변경을 발견하면 콜백은 별도 스레드(ltr-model-change)로 넘긴다
+    """
+
+    def __init__(self) -> None:
+        self.ttl_s = float(os.getenv("LTR_MODEL_CACHE_TTL_S", "3600"))
+        self.poll_s = float(os.getenv("LTR_MODEL_POLL_S", "30"))
+
+        self._lock = threading.Lock()
+        self._record: Optional[dict] = None
+        self._loaded_at = 0.0
+        self._loaded = False
+
+        self._engine: Optional[Engine] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.mode = "lazy"  # "listen" | "poll" | "lazy"
+        self._callbacks: List[Callable[[Optional[dict]], None]] = []
+        self._notify_executor: Optional[ThreadPoolExecutor] = None
+
+        self._counters = {"hits": 0, "loads": 0, "notifications": 0}
+
+    # ---- request path ----
+
+    def _fresh(self) -> bool:
+        # background 갱신이 없으면(lazy: 스크립트 등) poll 간격을 TTL로 쓴다
+        ttl = self.ttl_s if self.mode in ("listen", "poll") else self.poll_s
+        return self._loaded and (time.monotonic() - self._loaded_at) < ttl
+
+    def get(self, db: Session) -> Optional[dict]:
+        """캐시된 최신 모델 레코드 (없으면 None). 캐시가 비었거나 만료됐을 때만 db 조회."""
+        with self._lock:
+            if self._fresh():
+                self._counters["hits"] += 1
+                return self._record
+        # 콜백(MODEL_CACHE.activate = artifact 로드)은 요청 스레드를 붙잡지 않도록 background로
+        return self._store(get_latest_model(db), inline=False)
+
+    def active_version(self, db: Session) -> Optional[str]:
+        rec = self.get(db)
+        return rec["model_version"] if rec else None
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded = False
+            self._record = None
+
+    def on_change(self, cb: Callable[[Optional[dict]], None]) -> None:
+        """활성 모델 레코드가 바뀌면 (background 스레드에서) 호출된다."""
+        self._callbacks.append(cb)
+
+    def _store(self, rec: Optional[dict], inline: bool = True) -> Optional[dict]:
+        """
+        캐시 갱신 후, 모델 버전이 바뀌었으면 on_change 콜백 호출.
+        inline=True: 호출 스레드(listener/poller)에서 바로 실행
+        inline=False: request path(get) → 단일 worker 스레드로 넘기고 바로 반환
+        """
+        with self._lock:
+            prev = self._record
+            self._record = rec
+            self._loaded = True
+            self._loaded_at = time.monotonic()
+            self._counters["loads"] += 1
+
+        prev_mv = prev["model_version"] if prev else None
+        new_mv = rec["model_version"] if rec else None
+        if prev_mv != new_mv and self._callbacks:
+            if inline:
+                self._notify(rec)
+            else:
+                self._get_notify_executor().submit(self._notify, rec)
+        return rec
+
+    def _notify(self, rec: Optional[dict]) -> None:
+        for cb in list(self._callbacks):
+            try:
+                cb(rec)
+            except Exception as e:
+                print(f"[LTR] model change callback failed: {e!r}")
+
+    def _get_notify_executor(self) -> ThreadPoolExecutor:
+        # worker 1개: 연속된 변경이 순서대로 적용되도록 (마지막 레코드가 최종 serving)
+        with self._lock:
+            if self._notify_executor is None:
+                self._notify_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ltr-model-change")
+            return self._notify_executor
+
+    # ---- background refresh ----
+
+    def refresh(self) -> Optional[dict]:
+        """background용: 자체 connection으로 조회해 캐시를 갱신한다."""
+        if self._engine is None:
+            return None
+        with Session(self._engine) as db:
+            return self._store(get_latest_model(db))
+
+    def start(self, engine: Engine) -> None:
+        """listener(가능하면) 또는 poller 스레드 시작. 여러 번 호출해도 1개만 뜬다."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._engine = engine
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ltr-model-resolver", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        t, self._thread = self._thread, None
+        if t is not None:
+            t.join(timeout=2.0)
+        self.mode = "lazy"
+
+    def _run(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"[LTR] initial model resolve failed: {e!r}")
+
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception as e:
+                if self.mode == "listen":
+                    # 한 번 동작했던 listener가 끊김 (DB 재시작 등) → 잠시 후 재연결
+                    print(f"[LTR] LISTEN {MODEL_CHANNEL} connection lost, reconnecting: {e!r}")
+                    self._stop.wait(self.poll_s)
+                    continue
+                print(f"[LTR] LISTEN {MODEL_CHANNEL} unavailable, polling every {self.poll_s}s: {e!r}")
+                self._poll_until_stopped()
+                return
+
+    def _listen(self) -> None:
+        raw: Any = self._engine.raw_connection()  # type: ignore[union-attr]
+        try:
+            conn = raw.driver_connection
+            if not hasattr(conn, "poll") or not hasattr(conn, "notifies"):
+                raise RuntimeError("driver does not support LISTEN/NOTIFY (psycopg2 required)")
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {MODEL_CHANNEL};")
+            self.mode = "listen"
+
+            # LISTEN 시작 전에 등록된 모델을 놓치지 않도록 한 번 더 조회
+            self.refresh()
+
+            while not self._stop.is_set():
+                # poll_s 마다 깨어나 stop 확인 + TTL 안전장치 갱신
+                ready, _, _ = select.select([conn], [], [], self.poll_s)
+                if not ready:
+                    if not self._fresh():
+                        self.refresh()
+                    continue
+                conn.poll()
+                if conn.notifies:
+                    self._counters["notifications"] += len(conn.notifies)
+                    conn.notifies.clear()
+                    self.refresh()
+        finally:
+            # LISTEN/autocommit 상태의 connection은 pool로 돌려보내지 않고 버린다
+            try:
+                raw.invalidate()
+            except Exception:
+                pass
+
+    def _poll_until_stopped(self) -> None:
+        self.mode = "poll"
+        while not self._stop.wait(self.poll_s):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[LTR] model poll failed: {e!r}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            out: dict = dict(self._counters)
+            out["model_version"] = self._record["model_version"] if self._record else None
+        out["mode"] = self.mode
+        return out
+
+
+ACTIVE_MODEL = ActiveModelResolver()
@@ -0,0 +1,137 @@
+# apps/api/src/app/services/predict_memo.py
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+# fv1 diff: [len_words, has_code, step_score, has_bullets, has_warning]
+# 0번(len_words)만 범위가 넓고 나머지 4개는 -1/0/1 → 3^4 = 81 조합
+_N_SMALL = 4
+_SMALL_COMBOS = 3 ** _N_SMALL
+_SMALL_RADIX = 3 ** np.arange(_N_SMALL - 1, -1, -1)
+
+
+def memo_enabled() -> bool:
+    return os.getenv("LTR_PREDICT_MEMO", "1").strip() == "1"
+
+
+class MemoizedModel:
+    """
+    pairwise 모델(predict_proba) 앞에 두는 예측 memo (model_version 1개당 1개, thread-safe).
+    fv1 diff는 전부 정수라서 diff 벡터 자체를 key로 써도 손실이 없다.
+    - LUT: 로드 시 |len_words diff| <= LTR_PREDICT_LUT_LEN, 나머지 diff ∈ {-1,0,1} 인 모든 조합을
+      한 번에 predict 해 dense 배열로 보관 → 대부분의 pair가 배열 index 1번
+    - memo: LUT 범위 밖 정수 diff는 bounded dict (LTR_PREDICT_MEMO_MAX, 오래된 것부터 제거)
+    - 정수가 아닌 row(다른 feature 경로)는 그대로 모델 호출
+    miss는 모아서 한 번의 batched predict_proba로 계산한다.
+    ranker가 기대하는 predict_proba / classes_ 인터페이스만 노출한다.
+    """
+
+    def __init__(
+        self,
+        model_version: str,
+        model: object,
+        lut_len: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        self.model_version = model_version
+        self.model = model
+        self.classes_ = getattr(model, "classes_", np.asarray([0, 1]))
+        self.lut_len = int(lut_len if lut_len is not None else os.getenv("LTR_PREDICT_LUT_LEN", "256"))
+        self.max_entries = int(max_entries if max_entries is not None else os.getenv("LTR_PREDICT_MEMO_MAX", "100000"))
+
+        self._lock = threading.Lock()
+        self._memo: "OrderedDict[bytes, float]" = OrderedDict()
+        self._counters = {"lut_hits": 0, "memo_hits": 0, "misses": 0, "bypass": 0, "model_calls": 0}
+
+        self._lut: Optional[np.ndarray] = None
+        if self.lut_len > 0:
+            self._lut = self._build_lut()
+
+    @property
+    def n_features_in_(self) -> int:
+        return 1 + _N_SMALL
+
+    def _p1(self, X: np.ndarray) -> np.ndarray:
+        with self._lock:
+            self._counters["model_calls"] += 1
+        return np.asarray(self.model.predict_proba(X)[:, 1], dtype=float)
+
+    def _build_lut(self) -> np.ndarray:
+        L = self.lut_len
+        lens = np.arange(-L, L + 1, dtype=float)
+        small = np.array(np.meshgrid(*([[-1.0, 0.0, 1.0]] * _N_SMALL), indexing="ij")).reshape(_N_SMALL, -1).T
+        grid = np.column_stack([np.repeat(lens, _SMALL_COMBOS), np.tile(small, (lens.shape[0], 1))])
+        # row index = (len + L) * 81 + base3(small + 1)  (_lut_index와 동일한 순서)
+        return self._p1(grid)
+
+    def _lut_index(self, Xi: np.ndarray) -> np.ndarray:
+        return (Xi[:, 0] + self.lut_len) * _SMALL_COMBOS + (Xi[:, 1:] + 1) @ _SMALL_RADIX
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=float)
+        m = X.shape[0]
+        p = np.empty(m, dtype=float)
+        done = np.zeros(m, dtype=bool)
+
+        Xi = np.rint(X).astype(np.int64)
+        exact = np.all(Xi == X, axis=1) if X.shape[1] == 1 + _N_SMALL else np.zeros(m, dtype=bool)
+
+        n_lut = 0
+        if self._lut is not None:
+            in_lut = exact & (np.abs(Xi[:, 0]) <= self.lut_len) & np.all(np.abs(Xi[:, 1:]) <= 1, axis=1)
+            if in_lut.any():
+                p[in_lut] = self._lut[self._lut_index(Xi[in_lut])]
+                done |= in_lut
+                n_lut = int(in_lut.sum())
+
+        # LUT 밖 정수 row → memo, 그 외 → 모델
+        rest = np.nonzero(~done)[0]
+        miss_rows: Dict[bytes, list] = {}
+        n_memo = n_bypass = 0
+        with self._lock:
+            for r in rest:
+                if not exact[r]:
+                    n_bypass += 1
+                    continue
+                key = Xi[r].tobytes()
+                v = self._memo.get(key)
+                if v is None:
+                    miss_rows.setdefault(key, []).append(r)
+                else:
+                    p[r] = v
+                    n_memo += 1
+
+        bypass_idx = rest[~exact[rest]]
+        if miss_rows or bypass_idx.size:
+            miss_first = [rows[0] for rows in miss_rows.values()]
+            calc_idx = np.concatenate([np.asarray(miss_first, dtype=int), bypass_idx]).astype(int)
+            vals = self._p1(X[calc_idx])
+            p[bypass_idx] = vals[len(miss_first):]
+            with self._lock:
+                for (key, rows), v in zip(miss_rows.items(), vals[: len(miss_first)]):
+                    p[rows] = v
+                    self._memo[key] = float(v)
+                while len(self._memo) > self.max_entries:
+                    self._memo.popitem(last=False)
+
+        with self._lock:
+            self._counters["lut_hits"] += n_lut
+            self._counters["memo_hits"] += n_memo
+            self._counters["misses"] += sum(len(rows) for rows in miss_rows.values())
+            self._counters["bypass"] += n_bypass
+
+        return np.column_stack([1.0 - p, p])
+
+    def stats(self) -> dict:
+        with self._lock:
+            out: dict = dict(self._counters)
+            out["memo_entries"] = len(self._memo)
+        lookups = out["lut_hits"] + out["memo_hits"] + out["misses"] + out["bypass"]
+        out["lut_size"] = 0 if self._lut is None else int(self._lut.shape[0])
+        out["hit_rate"] = (out["lut_hits"] + out["memo_hits"]) / lookups if lookups else None
+        return out
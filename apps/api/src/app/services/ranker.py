@@ -3,20 +3,22 @@ from __future__ import annotations
 
 import os
 import json
-from typing import Optional, Tuple, List
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, List
 from pathlib import Path
 
-import joblib
 import numpy as np
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from src.app.db.models import Candidate
-
-# ---- cache (process-wide) ----
-_MODEL_CACHE: dict[str, object] = {}
-_META_CACHE: dict[str, dict] = {}
-_ACTIVE_VERSION_CACHE: Optional[str] = None
+from src.app.services.feature_store import FEATURE_STORE
+from src.app.services.features import FV1, FeatureMatrix, FeatureVersion, SparseRows, get_feature_version
+from src.app.services.model_registry import ACTIVE_MODEL
+from src.app.services.predict_memo import MemoizedModel, memo_enabled
+from src.app.services.scoring import LinearScorer, load_scorer, scoring_path_for
 
 
 def _project_root() -> Path:
@@ -28,42 +30,277 @@ def _project_root() -> Path:
     return Path(__file__).resolve().parents[3]
 
 
-def _load_model(artifact_path: str):
+def _resolve_path(path: str) -> Path:
+    p = Path(path)
+    if not p.is_absolute():
+        p = _project_root() / p
+    return p
+
+
+def _load_model(artifact_path: str, metrics: Optional[dict] = None):
     """
     artifact_path can be:
     - absolute path
     - relative path (recommended: artifacts/models/xxx.pkl)
     We resolve relative path from apps/api (project root for api app).
+
+    1) scoring artifact (linear, json): metrics_json.scoring_artifact_path 또는 xxx.scoring.json
+       → LinearScorer (sklearn/joblib import 없음, unpickle 없음)
+    2) 없으면 joblib pickle fallback (비선형 모델 등)
     """
-    p = Path(artifact_path)
+    metrics = metrics or {}
+    if os.getenv("LTR_USE_SCORING_ARTIFACT", "1").strip() == "1":
+        scoring_path = metrics.get("scoring_artifact_path") or scoring_path_for(artifact_path)
+        sp = _resolve_path(scoring_path)
+        if sp.exists():
+            scorer = load_scorer(sp)
+            get_feature_version(scorer.feature_version)  # 등록되지 않은 버전이면 ValueError
+            return scorer
 
-    if not p.is_absolute():
-        p = _project_root() / p
+    p = _resolve_path(artifact_path)
 
     if not p.exists():
         raise FileNotFoundError(f"Model artifact not found: {str(p)}")
 
+    import joblib  # lazy: scoring artifact가 있으면 sklearn stack을 로드하지 않는다
+
     return joblib.load(str(p))
 
 
-def _get_active_model_version(db: Session) -> Optional[str]:
+def _artifact_nbytes(model: object, artifact_path: str, metrics: dict) -> int:
+    # LRU byte cap용 크기 추정: 실제로 로드한 artifact 파일 크기
+    if isinstance(model, LinearScorer):
+        path = metrics.get("scoring_artifact_path") or scoring_path_for(artifact_path)
+    else:
+        path = artifact_path
+    try:
+        return _resolve_path(path).stat().st_size
+    except OSError:
+        return 0
+
+
+class ModelCache:
+    """
+    model_version → (model, meta) LRU 캐시 (process-wide, thread-safe).
+    - 버전별 load lock: 같은 버전을 여러 요청이 동시에 miss 해도 로드는 1번
+    - LTR_MODEL_CACHE_MAX(개수) / LTR_MODEL_CACHE_MAX_BYTES(artifact 크기 합, 0=무제한) 초과 시
+      오래 안 쓴 버전부터 evict (serving 중인 버전, pinned 버전은 제외)
+    - serving_version: activate()가 로드를 끝낸 뒤에만 바뀐다 → 새 버전 로드 중에도
+      요청은 이전 버전으로 서빙 (request path에서 로드하지 않음)
+    - 비선형 모델은 로드 시 MemoizedModel(LUT + bounded memo)로 감싸 둔다
+    """
+
+    def __init__(self, max_models: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        self.max_models = max(1, int(max_models if max_models is not None else os.getenv("LTR_MODEL_CACHE_MAX", "4")))
+        self.max_bytes = int(max_bytes if max_bytes is not None else os.getenv("LTR_MODEL_CACHE_MAX_BYTES", "0"))
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[object, dict, int]]" = OrderedDict()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self.serving_version: Optional[str] = None
+        self.pinned: set = set()  # traffic split arm 등 evict 하지 않을 버전
+
+        self._counters = {"hits": 0, "loads": 0, "evictions": 0}
+
+    def get(self, mv: str) -> Optional[Tuple[object, dict]]:
+        with self._lock:
+            entry = self._entries.get(mv)
+            if entry is None:
+                return None
+            self._entries.move_to_end(mv)
+            self._counters["hits"] += 1
+            return entry[0], entry[1]
+
+    def load(self, mv: str, artifact_path: str, metrics_json: dict | str | None) -> Tuple[object, dict]:
+        """캐시에 없으면 로드 (버전별 lock으로 중복 로드 방지)."""
+        hit = self.get(mv)
+        if hit is not None:
+            return hit
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(mv, threading.Lock())
+
+        with load_lock:
+            hit = self.get(mv)  # 기다리는 동안 다른 스레드가 로드했을 수 있음
+            if hit is not None:
+                return hit
+
+            meta = _parse_metrics(metrics_json)
+            model = _load_model(artifact_path, meta)
+            nbytes = _artifact_nbytes(model, artifact_path, meta)
+
+            # pairwise 호출이 필요한 (비선형) fv1 모델은 예측 memo/LUT로 감싼다 (linear는 w·x라 불필요)
+            if (
+                memo_enabled()
+                and _linear_weights(model) is None
+                and hasattr(model, "predict_proba")
+                and _model_feature_version(model, meta) is FV1
+            ):
+                model = MemoizedModel(mv, model)
+
+            with self._lock:
+                self._entries[mv] = (model, meta, nbytes)
+                self._entries.move_to_end(mv)
+                self._counters["loads"] += 1
+                self._evict_locked()
+                self._load_locks.pop(mv, None)
+            return model, meta
+
+    def _evict_locked(self) -> None:
+        def _over() -> bool:
+            if len(self._entries) > self.max_models:
+                return True
+            if self.max_bytes > 0:
+                return sum(e[2] for e in self._entries.values()) > self.max_bytes
+            return False
+
+        for mv in list(self._entries.keys()):  # oldest first
+            if not _over():
+                break
+            if mv == self.serving_version or mv in self.pinned or len(self._entries) == 1:
+                continue
+            del self._entries[mv]
+            self._counters["evictions"] += 1
+
+    def activate(self, rec: Optional[dict]) -> None:
+        """
+        새 활성 모델 레코드(model_registry.get_latest_model 형식)를 로드한 뒤
+        serving_version을 원자적으로 교체한다. ACTIVE_MODEL.on_change 콜백으로 사용.
+        """
+        if not rec:
+            return
+        mv = rec["model_version"]
+        self.load(mv, rec["artifact_path"], rec.get("metrics_json"))
+        self.serving_version = mv
+        print(f"[LTR] serving model_version={mv}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            out: dict = dict(self._counters)
+            out["versions"] = list(self._entries.keys())
+            out["bytes"] = sum(e[2] for e in self._entries.values())
+            memos = {mv: e[0] for mv, e in self._entries.items() if isinstance(e[0], MemoizedModel)}
+        out["serving_version"] = self.serving_version
+        # 버전별 예측 memo hit rate (LUT / dict / miss)
+        out["predict_memo"] = {mv: m.stats() for mv, m in memos.items()}
+        return out
+
+
+MODEL_CACHE = ModelCache()
+
+
+class TrafficSplit:
+    """
+    A/B serving: LTR_TRAFFIC_SPLIT="mv_a:90,mv_b:10" (model_version:weight, weight 생략 시 1).
+    - question_id의 stable hash(sha256)로 arm을 고른다 → 같은 질문은 재시도/재시작에도 같은 arm
+    - 설정이 있으면 ACTIVE_MODEL_VERSION / 최신 모델보다 우선한다
+    - 모든 arm을 같은 feature matrix로 함께 평가해 arm 간 선택 일치율을 집계한다 (stats)
+    """
+
+    def __init__(self, spec: Optional[str] = None) -> None:
+        spec = os.getenv("LTR_TRAFFIC_SPLIT", "") if spec is None else spec
+        self.arms: List[Tuple[str, int]] = []
+        for part in spec.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            mv, _, w = part.partition(":")
+            weight = int(w) if w.strip() else 1
+            if weight > 0:
+                self.arms.append((mv.strip(), weight))
+        self.total = sum(w for _, w in self.arms)
+
+        self._lock = threading.Lock()
+        self._routed: Dict[str, int] = {mv: 0 for mv, _ in self.arms}
+        self._agree: Dict[str, int] = {mv: 0 for mv, _ in self.arms}
+
+    @property
+    def enabled(self) -> bool:
+        return self.total > 0
+
+    @property
+    def versions(self) -> List[str]:
+        return [mv for mv, _ in self.arms]
+
+    def route(self, question_id: object) -> str:
+        h = int.from_bytes(hashlib.sha256(str(question_id).encode("utf-8")).digest()[:8], "big")
+        bucket = h % self.total
+        for mv, w in self.arms:
+            if bucket < w:
+                return mv
+            bucket -= w
+        return self.arms[-1][0]
+
+    def record(self, routed: str, choices: Dict[str, int]) -> None:
+        """routed arm과 각 arm의 선택(best index)이 같은지 집계."""
+        with self._lock:
+            self._routed[routed] = self._routed.get(routed, 0) + 1
+            served = choices.get(routed)
+            for mv, idx in choices.items():
+                if mv != routed and idx == served:
+                    self._agree[mv] = self._agree.get(mv, 0) + 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            n = sum(self._routed.values())
+            return {
+                "arms": {mv: w for mv, w in self.arms},
+                "routed": dict(self._routed),
+                # 다른 arm으로 서빙된 질문에서 이 arm의 선택이 서빙된 선택과 같았던 비율
+                "agreement": {
+                    mv: (self._agree.get(mv, 0) / (n - self._routed.get(mv, 0)) if n > self._routed.get(mv, 0) else None)
+                    for mv in self.versions
+                },
+            }
+
+
+TRAFFIC_SPLIT = TrafficSplit()
+
+
+def preload_active_model(db: Session) -> Optional[str]:
+    """
+    startup용: 새 활성 모델이 등록되면 background(ACTIVE_MODEL 스레드)에서 로드/교체하도록
+    콜백을 걸고, 현재 활성 모델을 지금 로드한다 (첫 요청이 로드 비용을 내지 않도록).
+    """
+    ACTIVE_MODEL.on_change(MODEL_CACHE.activate)
+
+    # traffic split arm은 모두 상주 (request path에서 로드하지 않도록, evict 대상 아님)
+    for arm in TRAFFIC_SPLIT.versions:
+        rec = _get_model_record(db, arm)
+        if not rec:
+            print(f"[LTR] traffic split arm not found in models: {arm}")
+            continue
+        MODEL_CACHE.pinned.add(arm)
+        MODEL_CACHE.load(arm, rec[0], rec[1])
+
+    env_ver = os.getenv("ACTIVE_MODEL_VERSION", "").strip()
+    if env_ver:
+        rec = _get_model_record(db, env_ver)
+        if not rec:
+            return None
+        # ENV로 고정된 버전은 serving_version이 아니어도 항상 서빙되므로 evict 대상에서 제외
+        MODEL_CACHE.pinned.add(env_ver)
+        MODEL_CACHE.load(env_ver, rec[0], rec[1])
+        return env_ver
+
+    rec = ACTIVE_MODEL.get(db)  # on_change 콜백은 background로 넘어가므로 startup에서는 직접 로드
+    if rec and MODEL_CACHE.serving_version != rec["model_version"]:
+        MODEL_CACHE.activate(rec)
+    return MODEL_CACHE.serving_version
+
+
+def get_active_model_version(db: Session) -> Optional[str]:
     # Option A: ENV pinned
     env_ver = os.getenv("ACTIVE_MODEL_VERSION", "").strip()
     if env_ver:
         return env_ver
 
-    # Option B: newest in DB
-    row = db.execute(
-        text(
-            """
-            select model_version
-            from models
-            order by trained_at desc
-            limit 1
-            """
-        )
-    ).fetchone()
-    return row[0] if row else None
+    # Option B: 로드가 끝난 serving 버전 (background hot-swap)
+    if MODEL_CACHE.serving_version:
+        return MODEL_CACHE.serving_version
+
+    # Option C: newest in DB (ACTIVE_MODEL 캐시; LISTEN/NOTIFY 또는 polling으로 갱신)
+    return ACTIVE_MODEL.active_version(db)
 
 
 def _get_model_record(db: Session, model_version: str) -> Optional[tuple[str, dict | str]]:
@@ -96,106 +333,339 @@ def _parse_metrics(metrics_json: dict | str | None) -> dict:
     return {}
 
 
-def _features_fv1(c: Candidate) -> np.ndarray:
-    """
-    fv1 features (same order as training):
-    [len_words, has_code, step_score, has_bullets, has_warning]
-    """
-    return np.array(
-        [
-            float(c.len_words),
-            float(int(bool(c.has_code))),
-            float(c.step_score),
-            float(int(bool(c.has_bullets))),
-            float(int(bool(c.has_warning))),
-        ],
-        dtype=float,
-    )
+def _model_feature_version(model: object, meta: Optional[dict] = None) -> FeatureVersion:
+    """모델이 학습된 feature version (scoring artifact → metrics_json → fv1)."""
+    v = getattr(model, "feature_version", None) or (meta or {}).get("feature_version") or FV1.version
+    return get_feature_version(str(v))
 
 
-def _pairwise_diff(a: Candidate, b: Candidate) -> np.ndarray:
-    # model was trained on diff = A - B
-    return _features_fv1(a) - _features_fv1(b)
+def _pairwise_diffs(X: np.ndarray) -> np.ndarray:
+    """
+    모든 ordered pair (i, j), i != j 의 diff = X[i] - X[j] 를 broadcasting으로 생성.
+    shape: (n*(n-1), d), i-major 순서 (row i*(n-1) + k 는 i 대 (i를 뺀) k번째 상대).
+    """
+    n = X.shape[0]
+    diffs = X[:, None, :] - X[None, :, :]  # (n, n, d)
+    mask = ~np.eye(n, dtype=bool)
+    return diffs[mask]
 
 
-def _predict_win_prob(model: object, x: np.ndarray) -> float:
+def _predict_win_probs(model: object, X: np.ndarray) -> np.ndarray:
     """
-    Return P(y=1) (A wins) for 1xN feature vector.
+    Return P(y=1) (A wins) for each row of an m x N diff matrix (single batched call).
     - prefer predict_proba
     - fallback to decision_function or predict
     """
     # 1) predict_proba
     if hasattr(model, "predict_proba"):
-        proba = model.predict_proba(x)
-        return float(proba[0, 1])
+        proba = model.predict_proba(X)
+        return np.asarray(proba[:, 1], dtype=float)
 
     # 2) decision_function -> sigmoid-ish fallback
     if hasattr(model, "decision_function"):
-        score = float(model.decision_function(x)[0])
-        return float(1.0 / (1.0 + np.exp(-score)))
+        score = np.asarray(model.decision_function(X), dtype=float).reshape(-1)
+        return 1.0 / (1.0 + np.exp(-score))
 
     # 3) predict -> treat as hard label
     if hasattr(model, "predict"):
-        y = int(model.predict(x)[0])
-        return 1.0 if y == 1 else 0.0
+        y = np.asarray(model.predict(X)).reshape(-1)
+        return (y == 1).astype(float)
 
     raise TypeError("Model does not support predict_proba/decision_function/predict.")
 
 
-def ltr_choose_best(
-    db: Session,
-    candidates: List[Candidate],
-) -> Tuple[Optional[Candidate], Optional[str], Optional[str]]:
+def _linear_weights(model: object) -> Optional[np.ndarray]:
     """
-    Returns: (best_candidate, model_version, error_message)
+    binary linear model (coef_ 1 x d, classes_ == [0, 1])이면 w 반환, 아니면 None.
+    P(A wins) = sigmoid(w·(a-b) + b0) 는 w·a 에 대해 단조 증가이므로
+    tournament 평균 승률의 argmax == argmax(X @ w) (동점 처리까지 동일).
+    """
+    coef = getattr(model, "coef_", None)
+    if coef is None:
+        return None
+    coef = np.asarray(coef, dtype=float)
+    if coef.ndim != 2 or coef.shape[0] != 1:
+        return None
+    classes = getattr(model, "classes_", None)
+    if classes is not None and [int(c) for c in classes] != [0, 1]:
+        return None
+    return coef[0]
 
-    - If no model available -> (None, None, "no_model")
-    - If no candidates -> (None, mv, "no_candidates")
-    - If failure -> (None, mv, "error: ...")
+
+def _tournament_scores(model: object, X: np.ndarray) -> np.ndarray:
     """
-    mv = _get_active_model_version(db)
-    if not mv:
-        return None, None, "no_model"
+    후보별 점수 (argmax가 best).
+    - linear model: w·x (O(n), 모델 호출 없음)
+    - 그 외: 다른 후보 대비 평균 승률, 모든 pair를 한 번의 batched 호출로 계산
+    """
+    w = _linear_weights(model)
+    if w is not None and w.shape[0] == X.shape[1]:
+        return X @ w  # SparseRows도 같은 식 (행별 sparse dot)
+    if isinstance(X, SparseRows):
+        raise TypeError("sparse features need a linear scoring model")
+
+    n = X.shape[0]
+    p = _predict_win_probs(model, _pairwise_diffs(X))
+    return p.reshape(n, n - 1).mean(axis=1)
 
-    global _ACTIVE_VERSION_CACHE, _MODEL_CACHE, _META_CACHE
 
+def set_win_probs(model: object, mats: List[np.ndarray]) -> List[np.ndarray]:
+    """
+    후보 set 여러 개의 후보별 평균 승률 (tournament score).
+    모든 set의 pairwise diff를 이어 붙여 모델을 1번만 호출한 뒤 set별로 다시 나눈다.
+    후보가 1개인 set은 [1.0], 0개인 set은 빈 배열.
+    sparse(SparseRows) set은 linear 모델만: s = X @ w 로 P(i > j) = sigmoid(s_i - s_j + b) 를 바로 계산
+    (n x n_features diff 행렬을 만들지 않음).
+    """
+    if any(isinstance(X, SparseRows) for X in mats):
+        return _linear_set_win_probs(model, mats)
+
+    diffs = [_pairwise_diffs(X) for X in mats if X.shape[0] > 1]
+    p = _predict_win_probs(model, np.vstack(diffs)) if diffs else np.empty(0, dtype=float)
+
+    out: List[np.ndarray] = []
+    offset = 0
+    for X in mats:
+        n = X.shape[0]
+        if n <= 1:
+            out.append(np.ones(n, dtype=float))
+            continue
+        m = n * (n - 1)
+        out.append(p[offset:offset + m].reshape(n, n - 1).mean(axis=1))
+        offset += m
+    return out
+
+
+def _linear_set_win_probs(model: object, mats: List[FeatureMatrix]) -> List[np.ndarray]:
+    w = _linear_weights(model)
+    if w is None:
+        raise TypeError("sparse features need a linear scoring model")
+    b = float(np.asarray(getattr(model, "intercept_", [0.0]), dtype=float).reshape(-1)[0])
+
+    out: List[np.ndarray] = []
+    for X in mats:
+        n = X.shape[0]
+        if n <= 1:
+            out.append(np.ones(n, dtype=float))
+            continue
+        s = X @ w
+        P = 1.0 / (1.0 + np.exp(-(s[:, None] - s[None, :] + b)))
+        np.fill_diagonal(P, 0.0)
+        out.append(P.sum(axis=1) / (n - 1))
+    return out
+
+
+def _get_entry(db: Session, mv: str) -> Optional[Tuple[object, dict]]:
+    hit = MODEL_CACHE.get(mv)
+    if hit is None:
+        rec = _get_model_record(db, mv)
+        if not rec:
+            return None
+        hit = MODEL_CACHE.load(mv, rec[0], rec[1])
+    return hit
+
+
+def get_model(db: Session, mv: str) -> Tuple[Optional[object], Optional[str]]:
+    """
+    model_version → (model, error). MODEL_CACHE hit이면 db 조회 없음.
+    보통은 startup preload / background hot-swap으로 이미 로드되어 있다.
+    miss(cold start, env pin 변경, 이전 버전 지정 등)일 때만 여기서 로드 (버전별 lock)
+    """
+    hit = _get_entry(db, mv)
+    if hit is None:
+        return None, "model_not_found_in_db"
+    return hit[0], None
+
+
+def get_model_feature_version(db: Session, mv: str) -> FeatureVersion:
+    """mv 모델의 feature version. 모델이 없거나 로드 실패면 fv1 (오류 보고는 scoring 쪽에서)."""
     try:
-        # Reload if:
-        # - first load
-        # - active version changed
-        # - cache miss
-        if mv != _ACTIVE_VERSION_CACHE or mv not in _MODEL_CACHE:
-            rec = _get_model_record(db, mv)
-            if not rec:
+        hit = _get_entry(db, mv)
+    except Exception:
+        return FV1
+    return FV1 if hit is None else _model_feature_version(*hit)
+
+
+def _serving_version(db: Session, question_id: object = None) -> Optional[str]:
+    """이번 요청을 서빙할 model_version (split이면 question_id로 라우팅된 arm, 아니면 활성 모델)."""
+    if TRAFFIC_SPLIT.enabled and question_id is not None:
+        return TRAFFIC_SPLIT.route(question_id)
+    return get_active_model_version(db)
+
+
+def _multi_tournament_scores(models: Dict[str, object], X: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    여러 모델의 후보별 점수를 같은 feature matrix X로 한 번에 계산.
+    - linear model들: weight를 열로 쌓아 X @ W 1회 (d x K)
+    - 그 외: pairwise diff는 1번만 만들고 모델별로 batched 호출
+    """
+    out: Dict[str, np.ndarray] = {}
+    linear: List[Tuple[str, np.ndarray]] = []
+    others: List[Tuple[str, object]] = []
+    for mv, model in models.items():
+        w = _linear_weights(model)
+        if w is not None and w.shape[0] == X.shape[1]:
+            linear.append((mv, w))
+        else:
+            others.append((mv, model))
+
+    if linear:
+        S = X @ np.column_stack([w for _, w in linear])
+        for k, (mv, _) in enumerate(linear):
+            out[mv] = S[:, k]
+
+    if others:
+        if isinstance(X, SparseRows):
+            raise TypeError("sparse features need a linear scoring model")
+        n = X.shape[0]
+        D = _pairwise_diffs(X)
+        for mv, model in others:
+            out[mv] = _predict_win_probs(model, D).reshape(n, n - 1).mean(axis=1)
+    return out
+
+
+def _split_best_index(
+    db: Session,
+    X: np.ndarray,
+    question_id: object,
+) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+    """
+    traffic split: 모든 arm을 X 하나로 평가하고, question_id로 라우팅된 arm의 선택을 반환.
+    X는 라우팅된 arm의 feature version 이므로 다른 version으로 학습된 arm은 비교에서 뺀다.
+    """
+    mv = TRAFFIC_SPLIT.route(question_id)
+    fv = get_model_feature_version(db, mv)
+    models: Dict[str, object] = {}
+    for arm in TRAFFIC_SPLIT.versions:
+        hit = _get_entry(db, arm)
+        if hit is None:
+            if arm == mv:
                 return None, mv, "model_not_found_in_db"
+            continue  # 다른 arm의 문제로 서빙을 막지 않는다
+        if _model_feature_version(*hit) is not fv:
+            continue
+        models[arm] = hit[0]
+
+    choices = {arm: int(np.argmax(sc)) for arm, sc in _multi_tournament_scores(models, X).items()}
+    TRAFFIC_SPLIT.record(mv, choices)
+    return choices[mv], mv, None
+
+
+def ltr_best_index(
+    db: Session,
+    X: FeatureMatrix,
+    question_id: object = None,
+) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+    """
+    서빙 모델의 feature version 행렬 (n x d, 후보 순서대로; sparse면 SparseRows) 기준 best 후보 index.
+    Returns: (best_index, model_version, error_message) — 오류 규칙은 ltr_choose_best와 동일.
+    ORM 객체가 필요 없으므로 세션 밖(shadow worker 등)에서 미리 뽑아 둔 feature로도 쓸 수 있다.
+    LTR_TRAFFIC_SPLIT 이 설정되어 있고 question_id가 주어지면 split arm으로 서빙한다.
+    """
+    if TRAFFIC_SPLIT.enabled and question_id is not None:
+        arm = TRAFFIC_SPLIT.route(question_id)
+        if X.shape[0] == 0:
+            return None, arm, "no_candidates"
+        if X.shape[0] == 1:
+            return 0, arm, None
+        try:
+            return _split_best_index(db, X, question_id)
+        except Exception as e:
+            return None, arm, f"error: {e}"
 
-            artifact_path, metrics_json = rec
-            _MODEL_CACHE[mv] = _load_model(artifact_path)
-            _META_CACHE[mv] = _parse_metrics(metrics_json)
-            _ACTIVE_VERSION_CACHE = mv
+    mv = get_active_model_version(db)
+    if not mv:
+        return None, None, "no_model"
 
-        model = _MODEL_CACHE[mv]
+    try:
+        model, err = get_model(db, mv)
+        if err:
+            return None, mv, err
 
-        n = len(candidates)
+        n = X.shape[0]
         if n == 0:
             return None, mv, "no_candidates"
         if n == 1:
-            return candidates[0], mv, None  # only one -> trivially best
+            return 0, mv, None  # only one -> trivially best
 
         # tournament scoring:
         # score each candidate by average win probability vs others
-        probs: List[float] = []
-        for i, a in enumerate(candidates):
-            p_list: List[float] = []
-            for j, b in enumerate(candidates):
-                if i == j:
-                    continue
-                x = _pairwise_diff(a, b).reshape(1, -1)
-                p_list.append(_predict_win_prob(model, x))
-            probs.append(float(sum(p_list) / max(1, len(p_list))))
-
-        best_idx = int(np.argmax(probs))
-        return candidates[best_idx], mv, None
+        # (pairwise diff broadcasting + batched 호출, linear면 w·x)
+        scores = _tournament_scores(model, X)
+        return int(np.argmax(scores)), mv, None
+
+    except Exception as e:
+        return None, mv, f"error: {e}"
 
+
+def ltr_lead(
+    db: Session,
+    X: np.ndarray,
+    question_id: object = None,
+) -> Tuple[Optional[int], Optional[float], Optional[str], Optional[str]]:
+    """
+    streaming 중간 판단용: (현재 1위 index, 1위가 2위를 이길 확률, model_version, error).
+    - 모델 선택은 ltr_best_index와 같다 (split이면 question_id로 라우팅된 arm, 집계는 하지 않음)
+    - 확률은 모델의 pairwise P(1위 > 2위) 1회 호출 → linear / 비선형 모델 모두 같은 척도
+    후보가 1개면 확률 1.0. X는 streaming accumulator의 fv1 이므로 다른 version 모델이면 오류.
+    """
+    mv = _serving_version(db, question_id)
+    if not mv:
+        return None, None, None, "no_model"
+
+    n = X.shape[0]
+    if n == 0:
+        return None, None, mv, "no_candidates"
+    if n == 1:
+        return 0, 1.0, mv, None
+
+    try:
+        model, err = get_model(db, mv)
+        if err:
+            return None, None, mv, err
+        fv = get_model_feature_version(db, mv)
+        if fv is not FV1:
+            return None, None, mv, f"unsupported_feature_version: {fv.version}"
+        order = np.argsort(-_tournament_scores(model, X), kind="stable")
+        top, runner_up = int(order[0]), int(order[1])
+        p = float(_predict_win_probs(model, (X[top] - X[runner_up])[None, :])[0])
+        return top, p, mv, None
+    except Exception as e:
+        return None, None, mv, f"error: {e}"
+
+
+def ltr_best_index_for_ids(
+    db: Session,
+    candidate_ids: List[object],
+    question_id: object = None,
+) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+    """
+    저장된 후보 id 기준 ltr_best_index. 서빙 모델의 feature version으로
+    feature store(in-process LRU → candidate_features 일괄 조회)에서 행렬을 가져온다.
+    """
+    mv = _serving_version(db, question_id)
+    fv = get_model_feature_version(db, mv) if mv else FV1
+    try:
+        X = FEATURE_STORE.matrix(db, candidate_ids, fv)
     except Exception as e:
         return None, mv, f"error: {e}"
+    return ltr_best_index(db, X, question_id)
+
+
+def ltr_choose_best(
+    db: Session,
+    candidates: List[Candidate],
+    question_id: object = None,
+) -> Tuple[Optional[Candidate], Optional[str], Optional[str]]:
+    """
+    Returns: (best_candidate, model_version, error_message)
+
+    - If no model available -> (None, None, "no_model")
+    - If no candidates -> (None, mv, "no_candidates")
+    - If failure -> (None, mv, "error: ...")
+    question_id: 주면 LTR_TRAFFIC_SPLIT 라우팅에 사용 (Selection.model_version = 라우팅된 arm)
+    """
+    best_idx, mv, err = ltr_best_index_for_ids(db, [c.candidate_id for c in candidates], question_id)
+    if best_idx is None:
+        return None, mv, err
+    return candidates[best_idx], mv, None
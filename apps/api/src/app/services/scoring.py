@@ -0,0 +1,97 @@
+# apps/api/src/app/services/scoring.py
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from src.app.services.features import FeatureMatrix, SparseRows
+
+# train_baseline.py 가 <model_version>.scoring.json 으로 쓰는 포맷 (scripts/train_baseline.py와 동일하게 유지)
+SCORING_FORMAT = "linear_v1"
+# sparse(hashed) feature version용: 0이 아닌 weight만 (indices, coef) 로 저장, n_features = 전체 폭
+SPARSE_SCORING_FORMAT = "linear_sparse_v1"
+
+
+class LinearScorer:
+    """
+    sklearn 없이 binary linear model(LogisticRegression)을 평가하는 경량 scorer.
+    ranker가 기대하는 인터페이스(coef_, intercept_, classes_, decision_function,
+    predict_proba, predict)를 그대로 흉내 내므로 joblib 모델과 교체 가능하다.
+    sparse artifact는 로드 시 n_features 폭의 dense weight로 펼친다 → 메모리는 hash 폭에만 비례하고
+    scoring은 SparseRows @ w (후보의 nnz에 비례).
+    """
+
+    def __init__(
+        self,
+        coef: List[float],
+        intercept: float,
+        features: List[str],
+        feature_version: str,
+        model_version: str = "",
+    ) -> None:
+        self.coef_ = np.asarray(coef, dtype=float).reshape(1, -1)
+        self.intercept_ = np.asarray([float(intercept)], dtype=float)
+        self.classes_ = np.asarray([0, 1])
+        self.features = list(features)
+        self.feature_version = feature_version
+        self.model_version = model_version
+
+    @property
+    def n_features_in_(self) -> int:
+        return int(self.coef_.shape[1])
+
+    def decision_function(self, X: FeatureMatrix) -> np.ndarray:
+        if not isinstance(X, SparseRows):
+            X = np.asarray(X, dtype=float)
+        return X @ self.coef_[0] + self.intercept_[0]
+
+    def predict_proba(self, X: FeatureMatrix) -> np.ndarray:
+        p1 = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1.0 - p1, p1])
+
+    def predict(self, X: FeatureMatrix) -> np.ndarray:
+        return (self.decision_function(X) > 0).astype(int)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "LinearScorer":
+        if d.get("format") == SPARSE_SCORING_FORMAT:
+            n = int(d["n_features"])
+            idx = np.asarray(d["indices"], dtype=np.int64)
+            val = np.asarray(d["coef"], dtype=float)
+            if idx.shape != val.shape or (idx.size and (idx.min() < 0 or idx.max() >= n)):
+                raise ValueError("sparse scoring artifact: bad indices/coef")
+            coef = np.zeros(n, dtype=float)
+            coef[idx] = val
+            return cls(
+                coef=coef,
+                intercept=float(d["intercept"]),
+                features=[],
+                feature_version=str(d["feature_version"]),
+                model_version=str(d.get("model_version", "")),
+            )
+        if d.get("format") != SCORING_FORMAT:
+            raise ValueError(f"unsupported scoring artifact format: {d.get('format')!r}")
+        coef = list(d["coef"])
+        features = list(d["features"])
+        if len(coef) != len(features):
+            raise ValueError("scoring artifact: coef/features length mismatch")
+        return cls(
+            coef=coef,
+            intercept=float(d["intercept"]),
+            features=features,
+            feature_version=str(d["feature_version"]),
+            model_version=str(d.get("model_version", "")),
+        )
+
+
+def scoring_path_for(artifact_path: str) -> str:
+    """xxx.pkl → xxx.scoring.json (train_baseline의 저장 규칙)."""
+    p = Path(artifact_path)
+    return str(p.with_name(f"{p.stem}.scoring.json")).replace("\\", "/")
+
+
+def load_scorer(path: Path) -> LinearScorer:
+    return LinearScorer.from_dict(json.loads(path.read_text(encoding="utf-8")))
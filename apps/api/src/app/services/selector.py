@@ -1,24 +1,35 @@
+from src.app.services.features import has_fv1_marker
+
+
+def rule_score(c) -> int:
+    """
+    rule_select의 후보 점수 (dict 1개).
+    step_score(fv1)가 이미 들어 있으면 재사용하고, 없을 때만 텍스트에서 추출한다.
+    scripts/replay_eval.py 의 SQL 식(_RULE_SCORE_SQL)과 동일하게 유지할 것.
+    """
+    ans = c.get("answer_summary") or ""
+    # 빈 답변은 -999점으로 사실상 제외 (strip() 복사 없이 판정)
+    if not ans or ans.isspace():
+        return -999
+    step = c.get("step_score")
+    if step is None:
+        step = has_fv1_marker(ans, "step_score")
+    s = 0
+    if len(ans) > 50:
+        s += 1
+    if c.get("has_code"):
+        s += 2
+    if step:
+        s += 1
+    return s
+
+
 def rule_select(candidates):
     """
     Rule-based selector.
     - 빈 answer_summary 후보는 최하위로 밀어낸다.
     - 모든 후보가 비어 있으면 첫 번째 후보를 반환한다 (방어 처리).
     """
-
-    def score(c):
-        ans = c.get("answer_summary") or ""
-        # 빈 답변은 -999점으로 사실상 제외
-        if not ans.strip():
-            return -999
-        s = 0
-        if len(ans) > 50:
-            s += 1
-        if c.get("has_code"):
-            s += 2
-        if "Step" in ans or "단계" in ans:
-            s += 1
-        return s
-
-    scored = [(c, score(c)) for c in candidates]
+    scored = [(c, rule_score(c)) for c in candidates]
     scored.sort(key=lambda x: x[1], reverse=True)
     return scored[0][0]
@@ -0,0 +1,118 @@
+# apps/api/src/app/services/shadow.py
+from __future__ import annotations
+
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from sqlalchemy import update
+
+from src.app.db.models import Candidate, Selection
+from src.app.services.ranker import ltr_best_index_for_ids
+
+# (selection_id, question_id, candidate_ids)
+ShadowJob = Tuple[uuid.UUID, uuid.UUID, List[uuid.UUID]]
+
+
+def shadow_enabled() -> bool:
+    # SERVED_POLICY=rule 일 때 LTR 선택을 응답 이후 background에서 계산해 selections에 back-fill
+    return os.getenv("LTR_SHADOW", "0").strip() == "1"
+
+
+class ShadowScorer:
+    """
+    서빙하지 않은 policy(LTR)의 선택을 request path 밖에서 계산한다 (process-wide).
+    - request path: id만 넘기고 submit (모델/registry/feature 조회 없음)
+    - worker: 활성 모델의 feature version으로 feature store 조회 + scoring
+      → Selection.ltr_choice_candidate_id / model_version UPDATE
+    - 대기 작업이 LTR_SHADOW_MAX_PENDING 을 넘으면 새 작업은 버린다 (dropped) → 메모리/지연 상한
+    rule 선택은 항상 request path에서 계산되므로 (rule_choice_candidate_id) shadow 대상은 LTR뿐이다.
+    """
+
+    def __init__(self) -> None:
+        self.max_workers = max(1, int(os.getenv("LTR_SHADOW_WORKERS", "1")))
+        self.max_pending = max(1, int(os.getenv("LTR_SHADOW_MAX_PENDING", "1000")))
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._counters = {"submitted": 0, "scored": 0, "failed": 0, "dropped": 0}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="ltr-shadow",
+                )
+            return self._executor
+
+    def prepare(self, selection_id: uuid.UUID, question_id: uuid.UUID, candidates: List[Candidate]) -> ShadowJob:
+        """
+        commit 전에 호출: id만 뽑아 둔다 (commit 후 ORM 속성은 expire 되므로).
+        feature는 worker가 서빙 모델의 feature version으로 feature store에서 가져온다
+        (/ask 저장 시 LRU에 write-through 되어 있어 보통 DB 조회 없음).
+        question_id는 LTR_TRAFFIC_SPLIT 라우팅용.
+        """
+        return selection_id, question_id, [c.candidate_id for c in candidates]
+
+    def submit(self, job: ShadowJob) -> bool:
+        """commit 후에 호출 (worker의 UPDATE가 selection row를 볼 수 있도록). 버려지면 False."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._counters["dropped"] += 1
+                return False
+            self._pending += 1
+            self._counters["submitted"] += 1
+
+        self._get_executor().submit(self._run, *job)
+        return True
+
+    def _run(
+        self,
+        selection_id: uuid.UUID,
+        question_id: uuid.UUID,
+        candidate_ids: List[uuid.UUID],
+    ) -> None:
+        from src.app.dependencies import SessionLocal
+
+        ok = False
+        db = SessionLocal()
+        try:
+            best_idx, mv, err = ltr_best_index_for_ids(db, candidate_ids, question_id)
+            if best_idx is None:
+                print(f"[LTR] shadow scoring skipped for selection {selection_id}: {err}")
+                return
+            db.execute(
+                update(Selection)
+                .where(Selection.selection_id == selection_id)
+                .values(ltr_choice_candidate_id=candidate_ids[best_idx], model_version=mv)
+            )
+            db.commit()
+            ok = True
+        except Exception as e:
+            db.rollback()
+            print(f"[LTR] shadow scoring failed for selection {selection_id}: {e!r}")
+        finally:
+            db.close()
+            with self._lock:
+                self._pending -= 1
+                self._counters["scored" if ok else "failed"] += 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            ex, self._executor = self._executor, None
+        if ex is not None:
+            ex.shutdown(wait=wait)
+
+    def stats(self) -> dict:
+        with self._lock:
+            out: dict = dict(self._counters)
+            out["pending"] = self._pending
+        out["enabled"] = shadow_enabled()
+        return out
+
+
+LTR_SHADOW = ShadowScorer()
@@ -0,0 +1,90 @@
+# apps/api/src/app/services/single_flight.py
+from __future__ import annotations
+
+import asyncio
+import copy
+import threading
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class SingleFlight:
+    """
+    같은 key로 동시에 들어온 호출을 1개의 실행으로 합친다 (process-wide).
+    - 첫 호출자(leader)만 fn을 실행하고, 실행 중에 들어온 호출자(follower)는 결과를 기다린다.
+    - 완료되면 key를 지운다 → 이후 호출은 새로 실행 (결과 캐시는 ANSWER_CACHE 담당)
+    - leader가 예외를 내면 follower도 같은 예외를 받는다.
+    - 결과는 호출자마다 deepcopy 해서 돌려준다 (후보 dict를 각자 수정해도 안전).
+    sync(thread) 호출과 async 호출은 같은 key라도 서로 합치지 않는다.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Tuple[threading.Event, Dict[str, Any]]] = {}
+        self._acalls: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Task]] = {}
+        self._counters = {"leaders": 0, "coalesced": 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = (threading.Event(), {})
+                self._calls[key] = call
+                self._counters["leaders"] += 1
+                leader = True
+            else:
+                self._counters["coalesced"] += 1
+                leader = False
+
+        done, box = call
+        if leader:
+            try:
+                box["value"] = fn()
+            except BaseException as e:
+                box["error"] = e
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                done.set()
+        else:
+            done.wait()
+
+        if "error" in box:
+            raise box["error"]
+        return copy.deepcopy(box["value"])
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        async 버전. fn은 별도 task로 실행하고 leader/follower 모두 shield로 기다린다
+        → 어느 호출자가 cancel(클라이언트 끊김) 되어도 나머지는 결과를 받는다.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            call = self._acalls.get(key)
+            if call is not None and call[0] is loop:
+                task = call[1]
+                self._counters["coalesced"] += 1
+            else:
+                task = loop.create_task(fn())
+                self._acalls[key] = (loop, task)
+                self._counters["leaders"] += 1
+                task.add_done_callback(lambda t, key=key: self._forget(key, t))
+
+        value = await asyncio.shield(task)
+        return copy.deepcopy(value)
+
+    def _forget(self, key: str, task: asyncio.Future) -> None:
+        with self._lock:
+            call = self._acalls.get(key)
+            if call is not None and call[1] is task:
+                del self._acalls[key]
+        if not task.cancelled():
+            task.exception()  # 기다리던 호출자가 모두 떠났어도 "never retrieved" 경고 방지
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            out = dict(self._counters)
+        out["in_flight"] = len(self._calls) + len(self._acalls)
+        return out
+
+
+CANDIDATE_FLIGHTS = SingleFlight()
@@ -0,0 +1,92 @@
+# apps/api/tests/test_breaker.py
+from __future__ import annotations
+
+import pytest
+
+from src.app.services.llm import breaker
+from src.app.services.llm.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class _Clock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, s: float) -> None:
+        self.now += s
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = _Clock()
+    monkeypatch.setattr(breaker, "time", c)
+    return c
+
+
+def _open(br: CircuitBreaker) -> None:
+    for _ in range(br.failure_threshold):
+        assert br.allow()
+        br.record_failure()
+    assert br.state == OPEN
+
+
+def test_closed_open_half_open_closed(clock):
+    br = CircuitBreaker(failure_threshold=3, cooldown_s=10, half_open_probes=1)
+    assert br.state == CLOSED
+
+    # 연속 실패가 threshold 미만이면 closed 유지, 성공하면 카운트 초기화
+    br.record_failure()
+    br.record_failure()
+    br.record_success()
+    br.record_failure()
+    assert br.state == CLOSED
+    assert br.snapshot()["consecutive_failures"] == 1
+    br.record_success()
+
+    _open(br)
+    assert br.allow() is False
+    assert br.snapshot()["short_circuited"] == 1
+
+    clock.advance(9.9)
+    assert br.state == OPEN
+    clock.advance(0.1)
+    assert br.state == HALF_OPEN
+
+    # half_open: probe 1개만 허용
+    assert br.allow() is True
+    assert br.allow() is False
+
+    br.record_success()
+    assert br.state == CLOSED
+    assert br.allow() is True
+    assert br.snapshot()["consecutive_failures"] == 0
+
+
+def test_half_open_probe_failure_reopens(clock):
+    br = CircuitBreaker(failure_threshold=2, cooldown_s=5, half_open_probes=1)
+    _open(br)
+
+    clock.advance(5)
+    assert br.allow() is True  # probe
+    br.record_failure()
+    assert br.state == OPEN
+    assert br.allow() is False
+
+    # cooldown은 재오픈 시각부터 다시 계산
+    clock.advance(4.9)
+    assert br.state == OPEN
+    clock.advance(0.1)
+    assert br.state == HALF_OPEN
+
+
+def test_release_returns_half_open_probe_slot(clock):
+    br = CircuitBreaker(failure_threshold=1, cooldown_s=1, half_open_probes=1)
+    _open(br)
+    clock.advance(1)
+
+    assert br.allow() is True
+    assert br.allow() is False
+    br.release()  # 결과 없이 끝난 probe (cancel된 hedge 등)
+    assert br.allow() is True
@@ -0,0 +1,140 @@
+# apps/api/tests/test_generator_single_flight.py
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from src.app.services import generator
+from src.app.services.llm.types import EngineRequest, EngineResult
+
+_ASK = dict(
+    question="single flight session test",
+    role="dev",
+    level="junior",
+    goal="test",
+    stack="python",
+    constraints="",
+    domain="",
+    orchestration="concurrent",
+)
+
+
+class _FakeSession:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.closed = False
+
+
+@pytest.fixture
+def fake_cache(monkeypatch: pytest.MonkeyPatch) -> List[Any]:
+    """ANSWER_CACHE.lookup에 넘어온 session 기록 (항상 miss, 닫힌 session이면 실패)."""
+    seen: List[Any] = []
+    lock = threading.Lock()
+
+    def lookup(reqs: List[EngineRequest], db: Any = None, bypass: bool = False) -> Dict[str, EngineResult]:
+        assert db is None or not db.closed, "lookup ran on a closed session"
+        with lock:
+            seen.append(db)
+        return {}
+
+    monkeypatch.setattr(generator.ANSWER_CACHE, "lookup", lookup)
+    monkeypatch.setattr(generator.ANSWER_CACHE, "store", lambda req, res: None)
+    monkeypatch.setenv("ASK_COALESCE_ENABLED", "1")
+    return seen
+
+
+def _answers(reqs: List[EngineRequest]) -> List[EngineResult]:
+    return [
+        EngineResult(provider=r.provider, model=r.model, answer_summary="ok", latency_ms=1, request_id=r.request_id)
+        for r in reqs
+    ]
+
+
+def test_async_flight_does_not_share_leader_session(monkeypatch: pytest.MonkeyPatch, fake_cache: List[Any]) -> None:
+    calls = 0
+    release = asyncio.Event()
+
+    async def fake_arun(reg: Any, reqs: List[EngineRequest], mode: str = "concurrent") -> List[EngineResult]:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return _answers(reqs)
+
+    monkeypatch.setattr(generator, "arun_requests", fake_arun)
+
+    async def main() -> None:
+        leader_db, follower_db = _FakeSession("leader"), _FakeSession("follower")
+        leader = asyncio.create_task(generator.agenerate_candidates_v1(**_ASK, db=leader_db))
+        await asyncio.sleep(0.05)
+        follower = asyncio.create_task(generator.agenerate_candidates_v1(**_ASK, db=follower_db))
+        await asyncio.sleep(0.05)
+
+        # leader 클라이언트가 끊기고 get_db가 session을 닫은 뒤에도 follower는 결과를 받는다
+        leader.cancel()
+        leader_db.closed = True
+        release.set()
+
+        out = await follower
+        assert [c["answer_summary"] for c in out] == ["ok", "ok"]
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    asyncio.run(main())
+    assert calls == 1
+    assert [db.name for db in fake_cache] == ["leader", "follower"]
+
+
+def test_sync_flight_looks_up_with_each_callers_session(
+    monkeypatch: pytest.MonkeyPatch, fake_cache: List[Any]
+) -> None:
+    calls = 0
+    started = threading.Event()
+    release = threading.Event()
+
+    def fake_run(reg: Any, reqs: List[EngineRequest], mode: str = "concurrent") -> List[EngineResult]:
+        nonlocal calls
+        calls += 1
+        started.set()
+        release.wait(5)
+        return _answers(reqs)
+
+    monkeypatch.setattr(generator, "run_requests", fake_run)
+
+    results: Dict[str, Any] = {}
+
+    def ask(name: str) -> None:
+        results[name] = generator.generate_candidates_v1(**_ASK, db=_FakeSession(name))
+
+    leader = threading.Thread(target=ask, args=("leader",))
+    leader.start()
+    assert started.wait(5)
+    follower = threading.Thread(target=ask, args=("follower",))
+    follower.start()
+    # follower는 flight에 합류하기 전에 자기 session으로 조회한다
+    deadline = time.monotonic() + 5
+    while len(fake_cache) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert calls == 1
+    assert sorted(db.name for db in fake_cache) == ["follower", "leader"]
+    assert results["leader"] == results["follower"]
+
+
+def test_flight_key_and_cache_key_normalize_question_the_same_way() -> None:
+    inputs = {k: v for k, v in _ASK.items() if k != "orchestration"}
+    spaced = dict(inputs, question="  single   flight\nsession\ttest ")
+
+    assert generator._flight_key(**inputs, mode="concurrent") == generator._flight_key(**spaced, mode="concurrent")
+
+    reqs = [generator._mk_req(provider="openai", model="m", **q) for q in (inputs, spaced)]
+    assert generator.cache_key(reqs[0]) == generator.cache_key(reqs[1])
+    # 다른 질문은 다른 key
+    other = generator._mk_req(provider="openai", model="m", **dict(inputs, question="single flight test"))
+    assert generator.cache_key(other) != generator.cache_key(reqs[0])
@@ -0,0 +1,65 @@
+# apps/api/tests/test_model_cache.py
+from __future__ import annotations
+
+import threading
+import time
+
+from src.app.services import model_registry, ranker
+from src.app.services.model_registry import ActiveModelResolver
+from src.app.services.ranker import ModelCache
+
+
+def _rec(mv: str) -> dict:
+    return {"model_version": mv, "artifact_path": f"artifacts/models/{mv}.pkl", "metrics_json": {}}
+
+
+def test_expired_get_does_not_run_on_change_inline(monkeypatch):
+    resolver = ActiveModelResolver()
+    resolver.poll_s = 0.0  # lazy mode: 매 get()이 만료 → 재조회
+    latest = {"rec": _rec("m1")}
+    monkeypatch.setattr(model_registry, "get_latest_model", lambda db: latest["rec"])
+
+    release = threading.Event()
+    seen = []
+
+    def slow_activate(rec):
+        seen.append((rec["model_version"], threading.current_thread().name))
+        release.wait(5.0)
+
+    resolver.on_change(slow_activate)
+
+    t0 = time.monotonic()
+    assert resolver.get(db=None)["model_version"] == "m1"
+    latest["rec"] = _rec("m2")
+    assert resolver.get(db=None)["model_version"] == "m2"
+    # 콜백(모델 로드)이 끝나기를 기다리지 않고 요청 스레드로 돌아온다
+    assert time.monotonic() - t0 < 1.0
+
+    release.set()
+    resolver._get_notify_executor().submit(lambda: None).result(timeout=5.0)
+    assert [mv for mv, _ in seen] == ["m1", "m2"]
+    assert all(name.startswith("ltr-model-change") for _, name in seen)
+
+
+def test_refresh_path_runs_on_change_inline():
+    resolver = ActiveModelResolver()
+    seen = []
+    resolver.on_change(lambda rec: seen.append(threading.current_thread().name))
+
+    resolver._store(_rec("m1"))
+    assert seen == [threading.current_thread().name]
+
+
+def test_env_pinned_version_survives_eviction(monkeypatch):
+    cache = ModelCache(max_models=1)
+    monkeypatch.setattr(ranker, "MODEL_CACHE", cache)
+    monkeypatch.setattr(ranker, "_load_model", lambda path, meta=None: object())
+    monkeypatch.setattr(ranker, "_artifact_nbytes", lambda model, path, meta: 0)
+    monkeypatch.setattr(ranker, "_get_model_record", lambda db, mv: (f"artifacts/models/{mv}.pkl", {}))
+    monkeypatch.setattr(ranker, "ACTIVE_MODEL", ActiveModelResolver())
+    monkeypatch.setenv("ACTIVE_MODEL_VERSION", "pinned")
+
+    assert ranker.preload_active_model(db=None) == "pinned"
+    # 다른 버전(예: 평가/비교용)이 로드돼도 ENV로 고정된 버전은 남아 있어야 한다
+    cache.load("other", "artifacts/models/other.pkl", {})
+    assert cache.get("pinned") is not None
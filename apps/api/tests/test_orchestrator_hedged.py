@@ -0,0 +1,86 @@
+# apps/api/tests/test_orchestrator_hedged.py
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+
+from src.app.services.llm.engines.openai_engine import OpenAIEngine
+from src.app.services.llm.orchestrator import run_requests
+from src.app.services.llm.registry import EngineRegistry
+from src.app.services.llm.types import EngineRequest
+
+
+class _ChatHandler(BaseHTTPRequestHandler):
+    # keep-alive: pooled httpx connection이 다음 호출에서 재사용되도록
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers.get("Content-Length", "0")))
+        body = json.dumps(
+            {
+                "id": "chatcmpl-test",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-test",
+                "choices": [
+                    {"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}
+                ],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def openai_server(monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_BASE_URL", url)
+    try:
+        yield url
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _request(i: int) -> EngineRequest:
+    return EngineRequest(
+        request_id=f"req-{i}",
+        role="dev",
+        level="junior",
+        goal="test",
+        stack="python",
+        constraints="",
+        domain="",
+        provider="openai",
+        model="gpt-test",
+        timeout_s=10.0,
+    )
+
+
+def test_sync_hedged_calls_back_to_back(openai_server: str) -> None:
+    # run_requests(mode="hedged")는 호출마다 asyncio.run으로 새 loop를 연다.
+    # 같은 engine(=같은 client pool)으로 연속 호출해도 닫힌 loop의 connection을 재사용하면 안 된다.
+    registry = EngineRegistry()
+    registry.register(OpenAIEngine())
+    try:
+        for _ in range(2):
+            results = run_requests(registry, [_request(0), _request(1)], mode="hedged")
+            assert [r.error for r in results] == [None, None]
+            assert [r.answer_summary for r in results] == ["ok", "ok"]
+    finally:
+        registry.close()
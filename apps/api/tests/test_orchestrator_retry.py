@@ -0,0 +1,91 @@
+# apps/api/tests/test_orchestrator_retry.py
+from __future__ import annotations
+
+import threading
+import time
+from typing import List
+
+import pytest
+
+from src.app.services.llm.base import LLMEngine
+from src.app.services.llm.orchestrator import run_concurrent
+from src.app.services.llm.registry import EngineRegistry
+from src.app.services.llm.types import EngineRequest, EngineResult
+
+
+class _ScriptedEngine(LLMEngine):
+    """호출마다 (sleep_s, error) 스크립트를 순서대로 재생. 호출 시각을 기록한다."""
+
+    def __init__(self, name: str, script: List[tuple]) -> None:
+        self.name = name
+        self.script = list(script)
+        self.calls: List[float] = []
+        self._lock = threading.Lock()
+
+    def provider_name(self) -> str:
+        return self.name
+
+    def generate(self, request: EngineRequest) -> EngineResult:
+        with self._lock:
+            self.calls.append(time.monotonic())
+            sleep_s, error = self.script.pop(0) if self.script else (0.0, None)
+        time.sleep(sleep_s)
+        return EngineResult(
+            provider=self.name,
+            model=request.model,
+            answer_summary="" if error else "ok",
+            latency_ms=max(1, int(sleep_s * 1000)),
+            error=error,
+        )
+
+
+def _request(provider: str, timeout_s: float = 5.0) -> EngineRequest:
+    return EngineRequest(
+        request_id=f"req-{provider}",
+        role="dev",
+        level="junior",
+        goal="test",
+        stack="python",
+        constraints="",
+        domain="",
+        provider=provider,
+        model=f"{provider}-model",
+        timeout_s=timeout_s,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _fast_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LLM_RETRY_MAX_ATTEMPTS", "3")
+    monkeypatch.setenv("LLM_RETRY_BASE_S", "0.01")
+    monkeypatch.setenv("LLM_RETRY_MIN_ATTEMPT_S", "0.1")
+    monkeypatch.setenv("LLM_BREAKER_ENABLED", "0")
+
+
+def test_fast_failure_retries_without_waiting_for_slow_request() -> None:
+    fast = _ScriptedEngine("fast", [(0.0, "openai_call_error:RateLimitError('Error code: 429')"), (0.0, None)])
+    slow = _ScriptedEngine("slow", [(0.8, None)])
+    registry = EngineRegistry()
+    registry.register(fast)
+    registry.register(slow)
+
+    t0 = time.monotonic()
+    results = run_concurrent(registry, [_request("fast"), _request("slow")])
+
+    assert [r.error for r in results] == [None, None]
+    assert [r.provider for r in results] == ["fast", "slow"]
+    assert len(fast.calls) == 2
+    # 429 재시도는 느린 요청(0.8s)이 끝나기 훨씬 전에 나간다
+    assert fast.calls[1] - t0 < 0.4
+
+
+def test_attempt_timeout_is_enforced_per_request() -> None:
+    hung = _ScriptedEngine("hung", [(2.0, None)])
+    registry = EngineRegistry()
+    registry.register(hung)
+
+    t0 = time.monotonic()
+    (res,) = run_concurrent(registry, [_request("hung", timeout_s=0.3)])
+
+    assert res.error == "timeout"
+    assert time.monotonic() - t0 < 1.0
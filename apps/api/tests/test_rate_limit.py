@@ -0,0 +1,104 @@
+# apps/api/tests/test_rate_limit.py
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from src.app.services.llm import rate_limit
+from src.app.services.llm.rate_limit import RateLimiter, TokenBucket
+
+
+class _Clock:
+    """time.monotonic 대체: 테스트가 직접 시간을 진행시킨다."""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, s: float) -> None:
+        self.now += s
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = _Clock()
+    # rate_limit 모듈이 보는 time만 바꾼다 (asyncio/pytest는 실제 시간)
+    monkeypatch.setattr(rate_limit, "time", c)
+    return c
+
+
+def test_bucket_refills_at_rate_and_caps_at_capacity(clock):
+    b = TokenBucket(rate_per_min=60)  # 1 token/s, capacity 60
+    b.take(60)
+    assert b.wait_s(1, clock.now) == pytest.approx(1.0)
+
+    clock.advance(10)
+    assert b.wait_s(10, clock.now) == 0.0
+    assert b.wait_s(11, clock.now) == pytest.approx(1.0)
+
+    clock.advance(3600)
+    b.wait_s(1, clock.now)
+    assert b.tokens == pytest.approx(60.0)
+
+
+def test_acquire_rejects_when_refill_is_after_deadline(clock):
+    lim = RateLimiter(rpm=60)
+    for _ in range(60):
+        assert lim.acquire(0, deadline=clock.now + 0.1)
+        lim.release()
+
+    # 다음 토큰은 1초 뒤 → 0.5초 deadline으로는 기다리지 않고 바로 거절
+    assert lim.acquire(0, deadline=clock.now + 0.5) is False
+    snap = lim.snapshot()
+    assert snap["rejected"] == 1
+    assert snap["queue_depth"] == 0
+    assert snap["inflight"] == 0
+
+    clock.advance(1.0)
+    assert lim.acquire(0, deadline=clock.now + 0.5) is True
+
+
+def test_release_corrects_tpm_with_actual_usage(clock):
+    lim = RateLimiter(tpm=600)  # capacity 600 tokens, 10 tokens/s
+
+    assert lim.acquire(500, deadline=clock.now + 1)
+    # 추정 500, 실제 100 → 400 환급
+    lim.release(estimated_tokens=500, actual_tokens=100)
+    assert lim.tpm.tokens == pytest.approx(500.0)
+
+    assert lim.acquire(100, deadline=clock.now + 1)
+    # 추정 100, 실제 700 → 600 추가 차감 (음수 잔량)
+    lim.release(estimated_tokens=100, actual_tokens=700)
+    assert lim.tpm.tokens == pytest.approx(-200.0)
+    # 다음 100 토큰은 잔량이 100이 될 때까지 (300 tokens / 10/s) 대기
+    assert lim.tpm.wait_s(100, clock.now) == pytest.approx(30.0)
+    assert lim.acquire(100, deadline=clock.now + 5) is False
+
+
+def test_cancelled_aacquire_leaves_no_queue_or_inflight_slot():
+    lim = RateLimiter(max_inflight=1)
+    assert lim.acquire(0, deadline=time.monotonic() + 1)
+
+    async def main() -> None:
+        waiter = asyncio.ensure_future(lim.aacquire(0, deadline=time.monotonic() + 30))
+        await asyncio.sleep(0.12)  # in-flight 슬롯 대기 중 (_POLL_S polling)
+        assert lim.snapshot()["queue_depth"] == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(main())
+
+    snap = lim.snapshot()
+    assert snap["queue_depth"] == 0
+    assert snap["inflight"] == 1  # 기존 보유자만
+
+    lim.release()
+    assert lim.snapshot()["inflight"] == 0
+    assert lim.acquire(0, deadline=time.monotonic() + 0.2)
+    lim.release()
+    assert lim.snapshot()["inflight"] == 0